@@ -0,0 +1,226 @@
+"""
+Deterministic synthetic corpus generator for the benchmarks.
+
+The same specification and seed always produce byte-identical trees, so results of different runs can be compared.
+
+Usage:
+    python -m benchmarks.corpus <directory> [--files N] [--classes-per-file N] ...
+"""
+import argparse
+import os
+import random
+from dataclasses import asdict, dataclass, fields
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """
+    Data class describing the shape of a synthetic corpus.
+
+    Attributes:
+    - files (int): Number of regular modules.
+    - packages (int): Number of packages the modules are spread over.
+    - classes_per_file (int): Top level classes per regular module.
+    - nesting_depth (int): Depth of the classes nested inside each top level class.
+    - methods_per_class (int): Methods per class, besides `__init__`.
+    - attributes_per_class (int): Instance attributes assigned in `__init__`.
+    - statements_per_method (int): Statements in each method body.
+    - huge_files (int): Number of additional very large modules.
+    - huge_file_classes (int): Top level classes in each very large module.
+    - class_free_ratio (float): Fraction of regular modules that define functions but no class.
+    - non_utf8_ratio (float): Fraction of regular modules encoded in Latin-1 with a coding cookie.
+    - seed (int): Seed of the random generator.
+    """
+
+    files: int = 200
+    packages: int = 10
+    classes_per_file: int = 5
+    nesting_depth: int = 1
+    methods_per_class: int = 8
+    attributes_per_class: int = 4
+    statements_per_method: int = 6
+    huge_files: int = 0
+    huge_file_classes: int = 2000
+    class_free_ratio: float = 0.2
+    non_utf8_ratio: float = 0.0
+    seed: int = 0
+
+
+class CorpusGenerator:
+    """
+    Writes a synthetic corpus of Python packages described by a CorpusSpec.
+
+    Modules import each other with relative imports and inherit from each other's classes,
+    so the corpus also exercises cross-module relationship resolution.
+    """
+
+    def __init__(self, spec: CorpusSpec) -> None:
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+        self.defined_classes = []  # (package, module, class name) of the top level classes written so far
+
+    def generate(self, directory: str) -> dict:
+        """
+        Writes the corpus under a directory.
+
+        Args:
+        - directory (str): The root directory of the corpus, created if needed.
+
+        Returns:
+        - dict: Counts of the generated files, classes and bytes.
+        """
+        stats = {"files": 0, "classes": 0, "bytes": 0}
+        for package_index in range(max(1, self.spec.packages)):
+            package_directory = os.path.join(directory, f"package_{package_index}")
+            os.makedirs(package_directory, exist_ok=True)
+            self._write(os.path.join(package_directory, "__init__.py"), '"""Synthetic package."""\n', "utf-8", stats)
+
+        for file_index in range(self.spec.files):
+            package = f"package_{file_index % max(1, self.spec.packages)}"
+            module = f"module_{file_index}"
+            non_utf8 = self.random.random() < self.spec.non_utf8_ratio
+            if self.random.random() < self.spec.class_free_ratio:
+                source, class_count = self._function_module(), 0
+            else:
+                source, class_count = self._class_module(package, module, self.spec.classes_per_file, non_utf8)
+            encoding = "latin-1" if non_utf8 else "utf-8"
+            if non_utf8:
+                source = "# -*- coding: latin-1 -*-\n" + source
+            self._write(os.path.join(directory, package, f"{module}.py"), source, encoding, stats)
+            stats["classes"] += class_count
+
+        for huge_index in range(self.spec.huge_files):
+            package = f"package_{huge_index % max(1, self.spec.packages)}"
+            module = f"huge_module_{huge_index}"
+            source, class_count = self._class_module(package, module, self.spec.huge_file_classes, False)
+            self._write(os.path.join(directory, package, f"{module}.py"), source, "utf-8", stats)
+            stats["classes"] += class_count
+
+        return stats
+
+    def _write(self, path: str, source: str, encoding: str, stats: dict) -> None:
+        data = source.encode(encoding)
+        with open(path, "wb") as file:
+            file.write(data)
+        stats["files"] += 1
+        stats["bytes"] += len(data)
+
+    def _function_module(self) -> str:
+        lines = ["import os", "", ""]
+        for function_index in range(self.spec.methods_per_class):
+            lines.append(f"def helper_{function_index}(value, count=1, *args, **kwargs):")
+            lines.extend(self._statements("    ", "value"))
+            lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def _class_module(self, package: str, module: str, class_count: int, non_utf8: bool) -> tuple:
+        lines = ["import os", "import collections.abc as abc_alias", ""]
+        imported = {}
+        class_names = []
+        total = 0
+        for class_index in range(class_count):
+            class_name = f"{module.title().replace('_', '')}Class{class_index}"
+            base = self._pick_base(package, module, imported, class_names)
+            lines.append("")
+            total += self._class(lines, class_name, base, self.spec.nesting_depth, "", non_utf8)
+            class_names.append(class_name)
+            self.defined_classes.append((package, module, class_name))
+
+        import_lines = [
+            f"from {'.' if other_package == package else '..' + other_package}.{other_module} import {name}"
+            for (other_package, other_module, name) in imported.values()
+        ]
+        return "\n".join(lines[:3] + import_lines + lines[3:]) + "\n", total
+
+    def _pick_base(self, package: str, module: str, imported: dict, local_classes: list) -> str:
+        choice = self.random.random()
+        if choice < 0.3 and local_classes:
+            return self.random.choice(local_classes)
+        if choice < 0.6 and self.defined_classes:
+            other = self.random.choice(self.defined_classes)
+            if other[1] != module:
+                imported[other[2]] = other
+                return other[2]
+        if choice < 0.7:
+            return "abc_alias.Sized"
+        return "object"
+
+    def _class(self, lines: list, name: str, base: str, depth: int, indent: str, non_utf8: bool) -> int:
+        body = indent + "    "
+        lines.append(f"{indent}class {name}({base}):")
+        text = "Données de la classe" if non_utf8 else "Class data"
+        lines.append(f'{body}"""{text} {name}."""')
+        lines.append(f"{body}counter = 0")
+        lines.append(f"{body}_registry: dict = {{}}")
+        lines.append("")
+
+        classes = 1
+        if depth > 0:
+            classes += self._class(lines, f"{name}Nested", "object", depth - 1, body, non_utf8)
+            lines.append("")
+
+        arguments = ", ".join(f"arg_{index}=None" for index in range(self.spec.attributes_per_class))
+        lines.append(f"{body}def __init__(self, {arguments}):" if arguments else f"{body}def __init__(self):")
+        for index in range(self.spec.attributes_per_class):
+            visibility = "_" if index % 3 == 0 else ""
+            lines.append(f"{body}    self.{visibility}attribute_{index} = arg_{index}")
+        lines.append(f"{body}    super().__init__()")
+        lines.append("")
+
+        for method_index in range(self.spec.methods_per_class):
+            visibility = "_" if method_index % 4 == 0 else ""
+            decorator = "@staticmethod" if method_index % 7 == 6 else None
+            if decorator:
+                lines.append(f"{body}{decorator}")
+                lines.append(f"{body}def {visibility}method_{method_index}(value, count=1):")
+            else:
+                lines.append(f"{body}def {visibility}method_{method_index}(self, value, count=1):")
+            lines.extend(self._statements(body + "    ", "value"))
+            lines.append("")
+        return classes
+
+    def _statements(self, indent: str, variable: str) -> list:
+        lines = [f"{indent}result = []"]
+        for index in range(self.spec.statements_per_method):
+            kind = self.random.randrange(4)
+            if kind == 0:
+                lines.append(f"{indent}result.append({variable} * {index} + len(str(count)))")
+            elif kind == 1:
+                lines.append(f"{indent}for item in range(count):")
+                lines.append(f"{indent}    result.extend([item, {{'key': item}}, (item, {index})])")
+            elif kind == 2:
+                lines.append(f"{indent}if {variable} is not None and count > {index}:")
+                lines.append(f"{indent}    result = [os.path.join(str(part), 'x') for part in result]")
+            else:
+                lines.append(f"{indent}result = sorted(result, key=lambda entry: str(entry))")
+        lines.append(f"{indent}return result")
+        return lines
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds one command line option per CorpusSpec field.
+    """
+    for field in fields(CorpusSpec):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=type(field.default), default=field.default)
+
+
+def spec_from_arguments(arguments: argparse.Namespace) -> CorpusSpec:
+    """
+    Builds a CorpusSpec from options added by add_spec_arguments.
+    """
+    return CorpusSpec(**{field.name: getattr(arguments, field.name) for field in fields(CorpusSpec)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory")
+    add_spec_arguments(parser)
+    arguments = parser.parse_args()
+    spec = spec_from_arguments(arguments)
+    stats = CorpusGenerator(spec).generate(arguments.directory)
+    print(f"{asdict(spec)}\n{stats}")
+
+
+if __name__ == "__main__":
+    main()
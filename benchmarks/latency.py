@@ -0,0 +1,51 @@
+"""
+Latency-injecting shim simulating high-latency storage, such as a network mount, on a local filesystem.
+
+Every `open` and `os.stat` of a path under the given root sleeps first. Sleeping releases the GIL, like a
+blocking network read does, so prefetching threads overlap the injected latency as they would the real one.
+
+Usage:
+    with injected_latency(corpus_directory, 0.002):
+        py_class_extractor.generate_classes_dicts_from_directory(corpus_directory, prefetch=8)
+"""
+import builtins
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def injected_latency(root: str, seconds: float) -> Iterator[None]:
+    """
+    Delays every `open` and `os.stat` of the paths under a directory, within the enclosed block.
+
+    Args:
+    - root (str): The directory whose files are slowed down.
+    - seconds (float): Latency added to each call. 0 leaves the filesystem untouched.
+    """
+    if not seconds:
+        yield
+        return
+
+    prefix = os.path.join(os.path.abspath(root), "")
+    original_open, original_stat = builtins.open, os.stat
+
+    def is_slow(path) -> bool:
+        return isinstance(path, (str, bytes, os.PathLike)) and os.path.abspath(os.fsdecode(path)).startswith(prefix)
+
+    def slow_open(file, *args, **kwargs):
+        if is_slow(file):
+            time.sleep(seconds)
+        return original_open(file, *args, **kwargs)
+
+    def slow_stat(path, *args, **kwargs):
+        if is_slow(path):
+            time.sleep(seconds)
+        return original_stat(path, *args, **kwargs)
+
+    builtins.open, os.stat = slow_open, slow_stat
+    try:
+        yield
+    finally:
+        builtins.open, os.stat = original_open, original_stat
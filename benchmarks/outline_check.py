@@ -0,0 +1,89 @@
+"""
+Checks that the outline parser extracts the same modules as the full parser, and compares their speed.
+
+Every file is parsed both ways and extracted with `ast_management.extract_module_metadata`. Files whose module
+metadata differ are listed with the first differing class, as are the files for which the outline scanner
+gave up and the whole source was parsed. Exits with 1 when any file differs.
+
+Usage:
+    python -m benchmarks.outline_check [directory]
+"""
+import ast
+import os
+import sys
+import sysconfig
+import time
+
+from py_class_extractor import ast_management, file_management, outline, utils
+
+
+def compare_file(file_path: str, directory: str) -> tuple:
+    """
+    Extracts a file with both parsers.
+
+    Returns:
+    - tuple: Whether the outline was used, the first difference or None, and the seconds spent parsing
+      in full and in outline, or None if the file does not parse or its extraction fails.
+    """
+    try:
+        source = file_management.decode_source(file_management.read_file_bytes(file_path))
+        start = time.perf_counter()
+        full_tree = ast.parse(source)
+        full_seconds = time.perf_counter() - start
+    except (SyntaxError, ValueError, OSError):
+        return None
+
+    start = time.perf_counter()
+    skeleton = outline.outline_source(source)
+    try:
+        outline_tree = None if skeleton is None else ast.parse(skeleton)
+    except SyntaxError:
+        outline_tree = None
+    outline_seconds = time.perf_counter() - start
+    if outline_tree is None:
+        return False, None, full_seconds, outline_seconds
+
+    # Both parses only need the same modules, so they are taken from the relative path
+    modules = utils.split_path(os.path.relpath(file_path, directory))
+    try:
+        expected = ast_management.extract_module_metadata(full_tree, modules)
+    except Exception:  # Files the extraction itself fails on are not compared
+        return None
+    actual = ast_management.extract_module_metadata(outline_tree, modules)
+    if actual == expected:
+        return True, None, full_seconds, outline_seconds
+    for expected_class, actual_class in zip(expected.classes, actual.classes):
+        if expected_class != actual_class:
+            return True, f"class {expected_class.name} differs", full_seconds, outline_seconds
+    return True, f"{len(expected.classes)} classes expected, {len(actual.classes)} found, or imports differ", \
+        full_seconds, outline_seconds
+
+
+def main(directory: str) -> int:
+    file_paths = file_management.find_files_with_extension(directory, ".py")
+    checked = fallbacks = 0
+    mismatches = []
+    full_total = outline_total = 0.0
+    for file_path in file_paths:
+        result = compare_file(file_path, directory)
+        if result is None:
+            continue
+        used, difference, full_seconds, outline_seconds = result
+        checked += 1
+        full_total += full_seconds
+        outline_total += outline_seconds
+        if not used:
+            fallbacks += 1
+            print(f"fallback: {file_path}")
+        elif difference is not None:
+            mismatches.append(file_path)
+            print(f"MISMATCH: {file_path}: {difference}")
+
+    print(f"{checked} files checked in {directory}: {len(mismatches)} mismatches, {fallbacks} fallbacks")
+    print(f"parse: full {full_total:.3f}s, outline {outline_total:.3f}s "
+          f"({full_total / outline_total if outline_total else 0:.2f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else sysconfig.get_paths()["stdlib"]))
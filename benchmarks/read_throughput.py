@@ -0,0 +1,48 @@
+"""
+Compares the files per second of the legacy chardet read path with the single-read PEP 263 decoding path.
+
+Usage:
+    python -m benchmarks.read_throughput [directory]
+"""
+import ast
+import sys
+import sysconfig
+import time
+
+from py_class_extractor import ast_management, file_management
+
+
+def legacy_parse(file_path: str) -> ast.AST:
+    """
+    Parses a file the previous way: chardet over the whole file, then a second read of the text.
+    """
+    with open(file_path, "r", encoding=file_management.detect_file_encoding(file_path)) as file:
+        return ast.parse(file.read())
+
+
+def measure(file_paths: list, parse) -> tuple:
+    """
+    Returns the parsed file count, failure count and elapsed seconds of a parse function over all files.
+    """
+    parsed = failures = 0
+    start = time.perf_counter()
+    for file_path in file_paths:
+        try:
+            parse(file_path)
+            parsed += 1
+        except (SyntaxError, ValueError, OSError):
+            failures += 1
+    return parsed, failures, time.perf_counter() - start
+
+
+def main(directory: str) -> None:
+    file_paths = file_management.find_files_with_extension(directory, ".py")
+    print(f"{len(file_paths)} files found in {directory}")
+    for label, parse in (("chardet", legacy_parse), ("pep263", ast_management.parse_ast_from_file)):
+        parsed, failures, elapsed = measure(file_paths, parse)
+        print(f"{label:>8}: {len(file_paths) / elapsed:>9.1f} files/s, {elapsed:.3f}s "
+              f"({parsed} parsed, {failures} failed)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else sysconfig.get_paths()["stdlib"])
@@ -0,0 +1,253 @@
+"""
+Runs the extraction benchmarks over a synthetic corpus and stores the results as JSON.
+
+Every scenario runs in a freshly spawned process, so its peak resident set size is not inflated by the
+runner or by the previous scenarios. Compare a run with an earlier one by passing its result file to --compare.
+Pass --latency to add a delay to every file access, simulating storage such as a network mount.
+
+Usage:
+    python -m benchmarks.runner [--output results.json] [--compare baseline.json] [--workers N]
+                                [--latency MS] [corpus options]
+"""
+import argparse
+import ast
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+
+import py_class_extractor
+from py_class_extractor import ast_management, file_management, utils
+
+from benchmarks.corpus import CorpusGenerator, add_spec_arguments, spec_from_arguments
+from benchmarks.latency import injected_latency
+
+SCENARIOS = ("stages", "process_file", "from_file", "from_directory", "prefilter", "prefetch", "outline")
+
+# Reading threads of the prefetch scenario.
+PREFETCH_THREADS = 8
+
+
+def peak_rss_kib() -> int:
+    """
+    Returns the peak resident set size of this process and of its terminated children, in KiB.
+    """
+    scale = 1024 if sys.platform == "darwin" else 1  # ru_maxrss is in bytes on macOS, in KiB elsewhere
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    ) // scale
+
+
+def run_stages(directory: str, workers: int) -> tuple:
+    """
+    Runs the whole pipeline step by step and times each stage separately.
+
+    Returns:
+    - tuple: The file count, class count and seconds spent in each stage.
+    """
+    stages = dict.fromkeys(("walk", "read", "decode", "parse", "extract", "resolve", "serialize", "write"), 0.0)
+    base_module_name = utils.split_path(directory)[-1]
+
+    start = time.perf_counter()
+    file_paths = file_management.find_files_with_extension(directory, ".py")
+    stages["walk"] = time.perf_counter() - start
+
+    modules = []
+    for file_path in file_paths:
+        start = time.perf_counter()
+        data = file_management.read_file_bytes(file_path)
+        read = time.perf_counter()
+        source = file_management.decode_source(data)
+        decoded = time.perf_counter()
+        tree = ast.parse(source, filename=file_path)
+        parsed = time.perf_counter()
+        module_names = utils.extract_sublist_between(utils.split_path(file_path), base_module_name)
+        modules.append(ast_management.extract_module_metadata(tree, module_names))
+        extracted = time.perf_counter()
+        stages["read"] += read - start
+        stages["decode"] += decoded - read
+        stages["parse"] += parsed - decoded
+        stages["extract"] += extracted - parsed
+
+    start = time.perf_counter()
+    classes = list(py_class_extractor.resolve_class_metadata(modules))
+    stages["resolve"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    records = [file_management.encode_json_record(class_info) for class_info in classes]
+    stages["serialize"] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        start = time.perf_counter()
+        file_management.write_encoded_records(os.path.join(output_directory, "classes.json"), records)
+        stages["write"] = time.perf_counter() - start
+
+    return len(file_paths), len(classes), stages
+
+
+def run_process_file(directory: str, workers: int) -> tuple:
+    base_module_name = utils.split_path(directory)[-1]
+    file_paths = file_management.find_files_with_extension(directory, ".py")
+    classes = sum(len(py_class_extractor.process_file(file_path, base_module_name)) for file_path in file_paths)
+    return len(file_paths), classes, None
+
+
+def run_from_file(directory: str, workers: int) -> tuple:
+    file_paths = file_management.find_files_with_extension(directory, ".py")
+    classes = sum(len(py_class_extractor.generate_classes_dicts_from_file(file_path)) for file_path in file_paths)
+    return len(file_paths), classes, None
+
+
+def run_from_directory(directory: str, workers: int) -> tuple:
+    file_count = len(file_management.find_files_with_extension(directory, ".py"))
+    classes = len(py_class_extractor.generate_classes_dicts_from_directory(directory, workers))
+    return file_count, classes, None
+
+
+def run_prefilter(directory: str, workers: int) -> tuple:
+    file_count = len(file_management.find_files_with_extension(directory, ".py"))
+    classes = len(py_class_extractor.generate_classes_dicts_from_directory(directory, workers, prefilter=True))
+    return file_count, classes, None
+
+
+def run_prefetch(directory: str, workers: int) -> tuple:
+    file_count = len(file_management.find_files_with_extension(directory, ".py"))
+    classes = len(py_class_extractor.generate_classes_dicts_from_directory(directory, workers,
+                                                                            prefetch=PREFETCH_THREADS))
+    return file_count, classes, None
+
+
+def run_outline(directory: str, workers: int) -> tuple:
+    file_count = len(file_management.find_files_with_extension(directory, ".py"))
+    classes = len(py_class_extractor.generate_classes_dicts_from_directory(directory, workers, outline=True))
+    return file_count, classes, None
+
+
+SCENARIO_FUNCTIONS = {
+    "stages": run_stages,
+    "process_file": run_process_file,
+    "from_file": run_from_file,
+    "from_directory": run_from_directory,
+    "prefilter": run_prefilter,
+    "prefetch": run_prefetch,
+    "outline": run_outline,
+}
+
+
+def measure_scenario(scenario: str, directory: str, workers: int, latency: float = 0.0) -> dict:
+    """
+    Runs one scenario and returns its throughput, peak memory and stage times. Meant to run in a fresh process.
+    """
+    with injected_latency(directory, latency):
+        start = time.perf_counter()
+        files, classes, stages = SCENARIO_FUNCTIONS[scenario](directory, workers)
+        elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "files": files,
+        "classes": classes,
+        "files_per_second": files / elapsed if elapsed else 0.0,
+        "classes_per_second": classes / elapsed if elapsed else 0.0,
+        "peak_rss_kib": peak_rss_kib(),
+        "stages": stages,
+    }
+
+
+def run_benchmarks(directory: str, scenarios=SCENARIOS, workers: int = 1, repeat: int = 3,
+                   latency: float = 0.0) -> dict:
+    """
+    Runs every scenario `repeat` times, each time in a new process, and keeps the fastest run.
+
+    Args:
+    - directory (str): The corpus directory.
+    - scenarios (Iterable[str], optional): Names of the scenarios to run.
+    - workers (int, optional): Worker processes passed to the directory entry point.
+    - repeat (int, optional): Runs per scenario.
+    - latency (float, optional): Seconds added to every access to a corpus file, see `latency.injected_latency`.
+
+    Returns:
+    - dict: The best result of each scenario, keyed by scenario name.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = dict()
+    for scenario in scenarios:
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs.append(executor.submit(measure_scenario, scenario, directory, workers, latency).result())
+        results[scenario] = min(runs, key=lambda run: run["seconds"])
+    return results
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    """
+    Prints one line per scenario, with the speedup over a baseline result file when one is given.
+    """
+    for scenario, result in results.items():
+        line = (f"{scenario:>15}: {result['files_per_second']:>9.1f} files/s {result['classes_per_second']:>10.1f} "
+                f"classes/s {result['seconds']:>8.3f}s peak {result['peak_rss_kib'] / 1024:>7.1f} MiB")
+        previous = (baseline or {}).get("results", {}).get(scenario)
+        if previous and result["seconds"]:
+            line += f"  x{previous['seconds'] / result['seconds']:.2f} vs baseline"
+        print(line)
+        if result["stages"]:
+            print(" " * 17 + "  ".join(f"{stage} {seconds:.3f}s" for stage, seconds in result["stages"].items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="Existing corpus directory; a synthetic one is generated if omitted")
+    parser.add_argument("--output", help="File the results are written to")
+    parser.add_argument("--compare", help="Earlier result file to compare with")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every file access")
+    add_spec_arguments(parser)
+    arguments = parser.parse_args()
+    spec = spec_from_arguments(arguments)
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        if arguments.corpus:
+            directory, corpus = arguments.corpus, None
+        else:
+            directory = os.path.join(temporary_directory, "corpus")
+            corpus = CorpusGenerator(spec).generate(directory)
+            print(f"Generated {corpus['files']} files, {corpus['classes']} classes, {corpus['bytes']} bytes")
+        results = run_benchmarks(directory, arguments.scenarios, arguments.workers, arguments.repeat,
+                                 arguments.latency / 1000)
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_results(results, baseline)
+
+    if arguments.output:
+        report = {
+            "spec": None if arguments.corpus else asdict(spec),
+            "corpus": corpus,
+            "environment": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "workers": arguments.workers,
+                "repeat": arguments.repeat,
+                "latency_ms": arguments.latency,
+            },
+            "results": results,
+        }
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measures the memory held by 100k class records with the previous plain dataclasses and with the current schemas.
+
+Records are rebuilt from decoded JSON, as when results are loaded from the cache or a saved output file.
+
+Usage:
+    python -m benchmarks.schema_memory [class_count]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+from py_class_extractor.schemas import ClassInformation
+
+
+@dataclass
+class LegacyAttributeInformation:
+    name: str
+    data_type: str
+    encapsulation: str
+
+
+@dataclass
+class LegacyFunctionInformation:
+    name: str
+    args: Tuple[str]
+    return_value: Any
+    encapsulation: str
+
+
+@dataclass
+class LegacyRelationshipInformation:
+    type: str
+    related: str
+
+
+@dataclass
+class LegacyClassInformation:
+    modules: Tuple[str]
+    name: str
+    relationships: Tuple[LegacyRelationshipInformation]
+    attributes: Tuple[LegacyAttributeInformation]
+    methods: Tuple[LegacyFunctionInformation]
+
+
+def legacy_from_dictionary(data: dict) -> LegacyClassInformation:
+    return LegacyClassInformation(
+        modules=data["modules"],
+        name=data["name"],
+        relationships=tuple(LegacyRelationshipInformation(**relationship) for relationship in data["relationships"]),
+        attributes=tuple(LegacyAttributeInformation(**attribute) for attribute in data["attributes"]),
+        methods=tuple(LegacyFunctionInformation(**method) for method in data["methods"]),
+    )
+
+
+def synthetic_class_json(class_count: int) -> str:
+    """
+    Builds a JSON document of class dictionaries shaped like real output.
+    """
+    classes = []
+    for index in range(class_count):
+        classes.append({
+            "name": f"Class{index}",
+            "modules": ["package", f"module{index // 20}"],
+            "relationships": [{"type": "inheritance", "related": f"Base{index % 50}"}],
+            "attributes": [
+                {"name": f"attribute_{position}", "data_type": None, "encapsulation": "Public"}
+                for position in range(3)
+            ],
+            "methods": [
+                {"name": f"_method_{position}", "args": ["self", "value"], "return_value": None,
+                 "encapsulation": "Private"}
+                for position in range(5)
+            ],
+        })
+    return json.dumps(classes)
+
+
+def measure(document: str, factory) -> int:
+    """
+    Returns the bytes retained by the records built from a JSON document, once the decoded dictionaries are freed.
+    """
+    tracemalloc.start()
+    class_dicts = json.loads(document)
+    records = [factory(class_dict) for class_dict in class_dicts]
+    del class_dicts
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main(class_count: int) -> None:
+    document = synthetic_class_json(class_count)
+    print(f"{class_count} classes, 3 attributes, 5 methods and 1 relationship each")
+    for label, factory in (("legacy", legacy_from_dictionary), ("compact", ClassInformation.from_dictionary)):
+        allocated = measure(document, factory)
+        print(f"{label:>8}: {allocated / 2 ** 20:>8.1f} MiB total, "
+              f"{allocated / class_count * 100_000 / 2 ** 20:>8.1f} MiB per 100k classes")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,87 @@
+"""
+Counts the AST nodes visited per file by the legacy multi-walk extraction and by the single-pass ModuleInspector.
+
+Usage:
+    python -m benchmarks.visitor_nodes [directory]
+"""
+import ast
+import sys
+import sysconfig
+import time
+
+from py_class_extractor import ast_collectors, ast_management, file_management
+
+
+class VisitCounter:
+    """
+    Context manager counting every call to ast.NodeVisitor.visit while active.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._original_visit = None
+
+    def __enter__(self):
+        self._original_visit = ast.NodeVisitor.visit
+        counter = self
+
+        def counting_visit(visitor, node):
+            counter.count += 1
+            return counter._original_visit(visitor, node)
+
+        ast.NodeVisitor.visit = counting_visit
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        ast.NodeVisitor.visit = self._original_visit
+
+
+def legacy_extraction(tree: ast.AST) -> list:
+    """
+    Runs the previous pipeline: class collection, import collection, then two inspectors per class.
+    """
+    import_aliases = ast_management.extract_alias_imports(tree)
+    return [
+        ast_management.get_class_metadata(class_node, import_aliases)
+        for class_node in ast_management.extract_class_nodes(tree)
+    ]
+
+
+def single_pass_extraction(tree: ast.AST) -> list:
+    """
+    Runs the single-pass ModuleInspector.
+    """
+    return ast_collectors.ModuleInspector().inspect(tree)
+
+
+def measure(trees: list, extraction) -> tuple:
+    """
+    Returns the visited node count, elapsed seconds and failure count of an extraction over all trees.
+    """
+    failures = 0
+    start = time.perf_counter()
+    with VisitCounter() as counter:
+        for tree in trees:
+            try:
+                extraction(tree)
+            except (KeyError, TypeError):  # Base expressions the relationship inspector cannot render
+                failures += 1
+    return counter.count, time.perf_counter() - start, failures
+
+
+def main(directory: str) -> None:
+    trees = []
+    for file_path in file_management.find_files_with_extension(directory, ".py"):
+        try:
+            trees.append(ast_management.parse_ast_from_file(file_path))
+        except (SyntaxError, ValueError, OSError):
+            continue
+
+    print(f"{len(trees)} files parsed from {directory}")
+    for label, extraction in (("legacy", legacy_extraction), ("single-pass", single_pass_extraction)):
+        visited, elapsed, failures = measure(trees, extraction)
+        print(f"{label:>12}: {visited:>10} nodes visited, {visited / len(trees):>8.1f} nodes/file, "
+              f"{elapsed:.3f}s ({failures} files failed)")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else sysconfig.get_paths()["stdlib"])
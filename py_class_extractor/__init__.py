@@ -1,69 +1,484 @@
+import os
+from dataclasses import replace
+from typing import Iterator, Tuple
+
 import py_class_extractor.ast_management
 import py_class_extractor.ast_collectors
+import py_class_extractor.cache
 import py_class_extractor.file_management
+import py_class_extractor.parallel
 import py_class_extractor.schemas
+import py_class_extractor.stats
+import py_class_extractor.symbols
 import py_class_extractor.utils
+from py_class_extractor.schemas import ClassInformation, ModuleInformation
+
+
+def process_module(file_path: str, base_module_name: str, cache: "py_class_extractor.cache.ResultCache" = None,
+                   encoding_fallback: bool = False, prefilter: bool = False,
+                   collect_calls: bool = False, outline: bool = False) -> ModuleInformation:
+    """
+    Processes a single Python file to extract its module and class metadata.
+
+    Args:
+        file_path (str): The path to the Python file.
+        base_module_name (str): The base module name used for relative paths.
+        cache (ResultCache, optional): Cache reused when the file is unchanged and updated otherwise.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement. The imports
+            of a skipped file are left as None (not collected) unless it contains no import either.
+        collect_calls (bool, optional): Also collect the calls made by the methods, see `callgraph`.
+        outline (bool, optional): Only parse the statements class extraction can see, see `outline`. The
+            result is the same, faster. Ignored when calls are collected, since they are in the method bodies.
+
+    Returns:
+        ModuleInformation: The module metadata, including its classes and imports.
+    """
+    module_input = read_module_input(
+        file_path, base_module_name, cache, encoding_fallback, collect_calls, outline, read=False
+    )
+    return process_module_input(
+        file_path, module_input, base_module_name, cache, encoding_fallback, prefilter, collect_calls, outline
+    )[0]
+
+def process_module_with_stats(file_path: str, base_module_name: str, cache: "py_class_extractor.cache.ResultCache" = None,
+                              encoding_fallback: bool = False, prefilter: bool = False, collect_calls: bool = False,
+                              outline: bool = False) -> Tuple[ModuleInformation, "py_class_extractor.stats.FileStats"]:
+    """
+    Processes a single Python file like `process_module`, timing each stage of the pipeline.
+
+    Args:
+        file_path (str): The path to the Python file.
+        base_module_name (str): The base module name used for relative paths.
+        cache (ResultCache, optional): Cache reused when the file is unchanged and updated otherwise.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement.
+        collect_calls (bool, optional): Also collect the calls made by the methods.
+        outline (bool, optional): Only parse the statements class extraction can see, see `process_module`.
+
+    Returns:
+        Tuple[ModuleInformation, FileStats]: The module metadata and the statistics of the file.
+    """
+    timer = py_class_extractor.stats.StageTimer()
+    module_input = read_module_input(
+        file_path, base_module_name, cache, encoding_fallback, collect_calls, outline, False, timer
+    )
+    return process_module_input(
+        file_path, module_input, base_module_name, cache, encoding_fallback, prefilter, collect_calls, outline,
+        timer
+    )
 
+def _skip_lap(stage: str) -> None:
+    """
+    Stands in for `StageTimer.lap` when the stages of a file are not timed.
 
-def process_file(file_path: str, base_module_name: str) -> list:
+    Args:
+        stage (str): Name of the stage that just finished.
+    """
+
+def read_module_input(file_path: str, base_module_name: str, cache: "py_class_extractor.cache.ResultCache" = None,
+                      encoding_fallback: bool = False, collect_calls: bool = False, outline: bool = False,
+                      read: bool = True, timer: "py_class_extractor.stats.StageTimer" = None) -> tuple:
+    """
+    Performs the I/O half of `process_module`: looks the file up in the cache and reads its bytes on a miss.
+
+    A prefetching thread runs it ahead of `process_module_input`, which does the rest, see `analyze_files`.
+
+    Args:
+        file_path (str): The path to the Python file.
+        base_module_name (str): The base module name used for relative paths.
+        cache (ResultCache, optional): Cache looked up before reading the file.
+        encoding_fallback (bool, optional): Whether the encoding fallback is enabled; if not, entries extracted
+            with it are misses.
+        collect_calls (bool, optional): Whether calls are collected; cached modules without calls are misses.
+        outline (bool, optional): Whether the file would be parsed in outline; if not, outline entries are misses.
+        read (bool, optional): Read the file on a miss. If not, `process_module_input` reads it, which lets the
+            prefilter memory-map large files.
+        timer (StageTimer, optional): Timer the stages run are recorded in.
+
+    Returns:
+        tuple: The cached module metadata or None, the cache fingerprint or None, and the bytes of the file
+            or None when they were not read.
+    """
+    lap = _skip_lap if timer is None else timer.lap
+    fingerprint = None
+    data = None
+    if cache is not None:
+        module_metadata, fingerprint = cache.lookup(
+            file_path, base_module_name, outline and not collect_calls, encoding_fallback
+        )
+        lap("cache")
+        if module_metadata is not None and (module_metadata.calls is not None or not collect_calls):
+            return module_metadata, fingerprint, None
+        data = fingerprint.data  # Already read when content hashes were compared
+    if data is None and read:
+        data = py_class_extractor.ast_management.read_source_file(file_path)
+        lap("read")
+    return None, fingerprint, data
+
+def process_module_input(file_path: str, module_input: tuple, base_module_name: str,
+                         cache: "py_class_extractor.cache.ResultCache" = None, encoding_fallback: bool = False,
+                         prefilter: bool = False, collect_calls: bool = False, outline: bool = False,
+                         timer: "py_class_extractor.stats.StageTimer" = None
+                         ) -> Tuple[ModuleInformation, "py_class_extractor.stats.FileStats"]:
+    """
+    Performs the CPU half of `process_module` on the output of `read_module_input`.
+
+    Args:
+        file_path (str): The path to the Python file.
+        module_input (tuple): What `read_module_input` returned for the file.
+        base_module_name (str): The base module name used for relative paths.
+        cache (ResultCache, optional): Cache updated with the result.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement.
+        collect_calls (bool, optional): Also collect the calls made by the methods.
+        outline (bool, optional): Only parse the statements class extraction can see, see `process_module`.
+        timer (StageTimer, optional): Timer the stages run are recorded in, the one given to
+            `read_module_input` so that the time spent reading is included.
+
+    Returns:
+        Tuple[ModuleInformation, FileStats]: The module metadata and the statistics of the file, or None
+            instead of the statistics when no timer is given.
+    """
+    module_metadata, fingerprint, data = module_input
+    if module_metadata is not None:
+        file_stats = None if timer is None else timer.file_stats(file_path, 0, 0, len(module_metadata.classes), True)
+        return module_metadata, file_stats
+
+    lap = _skip_lap if timer is None else timer.lap
+    outline = outline and not collect_calls
+    modules = py_class_extractor.utils.extract_sublist_between(
+        py_class_extractor.utils.split_path(file_path), base_module_name
+    )
+    if prefilter:
+        if data is None:
+            data, may_define_classes, may_import = py_class_extractor.file_management.scan_python_file(file_path)
+        else:
+            may_define_classes, may_import = py_class_extractor.file_management.scan_python_source(data)
+        lap("prefilter")
+        if not may_define_classes:
+            # Not cached: the imports of the module may be missing
+            module_metadata = py_class_extractor.ast_management.skipped_module_metadata(
+                modules, may_import, collect_calls
+            )
+            file_stats = None if timer is None else timer.file_stats(
+                file_path, 0 if data is None else len(data), 0, 0, False, True
+            )
+            return module_metadata, file_stats
+
+    if data is None:
+        data = py_class_extractor.ast_management.read_source_file(file_path)
+        lap("read")
+    source = py_class_extractor.ast_management.decode_source_from_bytes(data, file_path, encoding_fallback)
+    lap("decode")
+    ast_tree = py_class_extractor.ast_management.parse_ast_from_source(source, file_path, outline)
+    lap("parse")
+    module_metadata, nodes_visited = py_class_extractor.ast_management.inspect_module(ast_tree, modules, collect_calls)
+    lap("extract")
+
+    if cache is not None:
+        cache.store(file_path, base_module_name, fingerprint, module_metadata, data, outline, encoding_fallback)
+        lap("cache")
+
+    file_stats = None if timer is None else timer.file_stats(
+        file_path, len(data), nodes_visited, len(module_metadata.classes), False
+    )
+    return module_metadata, file_stats
+def process_file(file_path: str, base_module_name: str, cache: "py_class_extractor.cache.ResultCache" = None,
+                 encoding_fallback: bool = False) -> list:
     """
     Processes a single Python file to extract class metadata.
 
     Args:
         file_path (str): The path to the Python file.
         base_module_name (str): The base module name used for relative paths.
+        cache (ResultCache, optional): Cache reused when the file is unchanged and updated otherwise.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
 
     Returns:
         list: A list of class metadata objects.
     """
-    ast_tree = py_class_extractor.ast_management.parse_ast_from_file(file_path)
-    import_aliases = py_class_extractor.ast_management.extract_alias_imports(ast_tree)
-    class_nodes = py_class_extractor.ast_management.extract_class_nodes(ast_tree)
-    
-    class_metadata_list = []
-    for class_node in class_nodes:
-        class_metadata = py_class_extractor.ast_management.get_class_metadata(class_node, import_aliases)
-        class_metadata.modules = py_class_extractor.utils.extract_sublist_between(
-            py_class_extractor.utils.split_path(file_path), base_module_name
+    return list(process_module(file_path, base_module_name, cache, encoding_fallback).classes)
+
+def iter_python_files(path: str) -> Iterator[str]:
+    """
+    Lazily lists the Python files to analyze under a path.
+
+    Args:
+        path (str): The path to a Python file or to a directory containing Python files.
+
+    Returns:
+        Iterator[str]: The file itself, or the Python files of the directory in walk order.
+    """
+    if os.path.isfile(path):
+        return iter([path])
+    return py_class_extractor.file_management.iter_files_with_extension(path, ".py")
+
+def analyze_files(file_paths, base_module_name: str, workers: int = 1, cache_directory: str = None,
+                  encoding_fallback: bool = False, stats: "py_class_extractor.stats.ScanStats" = None,
+                  prefilter: bool = False, collect_calls: bool = False,
+                  prefetch: int = 0, outline: bool = False) -> Iterator[ModuleInformation]:
+    """
+    Lazily extracts module metadata from Python files, see `iter_module_metadata`.
+
+    Args:
+        file_paths (Iterable[str]): The Python files to analyze.
+        base_module_name (str): The base module name used for relative paths.
+
+    Yields:
+        ModuleInformation: The metadata of each module, in file order.
+    """
+    cache = None if cache_directory is None else py_class_extractor.cache.ResultCache(cache_directory)
+
+    if prefetch and py_class_extractor.parallel.resolve_worker_count(workers) == 1:
+        def read(file_path: str) -> tuple:
+            timer = None if stats is None else py_class_extractor.stats.StageTimer()
+            module_input = read_module_input(
+                file_path, base_module_name, cache, encoding_fallback, collect_calls, outline, True, timer
+            )
+            return file_path, timer, module_input
+
+        for file_path, timer, module_input in py_class_extractor.parallel.imap_prefetched(read, file_paths, prefetch):
+            if timer is not None:
+                timer.resume()  # Not counting the time the input waited in the queue
+            module_metadata, file_stats = process_module_input(
+                file_path, module_input, base_module_name, cache, encoding_fallback, prefilter, collect_calls,
+                outline, timer
+            )
+            if stats is not None:
+                stats.record_file(file_stats)
+            yield module_metadata
+    elif stats is None:
+        yield from py_class_extractor.parallel.imap_in_processes(
+            process_module, file_paths, workers, base_module_name, cache, encoding_fallback, prefilter,
+            collect_calls, outline
         )
-        class_metadata_list.append(class_metadata)
-    
-    return class_metadata_list
+    else:
+        for module_metadata, file_stats in py_class_extractor.parallel.imap_in_processes(
+            process_module_with_stats, file_paths, workers, base_module_name, cache, encoding_fallback, prefilter,
+            collect_calls, outline
+        ):
+            stats.record_file(file_stats)
+            yield module_metadata
 
-def generate_classes_dicts_from_file(file_path: str) -> None:
+    if cache is not None:
+        cache.prune()
+
+def iter_module_metadata(path: str, workers: int = 1, cache_directory: str = None, encoding_fallback: bool = False,
+                         stats: "py_class_extractor.stats.ScanStats" = None,
+                         prefilter: bool = False, collect_calls: bool = False,
+                         prefetch: int = 0, outline: bool = False) -> Iterator[ModuleInformation]:
     """
-    Analyzes the specified Python file and generates a JSON file containing class metadata.
+    Lazily extracts module metadata from a Python file or from every Python file in a directory.
+
+    Modules are yielded as soon as each file is analyzed, so memory does not grow with the size of the tree.
 
     Args:
-        file_path (str): The path to the Python file to be analyzed.
-        output_path (str): The path to the output JSON file.
+        path (str): The path to a Python file or to a directory containing Python files.
+        workers (int, optional): Number of processes used to analyze files. Defaults to 1 (no pool);
+            None or 0 uses one process per CPU core. The output order does not depend on this value.
+        cache_directory (str, optional): Directory of a persistent result cache; only files that changed
+            since they were cached are parsed again. The cache may be shared by concurrent runs.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        stats (ScanStats, optional): Filled with the timings and counters of every file as it is yielded.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement; such
+            modules have no classes, and their imports are None when they may bind imported names.
+        collect_calls (bool, optional): Also collect the calls made by the methods, in the same traversal;
+            `callgraph.CallGraph.from_modules` turns them into a queryable graph.
+        prefetch (int, optional): Number of threads reading upcoming files while earlier ones are parsed,
+            for storage with a high latency such as network mounts. Only used with a single worker process,
+            since worker processes already overlap their reads. 0 (the default) reads each file when parsing it.
+        outline (bool, optional): Only parse the statements class extraction can see, skipping the bodies of
+            functions and methods other than `__init__`. The output is unchanged. Ignored when calls are collected.
+
+    Yields:
+        ModuleInformation: The metadata of each module, in file order.
+    """
+    base_module_name = py_class_extractor.utils.split_path(path)[-1]
+    yield from analyze_files(
+        iter_python_files(path), base_module_name, workers, cache_directory, encoding_fallback, stats, prefilter,
+        collect_calls, prefetch, outline
+    )
+
+def iter_class_metadata(path: str, workers: int = 1, cache_directory: str = None, encoding_fallback: bool = False,
+                        stats: "py_class_extractor.stats.ScanStats" = None,
+                        prefilter: bool = False) -> Iterator[ClassInformation]:
+    """
+    Lazily extracts class metadata from a Python file or from every Python file in a directory.
+
+    Classes are yielded file by file as soon as each file is analyzed, so memory does not grow
+    with the size of the tree. Relationship targets are qualified within their own module only;
+    use `resolve_class_metadata` to resolve them across the corpus.
+
+    Args:
+        path (str): The path to a Python file or to a directory containing Python files.
+        workers (int, optional): Number of processes used to analyze files. Defaults to 1 (no pool);
+            None or 0 uses one process per CPU core. The output order does not depend on this value.
+        cache_directory (str, optional): Directory of a persistent result cache; only files that changed
+            since they were cached are parsed again. The cache may be shared by concurrent runs.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        stats (ScanStats, optional): Filled with the timings and counters of every file as it is analyzed.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement.
+
+    Yields:
+        ClassInformation: The metadata of each class, in file order.
+    """
+    for module_metadata in iter_module_metadata(path, workers, cache_directory, encoding_fallback, stats, prefilter):
+        yield from module_metadata.classes
+
+def resolve_class_metadata(module_metadata_list: list, loader=None) -> Iterator[ClassInformation]:
+    """
+    Resolves the relationship targets of every class against a corpus-wide symbol index.
+
+    Args:
+        module_metadata_list (list): The ModuleInformation objects of the whole corpus.
+        loader (Callable, optional): Returns the complete metadata of a module skipped by the prefilter,
+            see `symbols.SymbolIndex`.
+
+    Yields:
+        ClassInformation: The metadata of each class, in module order, with resolved relationship targets.
+    """
+    index = py_class_extractor.symbols.SymbolIndex(module_metadata_list, loader)
+    for module_metadata in module_metadata_list:
+        for class_metadata in module_metadata.classes:
+            yield index.resolve_class(class_metadata, module_metadata)
+
+def skipped_module_loader(file_paths: list, module_metadata_list: list, base_module_name: str,
+                          encoding_fallback: bool = False, stats: "py_class_extractor.stats.ScanStats" = None,
+                          process=None):
+    """
+    Builds the loader that analyzes the modules skipped by the prefilter when their imports are needed.
+
+    Args:
+        file_paths (list): The analyzed files.
+        module_metadata_list (list): The ModuleInformation of each file, in the same order.
+        base_module_name (str): The base module name used for relative paths.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        stats (ScanStats, optional): Counts the skipped modules that had to be parsed after all.
+        process (Callable, optional): Analyzes a skipped file given its path, `process_module` by default. It may
+            return None when the file cannot be analyzed; the imports of the module are then left unresolved.
+
+    Returns:
+        Callable or None: The loader, or None when no module had its imports skipped.
+    """
+    skipped_paths = {
+        module_metadata.name: file_path
+        for file_path, module_metadata in zip(file_paths, module_metadata_list)
+        if module_metadata.imports is None
+    }
+    if not skipped_paths:
+        return None
+
+    if process is None:
+        def process(file_path: str) -> ModuleInformation:
+            return process_module(file_path, base_module_name, encoding_fallback=encoding_fallback)
+
+    def load(module_metadata: ModuleInformation) -> ModuleInformation:
+        if stats is not None:
+            stats.deferred_parses += 1
+        loaded = process(skipped_paths[module_metadata.name])
+        if loaded is None:
+            # Marked as collected, so the index does not try to load it again
+            return replace(module_metadata, imports=(), star_imports=())
+        return loaded
+
+    return load
+
+def to_dictionaries(module_metadata_list: list, stats: "py_class_extractor.stats.ScanStats" = None,
+                    loader=None) -> list:
     """
-    base_module_name = py_class_extractor.utils.split_path(file_path)[-1]
-    class_metadata_list = process_file(file_path, base_module_name)
+    Resolves the relationships of every class across the corpus and converts the classes to dictionaries.
+
+    Args:
+        module_metadata_list (list): The ModuleInformation objects of the whole corpus.
+        stats (ScanStats, optional): Filled with the time spent resolving and converting.
+        loader (Callable, optional): Returns the complete metadata of a module skipped by the prefilter.
+
+    Returns:
+        list: The dictionary of each class, in module order.
+    """
+    if stats is None:
+        return [metadata.to_dictionary() for metadata in resolve_class_metadata(module_metadata_list, loader)]
+
+    with stats.measure("resolve"):
+        class_metadata_list = list(resolve_class_metadata(module_metadata_list, loader))
+    with stats.measure("serialize"):
+        return [metadata.to_dictionary() for metadata in class_metadata_list]
+
+def generate_classes_dicts(path: str, workers: int = 1, cache_directory: str = None, encoding_fallback: bool = False,
+                           stats: "py_class_extractor.stats.ScanStats" = None, prefilter: bool = False,
+                           prefetch: int = 0, outline: bool = False) -> list:
+    """
+    Analyzes a Python file or every Python file in a directory and returns the metadata of their classes.
+
+    Args:
+        path (str): The path to a Python file or to a directory containing Python files.
+        workers (int, optional): Number of processes used to analyze files, see `iter_module_metadata`.
+        cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        stats (ScanStats, optional): Filled with the timings and counters of the scan.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement. The output
+            is unchanged: a skipped file is parsed later only if a relationship is resolved through its imports.
+        prefetch (int, optional): Number of threads reading files ahead of the parser, see `iter_module_metadata`.
+        outline (bool, optional): Only parse the statements class extraction can see, see `iter_module_metadata`.
+
+    Returns:
+        list: The dictionary of each class, with relationships resolved across the corpus.
+    """
+    base_module_name = py_class_extractor.utils.split_path(path)[-1]
+    file_paths = list(iter_python_files(path))
+    module_metadata_list = list(analyze_files(
+        file_paths, base_module_name, workers, cache_directory, encoding_fallback, stats, prefilter,
+        prefetch=prefetch, outline=outline
+    ))
+    loader = skipped_module_loader(file_paths, module_metadata_list, base_module_name, encoding_fallback, stats)
 
     # Convert class metadata to dictionary format
-    class_metadata_dicts = [metadata.to_dictionary() for metadata in class_metadata_list]
+    return to_dictionaries(module_metadata_list, stats, loader)
+
+def generate_classes_dicts_from_file(file_path: str, cache_directory: str = None, encoding_fallback: bool = False,
+                                     stats: "py_class_extractor.stats.ScanStats" = None,
+                                     prefilter: bool = False) -> None:
+    """
+    Analyzes the specified Python file and generates a JSON file containing class metadata.
 
-    return class_metadata_dicts
+    Args:
+        file_path (str): The path to the Python file to be analyzed.
+        cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        stats (ScanStats, optional): Filled with the timings and counters of the scan.
+        prefilter (bool, optional): Skip parsing the file if its bytes contain no class statement.
+    """
+    return generate_classes_dicts(
+        file_path, cache_directory=cache_directory, encoding_fallback=encoding_fallback, stats=stats,
+        prefilter=prefilter
+    )
 
-def generate_classes_dicts_from_directory(directory_path: str) -> None:
+def generate_classes_dicts_from_directory(directory_path: str, workers: int = 1, cache_directory: str = None,
+                                          encoding_fallback: bool = False,
+                                          stats: "py_class_extractor.stats.ScanStats" = None,
+                                          prefilter: bool = False, prefetch: int = 0, outline: bool = False) -> None:
     """
     Analyzes all Python files in the specified directory and generates a JSON file with class metadata
     for all files combined.
 
+    Relationship targets are resolved across all the analyzed modules. Use `iter_class_metadata` with
+    `file_management.stream_data_to_json` to avoid holding every class in memory.
+
     Args:
         directory_path (str): The path to the directory containing Python files.
-        output_filename (str): The name of the output JSON file.
+        workers (int, optional): Number of processes used to analyze files. Defaults to 1 (no pool);
+            None or 0 uses one process per CPU core. The output order does not depend on this value.
+        cache_directory (str, optional): Directory of a persistent result cache; only files that changed
+            since they were cached are parsed again. The cache may be shared by concurrent runs.
+        encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        stats (ScanStats, optional): Filled with the timings and counters of the scan. Files are timed
+            in the worker processes and merged in the calling process, so the hook always runs there.
+        prefilter (bool, optional): Skip parsing files whose bytes contain no class statement. The output
+            is unchanged: a skipped file is parsed later only if a relationship is resolved through its imports.
+        prefetch (int, optional): Number of threads reading files ahead of the parser, see `iter_module_metadata`.
+        outline (bool, optional): Only parse the statements class extraction can see, see `iter_module_metadata`.
     """
-    python_file_paths = py_class_extractor.file_management.find_files_with_extension(directory_path, ".py")
-    base_module_name = py_class_extractor.utils.split_path(directory_path)[-1]
-
-    # Collect metadata for all classes across all files
-    all_class_metadata_list = []
-    for file_path in python_file_paths:
-        all_class_metadata_list.extend(process_file(file_path, base_module_name))
-
-    # Convert all class metadata to dictionary format
-    all_class_metadata_dicts = [metadata.to_dictionary() for metadata in all_class_metadata_list]
-
-    return all_class_metadata_dicts
+    return generate_classes_dicts(
+        directory_path, workers, cache_directory, encoding_fallback, stats, prefilter, prefetch, outline
+    )
@@ -0,0 +1,5 @@
+import sys
+
+from py_class_extractor.cli import main
+
+sys.exit(main())
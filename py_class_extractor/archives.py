@@ -0,0 +1,314 @@
+import os
+import tarfile
+import zipfile
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import py_class_extractor
+from py_class_extractor import ast_management, cache as result_cache, file_management, parallel
+from py_class_extractor.schemas import ModuleInformation
+
+ZIP_SUFFIXES = (".whl", ".zip")
+TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar")
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES
+
+# Wheel directories installed into site-packages; their members are importable from there.
+WHEEL_PACKAGE_DIRECTORIES = ("purelib", "platlib")
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveMember:
+    """
+    Data class holding a Python file read from an archive.
+
+    Attributes:
+    - name (str): Name of the member in the archive.
+    - modules (Tuple[str]): Module path components derived from the member name, e.g. ("package", "module").
+    - data (bytes): Content of the member.
+    """
+
+    name: str
+    modules: Tuple[str, ...]
+    data: bytes
+
+
+def is_archive(path: str) -> bool:
+    """
+    Tells whether a path names an archive this module can analyze.
+    """
+    return os.path.isfile(path) and path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def member_modules(name: str, wheel: bool = False) -> Optional[Tuple[str, ...]]:
+    """
+    Derives the module path components of an archive member from its name.
+
+    Wheel metadata is skipped, and files a wheel installs into site-packages are named from there. The
+    top directory of a source distribution, such as `project-1.0/`, cannot be a package and is dropped,
+    as is a `src/` layout directory below it.
+
+    Args:
+    - name (str): Name of the member in the archive.
+    - wheel (bool, optional): Whether the archive is a wheel.
+
+    Returns:
+    - tuple or None: The module path components, or None if the member is not a Python module to analyze.
+    """
+    if not name.endswith(".py"):
+        return None
+    parts = [part for part in name[:-len(".py")].split("/") if part and part != "."]
+    if not parts:
+        return None
+    if wheel:
+        if parts[0].endswith(".dist-info"):
+            return None
+        if parts[0].endswith(".data"):
+            if len(parts) < 3 or parts[1] not in WHEEL_PACKAGE_DIRECTORIES:
+                return None  # Scripts, headers and data files
+            parts = parts[2:]
+    else:
+        if len(parts) > 1 and not parts[0].isidentifier():
+            parts = parts[1:]
+        if len(parts) > 1 and parts[0] == "src":
+            parts = parts[1:]
+        if parts[0].endswith(".egg-info"):
+            return None
+    return tuple(parts)
+
+
+def iter_archive_members(archive_path: str) -> Iterator[ArchiveMember]:
+    """
+    Lazily reads the Python modules of an archive, one member at a time, without extracting it.
+
+    Tar archives are read as a stream, so compressed archives are decompressed once, front to back.
+
+    Args:
+    - archive_path (str): Path of a `.whl`, `.zip` or tar archive, possibly compressed.
+
+    Yields:
+    - ArchiveMember: Each Python module, in archive order.
+
+    Raises:
+    - ValueError: If the path does not name a supported archive.
+    """
+    lower_path = archive_path.lower()
+    if lower_path.endswith(ZIP_SUFFIXES):
+        wheel = lower_path.endswith(".whl")
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                modules = None if info.is_dir() else member_modules(info.filename, wheel)
+                if modules is not None:
+                    yield ArchiveMember(info.filename, modules, archive.read(info))
+    elif lower_path.endswith(TAR_SUFFIXES):
+        with tarfile.open(archive_path, "r|*") as archive:
+            for info in archive:
+                modules = member_modules(info.name) if info.isfile() else None
+                if modules is not None:
+                    yield ArchiveMember(info.name, modules, archive.extractfile(info).read())
+    else:
+        raise ValueError(f"Unsupported archive '{archive_path}', expected one of {ARCHIVE_SUFFIXES}")
+
+
+def read_archive_members(archive_path: str, names: Iterable[str]) -> Dict[str, bytes]:
+    """
+    Reads several members of an archive at once.
+
+    Zip members are read directly; a tar archive is streamed once, whatever the number of members.
+
+    Args:
+    - archive_path (str): Path of the archive.
+    - names (Iterable[str]): Names of the members.
+
+    Returns:
+    - dict: Content of every member found, keyed by name.
+    """
+    names = set(names)
+    if archive_path.lower().endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(archive_path) as archive:
+            return {name: archive.read(name) for name in names if name in archive.NameToInfo}
+    contents = dict()
+    with tarfile.open(archive_path, "r|*") as archive:
+        for info in archive:
+            if info.name in names and info.isfile():
+                contents[info.name] = archive.extractfile(info).read()
+                if len(contents) == len(names):
+                    break
+    return contents
+
+
+def read_archive_member(archive_path: str, name: str) -> bytes:
+    """
+    Reads a single member of an archive.
+
+    Args:
+    - archive_path (str): Path of the archive.
+    - name (str): Name of the member.
+
+    Returns:
+    - bytes: Content of the member.
+
+    Raises:
+    - KeyError: If the archive has no such member.
+    """
+    contents = read_archive_members(archive_path, (name,))
+    if name not in contents:
+        raise KeyError(f"No member '{name}' in '{archive_path}'")
+    return contents[name]
+
+
+def process_archive_member(member: ArchiveMember, archive_path: str, cache: "result_cache.ResultCache" = None,
+                           encoding_fallback: bool = False, prefilter: bool = False,
+                           collect_calls: bool = False, outline: bool = False) -> ModuleInformation:
+    """
+    Extracts the module and class metadata of an archive member, like `process_module` does for a file.
+
+    Args:
+    - member (ArchiveMember): The member.
+    - archive_path (str): Absolute path of the archive, which keys the member in the cache.
+    - cache (ResultCache, optional): Cache reused when the member content is unchanged and updated otherwise.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - prefilter (bool, optional): Skip parsing members whose bytes contain no class statement.
+    - collect_calls (bool, optional): Also collect the calls made by the methods.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`.
+
+    Returns:
+    - ModuleInformation: The module metadata, including its classes and imports.
+    """
+    key = f"{archive_path}/{member.name}"
+    outline = outline and not collect_calls
+    if cache is not None:
+        module_metadata, fingerprint = cache.lookup_data(key, member.data, "", outline, encoding_fallback)
+        if module_metadata is not None and (module_metadata.calls is not None or not collect_calls):
+            return module_metadata
+
+    if prefilter:
+        may_define_classes, may_import = file_management.scan_python_source(member.data)
+        if not may_define_classes:
+            return ast_management.skipped_module_metadata(member.modules, may_import, collect_calls)
+
+    ast_tree = ast_management.parse_ast_from_bytes(member.data, key, encoding_fallback, outline)
+    module_metadata = ast_management.extract_module_metadata(ast_tree, member.modules, collect_calls)
+
+    if cache is not None:
+        cache.store(key, "", fingerprint, module_metadata, member.data, outline, encoding_fallback)
+    return module_metadata
+
+
+def iter_archive_module_metadata(archive_path: str, workers: int = 1, cache_directory: str = None,
+                                 encoding_fallback: bool = False, prefilter: bool = False,
+                                 collect_calls: bool = False) -> Iterator[Tuple[str, ModuleInformation]]:
+    """
+    Lazily extracts module metadata from every Python module of an archive.
+
+    Members are read in the calling process as a stream and their bytes are handed to the workers, so at
+    most a bounded number of members is held in memory at once, see `parallel.imap_in_processes`.
+
+    Args:
+    - archive_path (str): Path of a `.whl`, `.zip` or tar archive, possibly compressed.
+    - workers (int, optional): Number of processes used to analyze members, see `iter_module_metadata`.
+    - cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - prefilter (bool, optional): Skip parsing members whose bytes contain no class statement.
+    - collect_calls (bool, optional): Also collect the calls made by the methods.
+
+    Yields:
+    - tuple: The name of each member and its module metadata, in archive order.
+    """
+    archive_path = os.path.abspath(archive_path)
+    cache = None if cache_directory is None else result_cache.ResultCache(cache_directory)
+    names = []
+
+    def iter_members() -> Iterator[ArchiveMember]:
+        for member in iter_archive_members(archive_path):
+            names.append(member.name)
+            yield member
+
+    module_metadata_iterator = parallel.imap_in_processes(
+        process_archive_member, iter_members(), workers, archive_path, cache, encoding_fallback, prefilter,
+        collect_calls
+    )
+    for index, module_metadata in enumerate(module_metadata_iterator):
+        yield names[index], module_metadata
+
+    if cache is not None:
+        cache.prune()
+
+
+def archive_member_loader(archive_path: str, names: List[str], module_metadata_list: List[ModuleInformation],
+                          encoding_fallback: bool = False, process=None):
+    """
+    Builds the loader that analyzes the members skipped by the prefilter when their imports are needed.
+
+    The first call reads every skipped member in a single pass over the archive, so a compressed tar
+    archive is decompressed once more at most, instead of once per member.
+
+    Args:
+    - archive_path (str): Path of the archive.
+    - names (list): The member names.
+    - module_metadata_list (list): The ModuleInformation of each member, in the same order. The loader must be
+      called with these very objects, as `symbols.SymbolIndex` does.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - process (Callable, optional): Analyzes a skipped ArchiveMember, `process_archive_member` by default. It
+      may return None when the member cannot be analyzed; the imports of the module are then left unresolved.
+
+    Returns:
+    - Callable or None: The loader, or None when no member had its imports skipped.
+    """
+    archive_path = os.path.abspath(archive_path)
+    if process is None:
+        def process(member: ArchiveMember) -> ModuleInformation:
+            return process_archive_member(member, archive_path, encoding_fallback=encoding_fallback)
+
+    # Keyed by identity: members such as "project-1.0/pkg/a.py" and "project-1.0/src/pkg/a.py" share a module name
+    skipped_names = {
+        id(module_metadata): name
+        for name, module_metadata in zip(names, module_metadata_list)
+        if module_metadata.imports is None
+    }
+    if not skipped_names:
+        return None
+
+    contents: Optional[Dict[str, bytes]] = None
+
+    def load(module_metadata: ModuleInformation) -> ModuleInformation:
+        nonlocal contents
+        if contents is None:
+            contents = read_archive_members(archive_path, skipped_names.values())
+        name = skipped_names[id(module_metadata)]
+        if name not in contents:
+            raise KeyError(f"No member '{name}' in '{archive_path}'")
+        loaded = process(ArchiveMember(name, module_metadata.modules, contents.pop(name)))
+        if loaded is None:
+            # Marked as collected, so the index does not try to load it again
+            return replace(module_metadata, imports=(), star_imports=())
+        return loaded
+
+    return load
+
+
+def generate_classes_dicts_from_archive(archive_path: str, workers: int = 1, cache_directory: str = None,
+                                        encoding_fallback: bool = False, prefilter: bool = False) -> list:
+    """
+    Analyzes every Python module of a wheel, sdist or zip archive without extracting it.
+
+    Module names are derived from the member names, see `member_modules`, so the output matches the
+    analysis of the installed or extracted package.
+
+    Args:
+    - archive_path (str): Path of a `.whl`, `.zip` or tar archive, possibly compressed.
+    - workers (int, optional): Number of processes used to analyze members, see `iter_module_metadata`.
+    - cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - prefilter (bool, optional): Skip parsing members whose bytes contain no class statement.
+
+    Returns:
+    - list: The dictionary of each class, with relationships resolved across the archive.
+    """
+    names, module_metadata_list = [], []
+    for name, module_metadata in iter_archive_module_metadata(
+        archive_path, workers, cache_directory, encoding_fallback, prefilter
+    ):
+        names.append(name)
+        module_metadata_list.append(module_metadata)
+    loader = archive_member_loader(archive_path, names, module_metadata_list, encoding_fallback)
+    return py_class_extractor.to_dictionaries(module_metadata_list, loader=loader)
@@ -1,6 +1,36 @@
 import ast
+import builtins
 
-from py_class_extractor.schemas import ClassInformation, FunctionInformation, AttributeInformation, RelationshipInformation
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Iterator, List, Optional, Tuple
+from py_class_extractor.schemas import (
+    ClassInformation, FunctionInformation, AttributeInformation, RelationshipInformation, CallInformation,
+    Encapsulation, RelationshipType, CallKind
+)
+
+
+# Fields holding statement lists; ClassDef, FunctionDef and Import nodes can only appear inside these.
+STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+def determine_encapsulation(name: str) -> Encapsulation:
+    """
+    Determines the encapsulation level of a given name.
+
+    Args:
+    - name (str): The name to analyze.
+
+    Returns:
+    - Encapsulation: The encapsulation level (PUBLIC, PRIVATE).
+    """
+    if name.startswith('__') and name.endswith('__'):
+        return Encapsulation.PUBLIC
+    elif name.startswith('_'):
+        return Encapsulation.PRIVATE
+    return Encapsulation.PUBLIC
 
 
 class ClassDefCollector(ast.NodeVisitor):
@@ -63,7 +93,7 @@ class ClassDefInspector(ast.NodeVisitor):
         self.generic_visit(node)
 
         class_info = ClassInformation(
-            modules=None, name=node.name, relationships=None, methods=tuple(self.methods), attributes=tuple(self.attributes)
+            modules=(), name=node.name, relationships=(), methods=tuple(self.methods), attributes=tuple(self.attributes)
         )
 
         return class_info
@@ -78,7 +108,7 @@ class ClassDefInspector(ast.NodeVisitor):
         Returns:
         - ast.FunctionDef: The visited function node.
         """
-        args = [arg.arg for arg in node.args.args]
+        args = tuple(arg.arg for arg in node.args.args)
         function_name = node.name
         function_encapsulation = self._determine_encapsulation(function_name)
 
@@ -102,10 +132,10 @@ class ClassDefInspector(ast.NodeVisitor):
         Returns:
         - ast.AsyncFunctionDef: The visited async function node.
         """
-        args = [arg.arg for arg in node.args.args]
+        args = tuple(arg.arg for arg in node.args.args)
 
         self.methods.append(FunctionInformation(
-            name=node.name, args=args, return_value=None, encapsulation="Public"
+            name=node.name, args=args, return_value=None, encapsulation=Encapsulation.PUBLIC
         ))
 
         self.current_function = node
@@ -228,7 +258,7 @@ class ClassDefInspector(ast.NodeVisitor):
         """
         return node  # Skip this node
 
-    def _determine_encapsulation(self, name: str) -> str:
+    def _determine_encapsulation(self, name: str) -> Encapsulation:
         """
         Determines the encapsulation level of a given name.
 
@@ -236,13 +266,9 @@ class ClassDefInspector(ast.NodeVisitor):
         - name (str): The name to analyze.
 
         Returns:
-        - str: The encapsulation level ("Public", "Private").
+        - Encapsulation: The encapsulation level (PUBLIC, PRIVATE).
         """
-        if name.startswith('__') and name.endswith('__'):
-            return "Public"
-        elif name.startswith('_'):
-            return "Private"
-        return "Public"
+        return determine_encapsulation(name)
 
 
 class RelationshipInspector(ast.NodeVisitor):
@@ -264,14 +290,13 @@ class RelationshipInspector(ast.NodeVisitor):
         for base in node.bases:
             self.current_inheritance = base
             inheritance = self.visit(base)
-            if inheritance in self.alias.values():
-                self.relationships.append(RelationshipInformation(
-                    type="inheritance", related=self.alias[inheritance]
-                ))
-            else:
-                self.relationships.append(RelationshipInformation(
-                    type="inheritance", related=inheritance
-                ))
+            # Aliases only ever bind the first component of a dotted name
+            head, separator, rest = inheritance.partition(".") if inheritance else (inheritance, "", "")
+            if head in self.alias:
+                inheritance = f"{self.alias[head]}{separator}{rest}"
+            self.relationships.append(RelationshipInformation(
+                type=RelationshipType.INHERITANCE, related=inheritance
+            ))
             self.current_inheritance = None
         return tuple(self.relationships)
 
@@ -415,4 +440,625 @@ class AliasCollector(ast.NodeVisitor):
         - dict: A dictionary with the alias as the key and the original name as the value.
         """
         if node.asname:
-            return {node.asname: node.name}
\ No newline at end of file
+            return {node.asname: node.name}
+
+
+class ClassScope:
+    """
+    Mutable accumulator for the members of a class while ModuleInspector traverses it.
+
+    Attributes:
+    - node (ast.ClassDef): The class definition node.
+    - qualified_name (str): Fully qualified name of the class.
+    - namespaces (tuple): Namespaces in which the bases of the class are looked up, innermost first.
+    - methods (list): FunctionInformation objects collected so far.
+    - attributes (list): AttributeInformation objects collected so far.
+    """
+
+    __slots__ = ("node", "qualified_name", "namespaces", "methods", "attributes")
+
+    def __init__(self, node: ast.ClassDef, qualified_name: str, namespaces: Tuple[dict, ...]) -> None:
+        """
+        Initializes an instance of ClassScope.
+
+        Args:
+        - node (ast.ClassDef): The class definition node.
+        - qualified_name (str): Fully qualified name of the class.
+        - namespaces (tuple): Namespaces in which the bases of the class are looked up, innermost first.
+        """
+        self.node = node
+        self.qualified_name = qualified_name
+        self.namespaces = namespaces
+        self.methods = []
+        self.attributes = []
+
+
+def dotted_name(node: ast.expr) -> Optional[str]:
+    """
+    Renders a `Name` or a chain of `Attribute` nodes as a dotted name, looking through subscripts.
+
+    Args:
+    - node (ast.expr): The expression to render.
+
+    Returns:
+    - str or None: The dotted name, or None if the expression is not a plain reference.
+    """
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def resolve_import_module(module_name: str, is_package: bool, level: int, target: Optional[str]) -> str:
+    """
+    Resolves the module named by an `import from` statement to an absolute dotted name.
+
+    Args:
+    - module_name (str): Fully qualified name of the importing module.
+    - is_package (bool): Whether the importing module is a package `__init__`.
+    - level (int): Number of leading dots of a relative import, 0 for absolute imports.
+    - target (str or None): The module written after the dots, if any.
+
+    Returns:
+    - str: The absolute module name.
+    """
+    if level == 0:
+        return target
+    package_parts = module_name.split(".") if is_package else module_name.split(".")[:-1]
+    if level > 1:
+        package_parts = package_parts[:max(0, len(package_parts) - (level - 1))]
+    if target:
+        package_parts.append(target)
+    return ".".join(package_parts)
+
+
+class ModuleInspector(ast.NodeVisitor):
+    """
+    A NodeVisitor implementation that collects imports and every class of a module in a single pass.
+
+    Only statement lists are traversed, so expressions inside method bodies are never visited. Each class
+    gets its own scope, which keeps the methods and attributes of nested classes out of their enclosing class.
+    Inheritance relationships are resolved once the traversal ends, so aliases imported after a class
+    definition are still taken into account.
+
+    Every module, class and function body has a namespace mapping the names it binds through imports and
+    class definitions to fully qualified names. Bases are qualified against these namespaces, giving each
+    relationship a `target` that `symbols.SymbolIndex` can later resolve across the corpus.
+
+    With `collect_calls`, the expressions of every statement visited inside a method are also scanned for
+    calls, building the method-level call graph in the same traversal. Calls are qualified once the
+    traversal ends, like the bases.
+
+    Attributes:
+    - module_name (str): Fully qualified name of the module.
+    - is_package (bool): Whether the module is a package `__init__`.
+    - alias_import (dict): Import aliases found in the module, mapping the alias to the original name.
+    - imports (dict): Module level import bindings, mapping the bound name to its fully qualified target.
+    - star_imports (list): Modules imported with `from <module> import *` at module level.
+    - scopes (list): ClassScope objects for every class found, in definition order.
+    - nodes_visited (int): Number of statement nodes visited.
+    - calls (list or None): CallInformation objects of the calls made by methods, filled by `inspect`
+      when `collect_calls` is set.
+    """
+
+    def __init__(self, module_name: str = "", is_package: bool = False, collect_calls: bool = False) -> None:
+        """
+        Initializes an instance of ModuleInspector.
+
+        Args:
+        - module_name (str, optional): Fully qualified name of the module.
+        - is_package (bool, optional): Whether the module is a package `__init__`.
+        - collect_calls (bool, optional): Collect the calls made by methods.
+        """
+        self.module_name = module_name
+        self.is_package = is_package
+        self.alias_import = dict()
+        self.imports = dict()
+        self.star_imports = list()
+        self.scopes = list()
+        self.nodes_visited = 0
+        self.current_class: ClassScope = None
+        self.current_function: ast.FunctionDef = None
+        self._module_namespace = dict()
+        self._namespace = self._module_namespace
+        self._qualified_prefix = f"{module_name}." if module_name else ""
+        self.collect_calls = collect_calls
+        self.calls = None
+        # Module level functions, which calls may target but which are not bound in the namespaces
+        self._functions = dict()
+        # Raw calls of every method, as (caller, kind, name, namespaces) tuples
+        self._raw_calls = list()
+        # (qualified name, name of the first argument, class qualified name) of the method being visited
+        self._caller = None
+        if collect_calls:
+            self.visit = self._visit_collecting_calls
+
+    def inspect(self, tree: ast.AST, modules: Tuple[str, ...] = ()) -> List[ClassInformation]:
+        """
+        Traverses the module and returns the metadata of all its classes.
+
+        Args:
+        - tree (ast.AST): Abstract syntax tree of the module.
+        - modules (tuple, optional): Module names where the classes are defined.
+
+        Returns:
+        - list: List of ClassInformation objects, with relationships resolved.
+        """
+        self.visit(tree)
+        if self.collect_calls:
+            self.calls = self._qualify_calls()
+        return [
+            ClassInformation(
+                modules=modules,
+                name=scope.node.name,
+                relationships=self._qualify_relationships(scope),
+                attributes=tuple(scope.attributes),
+                methods=tuple(scope.methods),
+                qualified_name=scope.qualified_name,
+            ).with_fingerprint()
+            for scope in self.scopes
+        ]
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """
+        Visits only the statements nested in the node, skipping its expressions.
+
+        Args:
+        - node (ast.AST): Node whose statements are visited.
+        """
+        for field in STATEMENT_FIELDS:
+            children = getattr(node, field, ())
+            self.nodes_visited += len(children)
+            for child in children:
+                self.visit(child)
+
+    def _visit_collecting_calls(self, node: ast.AST) -> None:
+        """
+        Visits a node like `visit`, first scanning the expressions of statements inside a method for calls.
+
+        Set as `visit` when calls are collected, so the default traversal pays nothing for it.
+
+        Args:
+        - node (ast.AST): Node to visit.
+        """
+        if self._caller is not None and isinstance(node, ast.stmt) \
+                and not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for field, value in ast.iter_fields(node):
+                if field not in STATEMENT_FIELDS and isinstance(value, (ast.AST, list)):
+                    self._scan_calls(value)
+        ast.NodeVisitor.visit(self, node)
+
+    def _scan_calls(self, value) -> None:
+        """
+        Records the calls found in an expression, or a list of expressions, of the current method.
+
+        Args:
+        - value (ast.AST or list): The expression.
+        """
+        caller, self_name, class_name = self._caller
+        namespaces = (self._namespace, self._module_namespace, self._functions)
+        for expression in (value if isinstance(value, list) else (value,)):
+            if not isinstance(expression, ast.AST):
+                continue
+            for child in ast.walk(expression):
+                if not isinstance(child, ast.Call):
+                    continue
+                function = child.func
+                if isinstance(function, ast.Name):
+                    self._raw_calls.append((caller, CallKind.FUNCTION, function.id, namespaces))
+                elif isinstance(function, ast.Attribute):
+                    owner = function.value
+                    if isinstance(owner, ast.Name) and owner.id == self_name:
+                        self._raw_calls.append((caller, CallKind.SELF, f"{class_name}.{function.attr}", None))
+                    elif isinstance(owner, ast.Call) and isinstance(owner.func, ast.Name) and owner.func.id == "super":
+                        self._raw_calls.append((caller, CallKind.SUPER, function.attr, None))
+                    else:
+                        owner_name = dotted_name(owner)
+                        if owner_name is None:
+                            continue
+                        head, _, rest = owner_name.partition(".")
+                        if head == self_name:
+                            self._raw_calls.append((caller, CallKind.ATTRIBUTE, f"{rest}.{function.attr}", None))
+                        else:
+                            self._raw_calls.append((caller, CallKind.FUNCTION, f"{owner_name}.{function.attr}",
+                                                    namespaces))
+
+    def _qualify_calls(self) -> List[CallInformation]:
+        """
+        Builds the calls of every method, qualifying function calls against the namespaces of their method.
+
+        Dotted calls whose first component is not bound, typically methods of local variables, are dropped.
+
+        Returns:
+        - list: CallInformation objects, in source order and without duplicates.
+        """
+        class_names = {scope.qualified_name for scope in self.scopes}
+        calls = dict()
+        for caller, kind, name, namespaces in self._raw_calls:
+            if kind is CallKind.FUNCTION:
+                qualified_name = self._qualify(name, namespaces)
+                if qualified_name is None:
+                    if "." in name:
+                        continue
+                    qualified_name = name  # Possibly bound by a star import
+                elif qualified_name in class_names:
+                    kind = CallKind.CONSTRUCTOR
+                name = qualified_name
+            calls.setdefault((caller, name, kind), None)
+        return [CallInformation(caller=caller, callee=callee, kind=kind) for caller, callee, kind in calls]
+
+    def visit_Import(self, node: ast.Import) -> None:
+        """
+        Visits an Import node, extracting its aliases and binding the imported names.
+
+        Args:
+        - node (ast.Import): The Import node to visit.
+        """
+        for name in node.names:
+            if name.asname:
+                self.alias_import[name.asname] = name.name
+                self._bind_import(name.asname, name.name)
+            else:
+                # `import a.b` binds `a` only
+                head = name.name.partition(".")[0]
+                self._bind_import(head, head)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        """
+        Visits an ImportFrom node, extracting its aliases and binding the imported names.
+
+        Args:
+        - node (ast.ImportFrom): The ImportFrom node to visit.
+        """
+        module = resolve_import_module(self.module_name, self.is_package, node.level, node.module)
+        for name in node.names:
+            if name.name == "*":
+                if self._namespace is self._module_namespace:
+                    self.star_imports.append(module)
+                continue
+            if name.asname:
+                self.alias_import[name.asname] = name.name
+            self._bind_import(name.asname or name.name, f"{module}.{name.name}" if module else name.name)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        """
+        Visits a ClassDef node and collects its methods and attributes in a scope of its own.
+
+        Args:
+        - node (ast.ClassDef): ClassDef node to visit.
+        """
+        qualified_name = f"{self._qualified_prefix}{node.name}"
+        namespaces = (self._namespace,) if self._namespace is self._module_namespace \
+            else (self._namespace, self._module_namespace)
+        scope = ClassScope(node, qualified_name, namespaces)
+        self.scopes.append(scope)
+        self._namespace[node.name] = qualified_name
+
+        outer_class, outer_function = self.current_class, self.current_function
+        self.current_class, self.current_function = scope, None
+        with self._enter_namespace(f"{qualified_name}."):
+            self.generic_visit(node)
+        self.current_class, self.current_function = outer_class, outer_function
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """
+        Visits a FunctionDef node, recording it as a method when it is defined directly in a class.
+
+        Args:
+        - node (ast.FunctionDef): FunctionDef node to visit.
+        """
+        if self.current_class is not None and self.current_function is None:
+            self.current_class.methods.append(FunctionInformation(
+                name=node.name, args=tuple(arg.arg for arg in node.args.args), return_value=None,
+                encapsulation=determine_encapsulation(node.name)
+            ))
+            self.current_function = node
+            outer_caller = self._caller
+            if self.collect_calls:
+                self._caller = self._method_caller(node)
+            with self._enter_namespace(f"{self._qualified_prefix}{node.name}.<locals>."):
+                self.generic_visit(node)
+            self.current_function, self._caller = None, outer_caller
+            return
+
+        if self.collect_calls and self._namespace is self._module_namespace:
+            self._functions[node.name] = f"{self._qualified_prefix}{node.name}"
+
+        # Nested or module level functions do not contribute members, but may still define classes
+        outer_class, outer_function = self.current_class, self.current_function
+        self.current_class, self.current_function = None, None
+        with self._enter_namespace(f"{self._qualified_prefix}{node.name}.<locals>."):
+            self.generic_visit(node)
+        self.current_class, self.current_function = outer_class, outer_function
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _method_caller(self, node: ast.FunctionDef) -> Tuple[str, Optional[str], str]:
+        """
+        Describes a method as the caller of the calls found in its body, including its nested functions.
+
+        Args:
+        - node (ast.FunctionDef): The method.
+
+        Returns:
+        - tuple: The qualified name of the method, the name of its first argument unless it is a static
+          method, and the qualified name of its class.
+        """
+        static = any(dotted_name(decorator) == "staticmethod" for decorator in node.decorator_list)
+        self_name = node.args.args[0].arg if node.args.args and not static else None
+        class_name = self.current_class.qualified_name
+        return f"{class_name}.{node.name}", self_name, class_name
+
+    @contextmanager
+    def _enter_namespace(self, qualified_prefix: str) -> Iterator[None]:
+        """
+        Opens a new namespace for the body of a class or function.
+
+        Args:
+        - qualified_prefix (str): Prefix of the qualified names of the classes defined in the body.
+        """
+        outer_namespace, outer_prefix = self._namespace, self._qualified_prefix
+        self._namespace, self._qualified_prefix = dict(), qualified_prefix
+        try:
+            yield
+        finally:
+            self._namespace, self._qualified_prefix = outer_namespace, outer_prefix
+
+    def _bind_import(self, name: str, target: str) -> None:
+        """
+        Binds an imported name in the current namespace.
+
+        Args:
+        - name (str): The name bound by the import.
+        - target (str): Fully qualified name of the imported object.
+        """
+        self._namespace[name] = target
+        if self._namespace is self._module_namespace:
+            self.imports[name] = target
+
+    def _qualify_relationships(self, scope: ClassScope) -> Tuple[RelationshipInformation, ...]:
+        """
+        Builds the inheritance relationships of a class, qualifying each base against its namespaces.
+
+        Args:
+        - scope (ClassScope): The class scope.
+
+        Returns:
+        - tuple: RelationshipInformation objects with their `target` set when the base could be qualified.
+        """
+        relationships = RelationshipInspector(self.alias_import).visit(scope.node)
+        return tuple(
+            replace(relationship, target=self._qualify(dotted_name(base), scope.namespaces))
+            for relationship, base in zip(relationships, scope.node.bases)
+        )
+
+    @staticmethod
+    def _qualify(name: Optional[str], namespaces: Tuple[dict, ...]) -> Optional[str]:
+        """
+        Qualifies a dotted name by looking up its first component in the given namespaces.
+
+        Args:
+        - name (str or None): The dotted name.
+        - namespaces (tuple): Namespaces to search, innermost first.
+
+        Returns:
+        - str or None: The fully qualified name, or None if the first component is not bound.
+        """
+        if name is None:
+            return None
+        head, separator, rest = name.partition(".")
+        for namespace in namespaces:
+            if head in namespace:
+                return f"{namespace[head]}{separator}{rest}"
+        if head in BUILTIN_NAMES:
+            return f"builtins.{name}"
+        return None
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """
+        Visits an Assign node and collects attribute information.
+
+        Args:
+        - node (ast.Assign): Assign node to visit.
+        """
+        if self.current_class is not None:
+            for target in node.targets:
+                self._collect_attributes(target)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        """
+        Visits an AnnAssign node (annotation assignment) and collects attribute information.
+
+        Args:
+        - node (ast.AnnAssign): AnnAssign node to visit.
+        """
+        if self.current_class is not None:
+            self._collect_attributes(node.target)
+
+    def _collect_attributes(self, target: ast.expr, data_type: Optional[str] = None) -> None:
+        """
+        Records the attributes assigned by an assignment target.
+
+        Class level names are recorded as class attributes, and `self.<name>` targets
+        inside `__init__` are recorded as instance attributes.
+
+        Args:
+        - target (ast.expr): The assignment target.
+        - data_type (str, optional): Type of the assigned value, if known. Unpacked elements get none.
+        """
+        if isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self._collect_attributes(element)
+            return
+        if isinstance(target, ast.Starred):
+            self._collect_attributes(target.value)
+            return
+
+        if self.current_function is None:
+            if isinstance(target, ast.Name):
+                self._add_attribute(target.id, data_type)
+        elif self.current_function.name == "__init__":
+            if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                    and self.current_function.args.args
+                    and target.value.id == self.current_function.args.args[0].arg):
+                self._add_attribute(target.attr, data_type)
+
+    def _add_attribute(self, name: str, data_type: Optional[str] = None) -> None:
+        """
+        Appends an attribute to the class currently being visited.
+
+        Args:
+        - name (str): The name of the attribute.
+        - data_type (str, optional): Type of the attribute, if known.
+        """
+        self.current_class.attributes.append(AttributeInformation(
+            name=name, encapsulation=determine_encapsulation(name), data_type=data_type
+        ))
+
+
+# Builtin types a call to which is taken as a constructor call, alongside capitalized names
+BUILTIN_TYPE_NAMES = frozenset(name for name in BUILTIN_NAMES if isinstance(getattr(builtins, name), type))
+
+LITERAL_TYPES = {
+    ast.JoinedStr: "str", ast.List: "list", ast.ListComp: "list", ast.Tuple: "tuple", ast.Dict: "dict",
+    ast.DictComp: "dict", ast.Set: "set", ast.SetComp: "set", ast.GeneratorExp: "Generator", ast.Lambda: "Callable",
+}
+
+
+def annotation_text(node: ast.expr) -> str:
+    """
+    Renders an annotation as written, unquoting string annotations.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return ast.unparse(node)
+
+
+def infer_value_type(node: ast.expr, parameters: dict = None) -> Optional[str]:
+    """
+    Infers the type of an assigned value from its syntax only.
+
+    Constants and literals give their builtin type, constructor calls (a call to a builtin type or to a
+    capitalized name) give the class as written, and annotated parameters give their annotation.
+    `None` gives no type, since it usually stands for a value assigned later.
+
+    Args:
+    - node (ast.expr): The assigned value.
+    - parameters (dict, optional): Annotation of the parameters in scope, keyed by parameter name.
+
+    Returns:
+    - str or None: The type name, or None if it cannot be inferred.
+    """
+    if isinstance(node, ast.Constant):
+        return None if node.value is None else type(node.value).__name__
+    literal_type = LITERAL_TYPES.get(type(node))
+    if literal_type is not None:
+        return literal_type
+    if isinstance(node, ast.Call):
+        name = dotted_name(node.func)
+        if name is not None and not isinstance(node.func, ast.Subscript):
+            last = name.rpartition(".")[2]
+            if last[:1].isupper() or name in BUILTIN_TYPE_NAMES:
+                return name
+        return None
+    if isinstance(node, ast.Name) and parameters:
+        return parameters.get(node.id)
+    return None
+
+
+class TypedModuleInspector(ModuleInspector):
+    """
+    A ModuleInspector that also infers the type of attributes and the return value of methods.
+
+    Attribute types come from annotations, then from the assigned value, see `infer_value_type`; the return
+    value of a method is its return annotation. An attribute assigned several times gets the first type found
+    for its name in the class. Annotations are kept as written in the source.
+    """
+
+    def inspect(self, tree: ast.AST, modules: Tuple[str, ...] = ()) -> List[ClassInformation]:
+        """
+        Traverses the module and returns the metadata of all its classes, with member types filled in.
+
+        Args:
+        - tree (ast.AST): Abstract syntax tree of the module.
+        - modules (tuple, optional): Module names where the classes are defined.
+
+        Returns:
+        - list: List of ClassInformation objects, with relationships resolved.
+        """
+        classes = super().inspect(tree, modules)
+        return [self._unify_attribute_types(class_info) for class_info in classes]
+
+    @staticmethod
+    def _unify_attribute_types(class_info: ClassInformation) -> ClassInformation:
+        """
+        Gives untyped attributes the first type found for their name in the class.
+        """
+        types = dict()
+        for attribute in class_info.attributes:
+            if attribute.data_type is not None:
+                types.setdefault(attribute.name, attribute.data_type)
+        if not types:
+            return class_info
+        return replace(class_info, attributes=tuple(
+            attribute if attribute.data_type is not None or attribute.name not in types
+            else replace(attribute, data_type=types[attribute.name])
+            for attribute in class_info.attributes
+        )).with_fingerprint()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """
+        Visits an Assign node and collects attribute information, with the type of the value.
+
+        Args:
+        - node (ast.Assign): Assign node to visit.
+        """
+        if self.current_class is not None:
+            parameters = self._parameter_annotations() if isinstance(node.value, ast.Name) else None
+            data_type = infer_value_type(node.value, parameters)
+            for target in node.targets:
+                self._collect_attributes(target, data_type)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        """
+        Visits an AnnAssign node and collects attribute information, typed by the annotation.
+
+        Args:
+        - node (ast.AnnAssign): AnnAssign node to visit.
+        """
+        if self.current_class is not None:
+            self._collect_attributes(node.target, annotation_text(node.annotation))
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """
+        Visits a FunctionDef node, recording the return annotation of methods.
+
+        Args:
+        - node (ast.FunctionDef): FunctionDef node to visit.
+        """
+        scope = self.current_class if self.current_function is None else None
+        index = len(scope.methods) if scope is not None else None
+        super().visit_FunctionDef(node)
+        if scope is not None and node.returns is not None:
+            scope.methods[index] = replace(scope.methods[index], return_value=annotation_text(node.returns))
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _parameter_annotations(self) -> Optional[dict]:
+        """
+        Returns the annotation of the parameters of the method being visited, keyed by parameter name.
+        """
+        if self.current_function is None:
+            return None
+        arguments = self.current_function.args
+        return {
+            argument.arg: annotation_text(argument.annotation)
+            for argument in (*arguments.posonlyargs, *arguments.args, *arguments.kwonlyargs)
+            if argument.annotation is not None
+        }
@@ -1,19 +1,26 @@
 import ast
 
+from dataclasses import replace
 from pprint import pprint
-from typing import List
+from typing import List, Tuple
 from py_class_extractor import ast_collectors
 from py_class_extractor import file_management
+from py_class_extractor import outline as outline_parser
+from py_class_extractor import utils
 
-from py_class_extractor.schemas import ClassInformation
+from py_class_extractor.schemas import ClassInformation, ModuleInformation
 
 
-def parse_ast_from_file(file_path: str) -> ast.AST:
+def parse_ast_from_file(file_path: str, encoding_fallback: bool = False, outline: bool = False) -> ast.AST:
     """
     Parses the given Python file and returns the abstract syntax tree (AST).
 
+    The file is read once, and decoded following its BOM or coding cookie.
+
     Args:
     - file_path (str): Path to the Python file.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`.
 
     Returns:
     - ast.AST: Abstract syntax tree representation of the parsed Python file.
@@ -21,19 +28,105 @@ def parse_ast_from_file(file_path: str) -> ast.AST:
     Raises:
     - FileNotFoundError: If the file specified by `file_path` does not exist.
     - SyntaxError: If there is an error in parsing the Python code.
+    - UnicodeDecodeError: If the content of the file cannot be decoded.
+    - OSError: If there is a general operating system error while accessing `file_path`.
+    """
+    return parse_ast_from_bytes(read_source_file(file_path), file_path, encoding_fallback, outline)
+
+
+def read_source_file(file_path: str) -> bytes:
+    """
+    Reads the raw content of a Python file, reporting the errors like the parse functions do.
+
+    Args:
+    - file_path (str): Path to the Python file.
+
+    Returns:
+    - bytes: Raw content of the file.
+
+    Raises:
+    - FileNotFoundError: If the file specified by `file_path` does not exist.
     - OSError: If there is a general operating system error while accessing `file_path`.
     """
     try:
-        with open(file_path, "r", encoding=file_management.detect_file_encoding(file_path)) as file:
-            return ast.parse(file.read())
+        return file_management.read_file_bytes(file_path)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
         raise
+    except OSError as e:
+        print(f"OS error while accessing file '{file_path}': {e}")
+        raise
+
+
+def parse_ast_from_bytes(data: bytes, file_path: str = "<unknown>", encoding_fallback: bool = False,
+                         outline: bool = False) -> ast.AST:
+    """
+    Parses raw Python source code and returns the abstract syntax tree (AST).
+
+    Args:
+    - data (bytes): Raw content of the Python file.
+    - file_path (str, optional): Path reported in error messages.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`.
+
+    Returns:
+    - ast.AST: Abstract syntax tree representation of the parsed Python code.
+
+    Raises:
+    - SyntaxError: If there is an error in parsing the Python code.
+    - UnicodeDecodeError: If the content cannot be decoded.
+    """
+    return parse_ast_from_source(decode_source_from_bytes(data, file_path, encoding_fallback), file_path, outline)
+
+
+def decode_source_from_bytes(data: bytes, file_path: str = "<unknown>", encoding_fallback: bool = False) -> str:
+    """
+    Decodes raw Python source code following its BOM or coding cookie.
+
+    Args:
+    - data (bytes): Raw content of the Python file.
+    - file_path (str, optional): Path reported in error messages.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+
+    Returns:
+    - str: The decoded source code.
+
+    Raises:
+    - SyntaxError: If the coding cookie names an unknown encoding.
+    - UnicodeDecodeError: If the content cannot be decoded.
+    """
+    try:
+        return file_management.decode_source(data, encoding_fallback)
     except SyntaxError as e:
         print(f"Syntax error in file '{file_path}': {e}")
         raise
-    except OSError as e:
-        print(f"OS error while accessing file '{file_path}': {e}")
+    except UnicodeDecodeError as e:
+        print(f"Encoding error in file '{file_path}': {e}")
+        raise
+
+
+def parse_ast_from_source(source: str, file_path: str = "<unknown>", outline: bool = False) -> ast.AST:
+    """
+    Parses decoded Python source code and returns the abstract syntax tree (AST).
+
+    Args:
+    - source (str): The source code.
+    - file_path (str, optional): Path reported in error messages.
+    - outline (bool, optional): Only parse the statements class extraction can see, falling back to the
+      whole source when unsure. Class extraction gives the same result, but other analyses do not.
+
+    Returns:
+    - ast.AST: Abstract syntax tree representation of the parsed Python code.
+
+    Raises:
+    - SyntaxError: If there is an error in parsing the Python code.
+    """
+    try:
+        if outline:
+            return outline_parser.parse_outline(source, file_path)
+        return ast.parse(source, filename=file_path)
+    except SyntaxError as e:
+        print(f"Syntax error in file '{file_path}': {e}")
         raise
 
 
@@ -93,6 +186,98 @@ def extract_alias_imports(tree: ast.AST) -> dict:
     return visitor.alias_import
 
 
+def extract_classes_metadata(tree: ast.AST, modules: Tuple[str, ...] = ()) -> List[ClassInformation]:
+    """
+    Retrieves metadata for every class of a module in a single traversal of its AST.
+
+    Imports, classes (including nested ones), methods, attributes and inheritance
+    relationships are all collected by one ModuleInspector pass.
+
+    Parameters:
+    ----------
+    tree : ast.AST
+        The Abstract Syntax Tree representing the Python module to be analyzed.
+
+    modules : Tuple[str, ...], optional
+        Module names where the classes are defined.
+
+    Returns:
+    -------
+    List[ClassInformation]
+        Metadata objects for all classes in the module, in definition order.
+    """
+    return list(extract_module_metadata(tree, modules).classes)
+
+
+def extract_module_metadata(tree: ast.AST, modules: Tuple[str, ...] = (),
+                            collect_calls: bool = False, infer_types: bool = False) -> ModuleInformation:
+    """
+    Retrieves metadata for a module and all its classes in a single traversal of its AST.
+
+    Besides the classes, the module level import bindings are kept so that re-exported
+    classes can be resolved across modules by `symbols.SymbolIndex`.
+
+    Parameters:
+    ----------
+    tree : ast.AST
+        The Abstract Syntax Tree representing the Python module to be analyzed.
+
+    modules : Tuple[str, ...], optional
+        Module names where the classes are defined, e.g. ("package", "module").
+
+    collect_calls : bool, optional
+        Also collect the calls made by the methods, in the same traversal.
+
+    infer_types : bool, optional
+        Also infer the type of attributes and the return value of methods, see `ast_collectors.TypedModuleInspector`.
+
+    Returns:
+    -------
+    ModuleInformation
+        Metadata of the module, its classes and its imports.
+    """
+    return inspect_module(tree, modules, collect_calls, infer_types)[0]
+
+
+def inspect_module(tree: ast.AST, modules: Tuple[str, ...] = (),
+                   collect_calls: bool = False, infer_types: bool = False) -> Tuple[ModuleInformation, int]:
+    """
+    Retrieves metadata for a module like `extract_module_metadata`, along with the traversal size.
+
+    Parameters:
+    ----------
+    tree : ast.AST
+        The Abstract Syntax Tree representing the Python module to be analyzed.
+
+    modules : Tuple[str, ...], optional
+        Module names where the classes are defined, e.g. ("package", "module").
+
+    collect_calls : bool, optional
+        Also collect the calls made by the methods, in the same traversal.
+
+    infer_types : bool, optional
+        Also infer the type of attributes and the return value of methods, see `ast_collectors.TypedModuleInspector`.
+
+    Returns:
+    -------
+    Tuple[ModuleInformation, int]
+        Metadata of the module, and the number of AST nodes visited to collect it.
+    """
+    module_name = utils.module_name_from_parts(modules)
+    inspector_class = ast_collectors.TypedModuleInspector if infer_types else ast_collectors.ModuleInspector
+    inspector = inspector_class(module_name, bool(modules) and modules[-1] == "__init__", collect_calls)
+    classes = inspector.inspect(tree, modules)
+    module_metadata = ModuleInformation(
+        name=module_name,
+        modules=modules,
+        classes=tuple(classes),
+        imports=tuple(inspector.imports.items()),
+        star_imports=tuple(inspector.star_imports),
+        calls=None if inspector.calls is None else tuple(inspector.calls),
+    )
+    return module_metadata, inspector.nodes_visited
+
+
 def get_class_metadata(class_node: ast.ClassDef, alias: dict) -> ClassInformation:
     """
     Retrieves metadata for a class node from an Abstract Syntax Tree (AST).
@@ -127,6 +312,35 @@ def get_class_metadata(class_node: ast.ClassDef, alias: dict) -> ClassInformatio
     current_class_data: ClassInformation = visitor.visit(class_node)
 
     analyzer = ast_collectors.RelationshipInspector(alias)
-    current_class_data.relationships = analyzer.visit(class_node)
+    return replace(current_class_data, relationships=analyzer.visit(class_node)).with_fingerprint()
 
-    return current_class_data
+
+def skipped_module_metadata(modules: Tuple[str, ...] = (), may_import: bool = True,
+                            collect_calls: bool = False) -> ModuleInformation:
+    """
+    Builds the metadata of a module the prefilter found to define no class, without parsing it.
+
+    Parameters:
+    ----------
+    modules : Tuple[str, ...], optional
+        Module names of the module, e.g. ("package", "module").
+
+    may_import : bool, optional
+        Whether the module may bind imported names. Its imports are then left as None, meaning not collected.
+
+    collect_calls : bool, optional
+        Whether calls are collected. A module without classes has no method, hence no call.
+
+    Returns:
+    -------
+    ModuleInformation
+        Metadata of the module, identical to the parsed one when the module cannot bind imported names.
+    """
+    return ModuleInformation(
+        name=utils.module_name_from_parts(modules),
+        modules=modules,
+        classes=(),
+        imports=None if may_import else (),
+        star_imports=None if may_import else (),
+        calls=() if collect_calls else None,
+    )
@@ -0,0 +1,523 @@
+import json
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import py_class_extractor
+from py_class_extractor import cache as result_cache
+from py_class_extractor import archives, file_management, parallel, utils
+from py_class_extractor.schemas import ModuleInformation
+
+# Files larger than this are reported instead of parsed; generated modules this big rarely define useful classes.
+DEFAULT_MAX_FILE_BYTES = 10 * 1024 * 1024
+
+# Wall time allowed for a single file, in seconds.
+DEFAULT_TIMEOUT = 60.0
+
+CHECKPOINT_FORMAT = 2
+
+
+class FileTimeoutError(Exception):
+    """
+    Raised when the analysis of a file exceeds its time limit.
+    """
+
+
+class CheckpointMismatchError(ValueError):
+    """
+    Raised when a checkpoint journal belongs to another scan, and cannot be resumed.
+    """
+
+
+@dataclass(frozen=True)
+class FileError:
+    """
+    Data class describing why a file could not be analyzed.
+
+    Attributes:
+    - path (str): Path of the file.
+    - category (str): One of "too_large", "timeout", "syntax", "decode", "os" or "internal".
+    - error_type (str): Name of the exception class.
+    - message (str): The exception message.
+    - line (int or None): Line of the error, for syntax errors.
+    """
+
+    path: str
+    category: str
+    error_type: str
+    message: str
+    line: Optional[int] = None
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the FileError object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the path, category, error type, message and line of the error.
+        """
+        return {
+            "path": self.path,
+            "category": self.category,
+            "error_type": self.error_type,
+            "message": self.message,
+            "line": self.line,
+        }
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "FileError":
+        """
+        Creates a FileError object from its dictionary representation, see `to_dictionary`.
+
+        Args:
+        - data (dict): The dictionary representation.
+
+        Returns:
+        - FileError: The error.
+        """
+        return cls(data["path"], data["category"], data["error_type"], data["message"], data.get("line"))
+
+    @classmethod
+    def from_exception(cls, path: str, error: BaseException) -> "FileError":
+        """
+        Builds a FileError from the exception raised while analyzing a file.
+
+        Args:
+        - path (str): Path of the file.
+        - error (BaseException): The exception.
+
+        Returns:
+        - FileError: The classified error.
+        """
+        if isinstance(error, FileTimeoutError):
+            category = "timeout"
+        elif isinstance(error, UnicodeDecodeError):
+            category = "decode"
+        elif isinstance(error, SyntaxError):
+            category = "syntax"
+        elif isinstance(error, OSError):
+            category = "os"
+        else:
+            category = "internal"
+        return cls(path, category, type(error).__name__, str(error), getattr(error, "lineno", None))
+
+
+@dataclass
+class BatchResult:
+    """
+    Data class holding the outcome of a batch run.
+
+    Attributes:
+    - classes (list): Dictionaries of every class found, with relationships resolved across the corpus.
+    - errors (List[FileError]): Files that could not be analyzed, in file order.
+    - files (int): Number of files in the scan.
+    - resumed (int): Number of files taken from the checkpoint instead of being analyzed again.
+    """
+
+    classes: list = field(default_factory=list)
+    errors: List[FileError] = field(default_factory=list)
+    files: int = 0
+    resumed: int = 0
+
+    def error_report(self) -> dict:
+        """
+        Builds the structured error report of the run.
+
+        Returns:
+        - dict: The file and error counts, the error count per category and every error.
+        """
+        categories: Dict[str, int] = dict()
+        for error in self.errors:
+            categories[error.category] = categories.get(error.category, 0) + 1
+        return {
+            "files": self.files,
+            "failed": len(self.errors),
+            "resumed": self.resumed,
+            "categories": categories,
+            "errors": [error.to_dictionary() for error in self.errors],
+        }
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Raises FileTimeoutError in the enclosed block once a wall time limit is exceeded.
+
+    The limit relies on SIGALRM, so it only applies on Unix, in the main thread. A long call into C code,
+    such as parsing a very large file, is interrupted when it returns; `max_file_bytes` bounds those.
+
+    Args:
+    - seconds (float or None): The limit. None or 0 disables it.
+    """
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise FileTimeoutError(f"Analysis took longer than {seconds} seconds")
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def process_module_safely(file_path: str, base_module_name: str, cache: "result_cache.ResultCache" = None,
+                          encoding_fallback: bool = False, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                          timeout: float = DEFAULT_TIMEOUT, prefilter: bool = False,
+                          outline: bool = False) -> Tuple[Optional[ModuleInformation], Optional[FileError]]:
+    """
+    Processes a single Python file like `process_module`, turning every failure into a FileError.
+
+    Args:
+    - file_path (str): The path to the Python file.
+    - base_module_name (str): The base module name used for relative paths.
+    - cache (ResultCache, optional): Cache reused when the file is unchanged and updated otherwise.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - max_file_bytes (int, optional): Files larger than this are not analyzed. None disables the limit.
+    - timeout (float, optional): Wall time allowed for the file, in seconds. None disables the limit.
+    - prefilter (bool, optional): Skip parsing the file if its bytes contain no class statement.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`.
+
+    Returns:
+    - tuple: The module metadata and None on success, None and the error otherwise.
+    """
+    try:
+        if max_file_bytes is not None:
+            size = os.path.getsize(file_path)
+            if size > max_file_bytes:
+                return None, FileError(
+                    file_path, "too_large", "FileTooLarge", f"{size} bytes exceeds the limit of {max_file_bytes}"
+                )
+        with time_limit(timeout):
+            return py_class_extractor.process_module(
+                file_path, base_module_name, cache, encoding_fallback, prefilter, outline=outline
+            ), None
+    except Exception as error:  # One broken file must never abort the scan
+        return None, FileError.from_exception(file_path, error)
+
+
+def process_archive_member_safely(member: "archives.ArchiveMember", archive_path: str,
+                                  cache: "result_cache.ResultCache" = None, encoding_fallback: bool = False,
+                                  max_file_bytes: int = DEFAULT_MAX_FILE_BYTES, timeout: float = DEFAULT_TIMEOUT,
+                                  prefilter: bool = False, outline: bool = False
+                                  ) -> Tuple[Optional[ModuleInformation], Optional[FileError]]:
+    """
+    Processes an archive member like `archives.process_archive_member`, turning every failure into a FileError.
+
+    Args:
+    - member (ArchiveMember): The member.
+    - archive_path (str): Absolute path of the archive; errors name the member as "<archive path>/<member name>".
+    - cache (ResultCache, optional): Cache reused when the member content is unchanged and updated otherwise.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - max_file_bytes (int, optional): Members larger than this are not analyzed. None disables the limit.
+    - timeout (float, optional): Wall time allowed for the member, in seconds. None disables the limit.
+    - prefilter (bool, optional): Skip parsing the member if its bytes contain no class statement.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`.
+
+    Returns:
+    - tuple: The module metadata and None on success, None and the error otherwise.
+    """
+    member_path = f"{archive_path}/{member.name}"
+    if max_file_bytes is not None and len(member.data) > max_file_bytes:
+        return None, FileError(
+            member_path, "too_large", "FileTooLarge", f"{len(member.data)} bytes exceeds the limit of {max_file_bytes}"
+        )
+    try:
+        with time_limit(timeout):
+            return archives.process_archive_member(
+                member, archive_path, cache, encoding_fallback, prefilter, outline=outline
+            ), None
+    except Exception as error:  # One broken member must never abort the scan
+        return None, FileError.from_exception(member_path, error)
+
+
+class Checkpoint:
+    """
+    Append-only journal of the files already analyzed by a batch run, used to resume it after a crash.
+
+    The first line identifies the scan and the options it runs with; every following line holds the module metadata or the error of one
+    file and is flushed as soon as the file is done. A truncated last line, left by a crash, is ignored.
+
+    Attributes:
+    - path (str): Path of the journal file.
+    - modules (dict): ModuleInformation of the journaled files, keyed by path.
+    - errors (dict): FileError of the journaled files, keyed by path.
+    """
+
+    def __init__(self, path: str, scan_path: str, options: dict = None) -> None:
+        """
+        Initializes an instance of Checkpoint, loading the journal if it exists.
+
+        Args:
+        - path (str): Path of the journal file.
+        - scan_path (str): The scanned file or directory.
+        - options (dict, optional): JSON-serializable options that change the outcome of the files, such as the
+          parse mode or the file selection; a journal written with other options cannot be resumed.
+
+        Raises:
+        - CheckpointMismatchError: If the journal belongs to another scan, analyzer version or set of options,
+          or its header is unreadable.
+        """
+        self.path = path
+        self.header = {
+            "format": CHECKPOINT_FORMAT,
+            "analyzer_version": result_cache.ANALYZER_VERSION,
+            "scan_path": os.path.abspath(scan_path),
+            "options": dict() if options is None else options,
+        }
+        self.modules: Dict[str, ModuleInformation] = dict()
+        self.errors: Dict[str, FileError] = dict()
+        self._file = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        """
+        Loads the outcomes journaled so far, skipping a line truncated by a crash.
+
+        Raises:
+        - CheckpointMismatchError: If the header does not match the scan or cannot be read.
+        """
+        with open(self.path, "r", encoding="utf-8") as file:
+            lines = file.read().split("\n")
+        if not lines[0]:
+            return
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            raise CheckpointMismatchError(f"Checkpoint '{self.path}' has an unreadable header") from None
+        if header != self.header:
+            raise CheckpointMismatchError(f"Checkpoint '{self.path}' belongs to another scan or other options")
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Empty or truncated line
+            if "module" in entry:
+                self.modules[entry["path"]] = ModuleInformation.from_dictionary(entry["module"])
+            else:
+                self.errors[entry["path"]] = FileError.from_dictionary(entry["error"])
+
+    def open(self) -> None:
+        """
+        Opens the journal for appending, writing its header when it is new.
+        """
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() == 0:
+            self._write_line(self.header)
+        else:
+            self._file.write("\n")  # Terminates a line truncated by a crash; empty lines are skipped on load
+
+    def record(self, file_path: str, module: Optional[ModuleInformation], error: Optional[FileError]) -> None:
+        """
+        Appends the outcome of a file to the journal.
+
+        Args:
+        - file_path (str): Path of the file.
+        - module (ModuleInformation or None): The module metadata, on success.
+        - error (FileError or None): The error, on failure.
+        """
+        if module is not None:
+            self.modules[file_path] = module
+            self._write_line({"path": file_path, "module": module.to_dictionary()})
+        else:
+            self.errors[file_path] = error
+            self._write_line({"path": file_path, "error": error.to_dictionary()})
+
+    def _write_line(self, entry: dict) -> None:
+        """
+        Appends an entry to the journal as one JSON line, flushed right away.
+
+        Args:
+        - entry (dict): The header, or the outcome of a file.
+        """
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Closes the journal if it is open.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def run_batch(path: str, checkpoint_path: str = None, workers: int = 1, cache_directory: str = None,
+              encoding_fallback: bool = False, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+              timeout: float = DEFAULT_TIMEOUT, prefilter: bool = False, file_paths: List[str] = None,
+              on_file: Callable[[str, Optional[ModuleInformation], Optional[FileError]], None] = None,
+              outline: bool = False, checkpoint_options: dict = None) -> BatchResult:
+    """
+    Analyzes a Python file or every Python file in a directory without ever aborting on a broken file.
+
+    Each file is analyzed in isolation, within a size and a time limit, and its failures are collected in
+    the error report. With a checkpoint, the outcome of every file is journaled as soon as it is known, and
+    running again with the same checkpoint skips the files journaled before an interruption.
+
+    Args:
+    - path (str): The path to a Python file or to a directory containing Python files.
+    - checkpoint_path (str, optional): Journal file used to resume an interrupted run.
+    - workers (int, optional): Number of processes used to analyze files, see `iter_module_metadata`.
+    - cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - max_file_bytes (int, optional): Files larger than this are reported instead of analyzed.
+    - timeout (float, optional): Wall time allowed for each file, in seconds.
+    - prefilter (bool, optional): Skip parsing files whose bytes contain no class statement.
+    - file_paths (list, optional): The files to analyze, when only some of the files under `path` are wanted.
+    - on_file (Callable, optional): Called as `on_file(file_path, module, error)` as soon as a file is analyzed,
+      e.g. to report progress. Files resumed from the checkpoint are not reported.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`. A syntax
+      error in a skipped function body is then not reported.
+    - checkpoint_options (dict, optional): Options recorded in the checkpoint header besides the parse options,
+      e.g. the include and exclude patterns `file_paths` was selected with.
+
+    Returns:
+    - BatchResult: The classes found, with relationships resolved across the corpus, and the error report.
+      A file skipped by the prefilter that fails when its imports are needed is reported too; its imports
+      are then left unresolved.
+
+    Raises:
+    - CheckpointMismatchError: If the checkpoint belongs to another scan or was written with other options.
+    """
+    if file_paths is not None:
+        file_paths = list(file_paths)
+    elif os.path.isfile(path):
+        file_paths = [path]
+    else:
+        file_paths = file_management.find_files_with_extension(path, ".py")
+    base_module_name = utils.split_path(path)[-1]
+    cache = None if cache_directory is None else result_cache.ResultCache(cache_directory)
+
+    checkpoint = None
+    if checkpoint_path is not None:
+        options = {"encoding_fallback": encoding_fallback, "prefilter": prefilter, "outline": outline}
+        options.update(checkpoint_options or dict())
+        checkpoint = Checkpoint(checkpoint_path, path, options)
+    modules: Dict[str, ModuleInformation] = dict(checkpoint.modules) if checkpoint else dict()
+    errors: Dict[str, FileError] = dict(checkpoint.errors) if checkpoint else dict()
+    pending_paths = [file_path for file_path in file_paths if file_path not in modules and file_path not in errors]
+    result = BatchResult(files=len(file_paths), resumed=len(file_paths) - len(pending_paths))
+
+    if checkpoint is not None:
+        checkpoint.open()
+    try:
+        outcomes = parallel.imap_in_processes(
+            process_module_safely, pending_paths, workers,
+            base_module_name, cache, encoding_fallback, max_file_bytes, timeout, prefilter, outline
+        )
+        for file_path, (module, error) in zip(pending_paths, outcomes):
+            if module is not None:
+                modules[file_path] = module
+            else:
+                errors[file_path] = error
+            if checkpoint is not None:
+                checkpoint.record(file_path, module, error)
+            if on_file is not None:
+                on_file(file_path, module, error)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    if cache is not None:
+        cache.prune()
+
+    def process_skipped(file_path: str) -> Optional[ModuleInformation]:
+        # Skipped files parsed for their imports get the same limits and isolation as the others
+        module, error = process_module_safely(
+            file_path, base_module_name, None, encoding_fallback, max_file_bytes, timeout
+        )
+        if error is not None:
+            errors[file_path] = error
+        return module
+
+    analyzed_paths = [file_path for file_path in file_paths if file_path in modules]
+    module_metadata_list = [modules[file_path] for file_path in analyzed_paths]
+    loader = py_class_extractor.skipped_module_loader(
+        analyzed_paths, module_metadata_list, base_module_name, encoding_fallback, process=process_skipped
+    )
+    result.classes = py_class_extractor.to_dictionaries(module_metadata_list, loader=loader)
+    result.errors = [errors[file_path] for file_path in file_paths if file_path in errors]
+    return result
+
+
+def run_archive_batch(archive_path: str, workers: int = 1, cache_directory: str = None,
+                      encoding_fallback: bool = False, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                      timeout: float = DEFAULT_TIMEOUT, prefilter: bool = False,
+                      select: Callable[[str], bool] = None,
+                      on_file: Callable[[str, Optional[ModuleInformation], Optional[FileError]], None] = None,
+                      outline: bool = False) -> BatchResult:
+    """
+    Analyzes every Python module of an archive like `run_batch`, without ever aborting on a broken member.
+
+    Members are streamed once, see `archives.iter_archive_module_metadata`, and each is analyzed in isolation,
+    within a size and a time limit. Errors name a member as "<archive path>/<member name>".
+
+    Args:
+    - archive_path (str): Path of a `.whl`, `.zip` or tar archive, possibly compressed.
+    - workers (int, optional): Number of processes used to analyze members, see `iter_module_metadata`.
+    - cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - max_file_bytes (int, optional): Members larger than this are reported instead of analyzed.
+    - timeout (float, optional): Wall time allowed for each member, in seconds.
+    - prefilter (bool, optional): Skip parsing members whose bytes contain no class statement.
+    - select (Callable, optional): Called with the name of each member; only the members it accepts are analyzed.
+    - on_file (Callable, optional): Called as `on_file(member_path, module, error)` as soon as a member is analyzed.
+    - outline (bool, optional): Only parse the statements class extraction can see, see `outline`.
+
+    Returns:
+    - BatchResult: The classes found, with relationships resolved across the archive, and the error report.
+
+    Raises:
+    - OSError, tarfile.TarError, zipfile.BadZipFile, EOFError: If the archive itself cannot be read.
+    """
+    archive_path = os.path.abspath(archive_path)
+    cache = None if cache_directory is None else result_cache.ResultCache(cache_directory)
+    names: List[str] = []
+
+    def iter_members() -> Iterator["archives.ArchiveMember"]:
+        for member in archives.iter_archive_members(archive_path):
+            if select is None or select(member.name):
+                names.append(member.name)
+                yield member
+
+    modules: Dict[str, ModuleInformation] = dict()
+    errors: Dict[str, FileError] = dict()
+    outcomes = parallel.imap_in_processes(
+        process_archive_member_safely, iter_members(), workers,
+        archive_path, cache, encoding_fallback, max_file_bytes, timeout, prefilter, outline
+    )
+    for index, (module, error) in enumerate(outcomes):
+        if module is not None:
+            modules[names[index]] = module
+        else:
+            errors[names[index]] = error
+        if on_file is not None:
+            on_file(f"{archive_path}/{names[index]}", module, error)
+
+    if cache is not None:
+        cache.prune()
+
+    def process_skipped(member: "archives.ArchiveMember") -> Optional[ModuleInformation]:
+        module, error = process_archive_member_safely(
+            member, archive_path, None, encoding_fallback, max_file_bytes, timeout
+        )
+        if error is not None:
+            errors[member.name] = error
+        return module
+
+    analyzed_names = [name for name in names if name in modules]
+    module_metadata_list = [modules[name] for name in analyzed_names]
+    loader = archives.archive_member_loader(
+        archive_path, analyzed_names, module_metadata_list, encoding_fallback, process=process_skipped
+    )
+    result = BatchResult(files=len(names))
+    result.classes = py_class_extractor.to_dictionaries(module_metadata_list, loader=loader)
+    result.errors = [errors[name] for name in names if name in errors]
+    return result
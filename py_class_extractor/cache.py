@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from py_class_extractor import file_management
+from py_class_extractor.schemas import ModuleInformation
+
+# Bump whenever a change to the extraction alters its output, so stale cache entries are ignored.
+ANALYZER_VERSION = "5"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# After an eviction the cache is shrunk below this fraction of its bound, so pruning does not run on every write.
+PRUNE_TARGET_RATIO = 0.9
+
+
+@dataclass
+class FileFingerprint:
+    """
+    Data class identifying the content of a file at a given moment.
+
+    Attributes:
+    - size (int): Size of the file in bytes.
+    - mtime_ns (int): Modification time of the file in nanoseconds.
+    - sha256 (str or None): Hex digest of the file content, None when it was not needed.
+    - data (bytes or None): The content read to compute the digest, so parsing it after a miss does not
+      read the file again; None when the file was not read.
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: Optional[str]
+    data: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Computes the SHA-256 digest of a file's content.
+
+    Args:
+    - file_path (str): Path to the file.
+
+    Returns:
+    - str: Hex digest of the file content.
+    """
+    with open(file_path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent on-disk cache of per-file module metadata.
+
+    Each entry is a JSON file named after the analyzer version, the absolute file path and the base module name.
+    It stores the file's size, modification time and content hash next to its module metadata. A matching size and
+    modification time is a hit without reading the file. Otherwise the content hash decides, so touched but
+    unchanged files are still reused; the file is only read for it when an entry of the same size exists, and
+    the bytes read are kept in the fingerprint. On a miss, `store` hashes the bytes the caller parsed, so a
+    file is read once whether it hits or misses.
+
+    Entries extracted from an outline parse, see `outline`, are marked as such. They are only hits for outline
+    lookups, since a module whose function bodies do not compile must still fail a full parse; outline lookups
+    reuse both kinds of entries. Entries extracted with the encoding fallback are marked and reused the same way,
+    since a file whose declared encoding is wrong must still fail to decode without it.
+
+    Entries are written to a temporary file and atomically renamed, and unreadable or vanished entries are
+    treated as misses, so several processes can share one cache directory. The access time of an entry is
+    refreshed on every hit, and `prune` evicts the least recently used entries once the cache exceeds its bound.
+
+    Attributes:
+    - directory (str): Directory holding the cache entries.
+    - max_bytes (int): Size bound enforced by `prune`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initializes an instance of ResultCache, creating its directory if needed.
+
+        Args:
+        - directory (str): Directory holding the cache entries.
+        - max_bytes (int, optional): Size bound enforced by `prune`.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def lookup(self, file_path: str, base_module_name: str, outline: bool = False,
+               encoding_fallback: bool = False) -> Tuple[Optional[ModuleInformation], FileFingerprint]:
+        """
+        Looks up the cached module metadata of a file.
+
+        Args:
+        - file_path (str): Path to the Python file.
+        - base_module_name (str): The base module name used for relative paths.
+        - outline (bool, optional): Whether the file would be parsed in outline; if not, outline entries are misses.
+        - encoding_fallback (bool, optional): Whether the file would be decoded with the encoding fallback; if not,
+          entries extracted with it are misses.
+
+        Returns:
+        - tuple: The cached module metadata, or None on a miss, and the current fingerprint of the file,
+          to be handed to `store` after a miss. Its `data` holds the content when it was read.
+        """
+        stat = os.stat(file_path)
+        fingerprint = FileFingerprint(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=None)
+        entry_path = self._entry_path(file_path, base_module_name)
+        entry = self._read_entry(entry_path, outline, encoding_fallback)
+        if entry is None or entry["size"] != fingerprint.size:
+            return None, fingerprint  # The content changed, no need to hash it yet
+
+        if entry["mtime_ns"] == fingerprint.mtime_ns:
+            self._touch(entry_path)
+            return self._load_module(entry), fingerprint
+
+        fingerprint.data = file_management.read_file_bytes(file_path)
+        fingerprint.sha256 = hashlib.sha256(fingerprint.data).hexdigest()
+        if entry["sha256"] == fingerprint.sha256:
+            module = self._load_module(entry)
+            self.store(file_path, base_module_name, fingerprint, module, outline=entry.get("outline", False),
+                       encoding_fallback=entry.get("encoding_fallback", False))
+            return module, fingerprint
+
+        return None, fingerprint
+
+    def lookup_data(self, key: str, data: bytes, base_module_name: str, outline: bool = False,
+                    encoding_fallback: bool = False) -> Tuple[Optional[ModuleInformation], FileFingerprint]:
+        """
+        Looks up the cached module metadata of content already in memory, such as an archive member.
+
+        Archive timestamps are often fixed by reproducible builds, so the content hash always decides.
+
+        Args:
+        - key (str): Path-like key identifying the content, e.g. the archive path followed by the member name.
+        - data (bytes): The content.
+        - base_module_name (str): The base module name used for relative paths.
+        - outline (bool, optional): Whether the content would be parsed in outline, see `lookup`.
+        - encoding_fallback (bool, optional): Whether the content would be decoded with the encoding fallback,
+          see `lookup`.
+
+        Returns:
+        - tuple: The cached module metadata, or None on a miss, and the fingerprint of the content,
+          to be handed to `store` after a miss.
+        """
+        fingerprint = FileFingerprint(size=len(data), mtime_ns=0, sha256=hashlib.sha256(data).hexdigest())
+        entry_path = self._entry_path(key, base_module_name)
+        entry = self._read_entry(entry_path, outline, encoding_fallback)
+        if entry is not None and entry["size"] == fingerprint.size and entry["sha256"] == fingerprint.sha256:
+            self._touch(entry_path)
+            return self._load_module(entry), fingerprint
+        return None, fingerprint
+
+    def store(self, file_path: str, base_module_name: str, fingerprint: FileFingerprint,
+              module: ModuleInformation, data: Optional[bytes] = None, outline: bool = False,
+              encoding_fallback: bool = False) -> None:
+        """
+        Stores the module metadata of a file in the cache.
+
+        Args:
+        - file_path (str): Path to the Python file.
+        - base_module_name (str): The base module name used for relative paths.
+        - fingerprint (FileFingerprint): Fingerprint returned by `lookup`, describing the analyzed content.
+        - module (ModuleInformation): Module metadata extracted from the file.
+        - data (bytes, optional): The analyzed content, hashed instead of reading the file again.
+        - outline (bool, optional): Whether the module metadata was extracted from an outline parse.
+        - encoding_fallback (bool, optional): Whether the content was decoded with the encoding fallback enabled.
+        """
+        if fingerprint.sha256 is None:
+            data = data if data is not None else fingerprint.data
+            fingerprint.sha256 = hash_file(file_path) if data is None else hashlib.sha256(data).hexdigest()
+
+        entry = {
+            "version": ANALYZER_VERSION,
+            "path": os.path.abspath(file_path),
+            "size": fingerprint.size,
+            "mtime_ns": fingerprint.mtime_ns,
+            "sha256": fingerprint.sha256,
+            "outline": outline,
+            "encoding_fallback": encoding_fallback,
+            "module": module.to_dictionary(),
+        }
+
+        entry_path = self._entry_path(file_path, base_module_name)
+        entry_directory = os.path.dirname(entry_path)
+        os.makedirs(entry_directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=entry_directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(temporary_path, entry_path)
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            raise
+
+    def prune(self) -> int:
+        """
+        Evicts the least recently used entries while the cache exceeds its size bound.
+
+        Temporary files are left alone: they are entries another process is still writing.
+
+        Returns:
+        - int: The number of entries removed.
+        """
+        entries = []
+        total_size = 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_bytes:
+            return 0
+
+        removed = 0
+        target_size = self.max_bytes * PRUNE_TARGET_RATIO
+        for _, size, path in sorted(entries):
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass  # Already evicted by another process
+            total_size -= size
+
+        return removed
+
+    def _entry_path(self, file_path: str, base_module_name: str) -> str:
+        """
+        Builds the path of the cache entry of a file.
+
+        Args:
+        - file_path (str): Path to the Python file.
+        - base_module_name (str): The base module name used for relative paths.
+
+        Returns:
+        - str: Path of the cache entry.
+        """
+        key = "\0".join((ANALYZER_VERSION, os.path.abspath(file_path), base_module_name))
+        digest = hashlib.sha256(key.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    @staticmethod
+    def _read_entry(entry_path: str, outline: bool = False, encoding_fallback: bool = False) -> Optional[dict]:
+        """
+        Reads a cache entry, treating missing, corrupted or outdated entries as absent.
+
+        Args:
+        - entry_path (str): Path of the cache entry.
+        - outline (bool, optional): Whether entries extracted from an outline parse can be used.
+        - encoding_fallback (bool, optional): Whether entries extracted with the encoding fallback can be used.
+
+        Returns:
+        - dict or None: The entry, or None if it cannot be used.
+        """
+        try:
+            with open(entry_path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != ANALYZER_VERSION:
+            return None
+        if entry.get("outline", False) and not outline:
+            return None
+        if entry.get("encoding_fallback", False) and not encoding_fallback:
+            return None
+        return entry
+
+    @staticmethod
+    def _load_module(entry: dict) -> ModuleInformation:
+        """
+        Rebuilds the ModuleInformation object stored in an entry.
+
+        Args:
+        - entry (dict): The cache entry.
+
+        Returns:
+        - ModuleInformation: The stored module metadata.
+        """
+        return ModuleInformation.from_dictionary(entry["module"])
+
+    @staticmethod
+    def _touch(entry_path: str) -> None:
+        """
+        Marks an entry as recently used for LRU eviction.
+
+        Args:
+        - entry_path (str): Path of the cache entry.
+        """
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass  # Evicted concurrently; the hit is still valid
@@ -0,0 +1,288 @@
+import json
+from array import array
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from py_class_extractor.diagrams import diagram_id
+from py_class_extractor.schemas import CallInformation, CallKind, ModuleInformation
+
+CALL_GRAPH_FORMAT = 1
+
+CALL_KINDS = tuple(CallKind)
+
+
+class CallGraph:
+    """
+    Method-level call graph stored as compact edge lists.
+
+    Every caller and callee name is stored once and numbered; edges are three parallel arrays of caller
+    numbers, callee numbers and kind numbers. Adjacency indexes for `callees` and `callers` are built on the
+    first query in each direction, and dropped when edges are added.
+
+    Attributes:
+    - names (list): Name of every node, by node number.
+    - ids (dict): Node number of every name.
+    - sources (array): Caller number of every edge.
+    - targets (array): Callee number of every edge.
+    - kinds (array): Index in CALL_KINDS of the kind of every edge.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = dict()
+        self.sources = array("I")
+        self.targets = array("I")
+        self.kinds = array("B")
+        self._outgoing: Optional[Tuple[array, array]] = None
+        self._incoming: Optional[Tuple[array, array]] = None
+
+    @classmethod
+    def from_modules(cls, modules: Iterable[ModuleInformation]) -> "CallGraph":
+        """
+        Builds the call graph of modules analyzed with `collect_calls`.
+
+        Args:
+        - modules (Iterable[ModuleInformation]): The modules, possibly a generator.
+
+        Returns:
+        - CallGraph: The graph of every call made by their methods.
+
+        Raises:
+        - ValueError: If a module was analyzed without collecting its calls.
+        """
+        graph = cls()
+        for module in modules:
+            if module.calls is None:
+                raise ValueError(f"Calls of module '{module.name}' were not collected")
+            for call in module.calls:
+                graph.add(call)
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def node(self, name: str) -> int:
+        """
+        Returns the number of a node, adding the node if it is new.
+        """
+        number = self.ids.get(name)
+        if number is None:
+            number = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return number
+
+    def add(self, call: CallInformation) -> None:
+        """
+        Adds the edge of a call.
+
+        Args:
+        - call (CallInformation): The call.
+        """
+        self.sources.append(self.node(call.caller))
+        self.targets.append(self.node(call.callee))
+        self.kinds.append(CALL_KINDS.index(call.kind))
+        self._outgoing = self._incoming = None
+
+    def iter_calls(self) -> Iterator[CallInformation]:
+        """
+        Yields every edge as a CallInformation, in insertion order.
+        """
+        names = self.names
+        for source, target, kind in zip(self.sources, self.targets, self.kinds):
+            yield CallInformation(caller=names[source], callee=names[target], kind=CALL_KINDS[kind])
+
+    def callees(self, name: str) -> List[Tuple[str, CallKind]]:
+        """
+        Returns the calls made by a method.
+
+        Args:
+        - name (str): Qualified name of the method.
+
+        Returns:
+        - list: (callee, kind) pairs, in source order.
+        """
+        if self._outgoing is None:
+            self._outgoing = self._adjacency(self.sources)
+        return [(self.names[self.targets[edge]], CALL_KINDS[self.kinds[edge]])
+                for edge in self._edges(self._outgoing, name)]
+
+    def callers(self, name: str) -> List[Tuple[str, CallKind]]:
+        """
+        Returns the methods calling a node.
+
+        Args:
+        - name (str): Name of the callee, as stored in the graph.
+
+        Returns:
+        - list: (caller, kind) pairs.
+        """
+        if self._incoming is None:
+            self._incoming = self._adjacency(self.targets)
+        return [(self.names[self.sources[edge]], CALL_KINDS[self.kinds[edge]])
+                for edge in self._edges(self._incoming, name)]
+
+    def reachable(self, name: str, max_depth: int = None) -> Dict[str, int]:
+        """
+        Finds the nodes reachable from a method through calls, breadth first.
+
+        Args:
+        - name (str): Qualified name of the method.
+        - max_depth (int, optional): Maximum number of calls followed. Unlimited by default.
+
+        Returns:
+        - dict: Depth of every reachable node, keyed by name, the method itself at depth 0.
+        """
+        if name not in self.ids:
+            return {}
+        depths = {name: 0}
+        queue = deque([name])
+        while queue:
+            current = queue.popleft()
+            if max_depth is not None and depths[current] == max_depth:
+                continue
+            for callee, _ in self.callees(current):
+                if callee not in depths:
+                    depths[callee] = depths[current] + 1
+                    queue.append(callee)
+        return depths
+
+    def select(self, caller_prefix: str) -> "CallGraph":
+        """
+        Builds the subgraph of the calls made by the methods whose name starts with a prefix.
+
+        Args:
+        - caller_prefix (str): The prefix, e.g. the qualified name of a class or module followed by a dot.
+
+        Returns:
+        - CallGraph: The subgraph.
+        """
+        graph = CallGraph()
+        for call in self.iter_calls():
+            if call.caller.startswith(caller_prefix):
+                graph.add(call)
+        return graph
+
+    def _adjacency(self, endpoints: array) -> Tuple[array, array]:
+        """
+        Sorts the edges by one of their endpoints, counting sort style.
+
+        Returns:
+        - tuple: The offset of the edges of every node, and the edge numbers sorted by node.
+        """
+        offsets = array("I", bytes(4 * (len(self.names) + 1)))
+        for node in endpoints:
+            offsets[node + 1] += 1
+        for node in range(len(self.names)):
+            offsets[node + 1] += offsets[node]
+        edges = array("I", bytes(4 * len(endpoints)))
+        positions = array("I", offsets)
+        for edge, node in enumerate(endpoints):
+            edges[positions[node]] = edge
+            positions[node] += 1
+        return offsets, edges
+
+    def _edges(self, adjacency: Tuple[array, array], name: str) -> array:
+        number = self.ids.get(name)
+        if number is None:
+            return array("I")
+        offsets, edges = adjacency
+        return edges[offsets[number]:offsets[number + 1]]
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the graph into a compact dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: The node names and the three edge lists.
+        """
+        return {
+            "format": CALL_GRAPH_FORMAT,
+            "names": self.names,
+            "sources": self.sources.tolist(),
+            "targets": self.targets.tolist(),
+            "kinds": [CALL_KINDS[kind].value for kind in self.kinds],
+        }
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "CallGraph":
+        """
+        Rebuilds a graph from the dictionary produced by `to_dictionary`.
+
+        Args:
+        - data (dict): Dictionary representation of the graph.
+
+        Returns:
+        - CallGraph: The rebuilt graph.
+        """
+        if data.get("format") != CALL_GRAPH_FORMAT:
+            raise ValueError(f"Unsupported call graph format {data.get('format')}")
+        graph = cls()
+        graph.names = list(data["names"])
+        graph.ids = {name: number for number, name in enumerate(graph.names)}
+        graph.sources = array("I", data["sources"])
+        graph.targets = array("I", data["targets"])
+        graph.kinds = array("B", (CALL_KINDS.index(CallKind(kind)) for kind in data["kinds"]))
+        return graph
+
+    def save(self, filename: str) -> None:
+        """
+        Writes the graph to a JSON file.
+        """
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(self.to_dictionary(), file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, filename: str) -> "CallGraph":
+        """
+        Reads a graph written by `save`.
+        """
+        with open(filename, "r", encoding="utf-8") as file:
+            return cls.from_dictionary(json.load(file))
+
+
+def iter_flow_lines(graph: CallGraph, diagram_format: str = "mermaid", title: str = None) -> Iterator[str]:
+    """
+    Lazily yields the lines of a flow diagram of a call graph, each edge labelled with its kind.
+
+    Args:
+    - graph (CallGraph): The graph, see `CallGraph.select` to draw part of it.
+    - diagram_format (str, optional): "mermaid" or "dot".
+    - title (str, optional): Title of the diagram.
+
+    Yields:
+    - str: Each line of the diagram, without line break.
+    """
+    if diagram_format == "mermaid":
+        if title:
+            yield "---"
+            yield f"title: {title}"
+            yield "---"
+        yield "flowchart LR"
+        for name in graph.names:
+            yield f'    {diagram_id(name)}["{name}"]'
+        for call in graph.iter_calls():
+            yield f"    {diagram_id(call.caller)} -->|{call.kind.value}| {diagram_id(call.callee)}"
+    elif diagram_format == "dot":
+        yield "digraph calls {"
+        if title:
+            yield f'    label="{title}";'
+        yield "    rankdir=LR;"
+        yield "    node [shape=box, fontsize=10];"
+        for call in graph.iter_calls():
+            yield f'    "{call.caller}" -> "{call.callee}" [label="{call.kind.value}"];'
+        yield "}"
+    else:
+        raise ValueError(f"Unknown flow diagram format '{diagram_format}', expected 'mermaid' or 'dot'")
+
+
+def write_flow_diagram(filename: str, graph: CallGraph, diagram_format: str = "mermaid", title: str = None) -> None:
+    """
+    Streams a flow diagram of a call graph to a file, see `iter_flow_lines`.
+    """
+    with open(filename, "w", encoding="utf-8") as file:
+        for line in iter_flow_lines(graph, diagram_format, title):
+            file.write(line)
+            file.write("\n")
@@ -0,0 +1,212 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from py_class_extractor import file_management, utils
+from py_class_extractor.schemas import ClassInformation
+
+
+class ClassIndex:
+    """
+    In-memory index answering structural queries over extracted classes.
+
+    Classes are indexed by qualified name, short name, module and base class in hash tables, so every
+    lookup is a dictionary access and the transitive queries only touch the classes they return.
+    Bases are keyed by their resolved `target` when one is known, otherwise by the name written in the source.
+
+    Attributes:
+    - classes (dict): Classes indexed by key (their qualified name, or module and name when it is unknown).
+    - by_name (dict): Keys of the classes indexed by short name.
+    - by_module (dict): Keys of the classes indexed by fully qualified module name.
+    - bases (dict): Base names of every class, indexed by class key.
+    - subclasses (dict): Keys of the direct subclasses, indexed by base name.
+    """
+
+    def __init__(self, classes: Iterable[ClassInformation] = ()) -> None:
+        """
+        Initializes an instance of ClassIndex.
+
+        Args:
+        - classes (Iterable[ClassInformation], optional): Classes to index.
+        """
+        self.classes: Dict[str, ClassInformation] = dict()
+        self.by_name: Dict[str, List[str]] = dict()
+        self.by_module: Dict[str, List[str]] = dict()
+        self.bases: Dict[str, tuple] = dict()
+        self.subclasses: Dict[str, List[str]] = dict()
+        for class_info in classes:
+            self.add(class_info)
+
+    @classmethod
+    def from_file(cls, filename: str) -> "ClassIndex":
+        """
+        Builds an index from a saved output file, in JSON or NDJSON format.
+
+        Args:
+        - filename (str): Path to the output file.
+
+        Returns:
+        - ClassIndex: The index of the saved classes.
+        """
+        return cls(ClassInformation.from_dictionary(record) for record in file_management.iter_saved_records(filename))
+
+    @staticmethod
+    def key_of(class_info: ClassInformation) -> str:
+        """
+        Returns the key a class is indexed under.
+
+        Args:
+        - class_info (ClassInformation): The class.
+
+        Returns:
+        - str: The qualified name of the class, or its module name and name when it is unknown.
+        """
+        if class_info.qualified_name is not None:
+            return class_info.qualified_name
+        module_name = utils.module_name_from_parts(class_info.modules)
+        return f"{module_name}.{class_info.name}" if module_name else class_info.name
+
+    def add(self, class_info: ClassInformation) -> None:
+        """
+        Adds a class to the index, replacing a class indexed under the same key.
+
+        Args:
+        - class_info (ClassInformation): The class to index.
+        """
+        key = self.key_of(class_info)
+        if key in self.classes:
+            self.remove(key)
+        self.classes[key] = class_info
+        self.by_name.setdefault(class_info.name, []).append(key)
+        self.by_module.setdefault(utils.module_name_from_parts(class_info.modules), []).append(key)
+        bases = tuple(relationship.target or relationship.related for relationship in class_info.relationships)
+        self.bases[key] = bases
+        for base in bases:
+            self.subclasses.setdefault(base, []).append(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes a class from the index.
+
+        Args:
+        - key (str): Key of the class.
+        """
+        class_info = self.classes.pop(key, None)
+        if class_info is None:
+            return
+        _discard(self.by_name, class_info.name, key)
+        _discard(self.by_module, utils.module_name_from_parts(class_info.modules), key)
+        for base in self.bases.pop(key):
+            _discard(self.subclasses, base, key)
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.classes
+
+    def get(self, key: str) -> Optional[ClassInformation]:
+        """
+        Returns the class indexed under a key, usually its qualified name.
+        """
+        return self.classes.get(key)
+
+    def find(self, name: str) -> List[ClassInformation]:
+        """
+        Returns every class with a given short name, e.g. all the classes named "Config".
+        """
+        return [self.classes[key] for key in self.by_name.get(name, ())]
+
+    def in_module(self, module_name: str) -> List[ClassInformation]:
+        """
+        Returns the classes defined in a module, given its fully qualified name.
+        """
+        return [self.classes[key] for key in self.by_module.get(module_name, ())]
+
+    def direct_subclasses(self, key: str) -> List[ClassInformation]:
+        """
+        Returns the classes listing a class among their bases.
+        """
+        return [self.classes[subclass] for subclass in self.subclasses.get(key, ())]
+
+    def direct_superclasses(self, key: str) -> List[str]:
+        """
+        Returns the base names of a class, which are keys of the index for bases defined in the corpus.
+        """
+        return list(self.bases.get(key, ()))
+
+    def iter_subclasses(self, key: str) -> Iterator[ClassInformation]:
+        """
+        Iterates over the direct and indirect subclasses of a class, breadth first, each one once.
+
+        Args:
+        - key (str): Key of the class.
+
+        Yields:
+        - ClassInformation: Each subclass.
+        """
+        for subclass in _breadth_first(key, self.subclasses):
+            yield self.classes[subclass]
+
+    def iter_superclasses(self, key: str) -> Iterator[str]:
+        """
+        Iterates over the direct and indirect base names of a class, breadth first, each one once.
+
+        Bases defined outside the corpus are yielded but cannot be followed further.
+
+        Args:
+        - key (str): Key of the class.
+
+        Yields:
+        - str: Each base name.
+        """
+        yield from _breadth_first(key, self.bases)
+
+    def all_subclasses(self, key: str) -> List[ClassInformation]:
+        """
+        Returns the direct and indirect subclasses of a class, see `iter_subclasses`.
+
+        Args:
+        - key (str): Key of the class.
+
+        Returns:
+        - list: Each subclass, breadth first.
+        """
+        return list(self.iter_subclasses(key))
+
+    def all_superclasses(self, key: str) -> List[str]:
+        """
+        Returns the direct and indirect base names of a class, see `iter_superclasses`.
+
+        Args:
+        - key (str): Key of the class.
+
+        Returns:
+        - list: Each base name, breadth first.
+        """
+        return list(self.iter_superclasses(key))
+
+
+def _breadth_first(start: str, edges: Dict[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yields the nodes reachable from a start node, breadth first, without the start node and without repeats.
+    """
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for node in edges.get(queue.popleft(), ()):
+            if node not in seen:
+                seen.add(node)
+                queue.append(node)
+                yield node
+
+
+def _discard(index: Dict[str, List[str]], name: str, key: str) -> None:
+    """
+    Removes a key from the list of an index entry, dropping the entry once it is empty.
+    """
+    keys = index.get(name)
+    if keys is None:
+        return
+    keys.remove(key)
+    if not keys:
+        del index[name]
@@ -0,0 +1,277 @@
+"""
+Extracts the class metadata of a Python file, directory or archive.
+
+Exit codes:
+    0  every file was analyzed
+    1  the output was written, but some files could not be analyzed; see --errors
+    2  invalid arguments
+    3  nothing could be analyzed, or the output could not be written
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from typing import List, Optional, TextIO
+
+import py_class_extractor
+from py_class_extractor import archives, batch, diagrams, file_management, snapshots
+from py_class_extractor.schemas import ClassInformation
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_USAGE = 2
+EXIT_FAILURE = 3
+
+OUTPUT_FORMATS = ("json", "ndjson", "snapshot", *diagrams.DIAGRAM_WRITERS)
+
+OUTPUT_EXTENSIONS = {"json": ".json", "ndjson": ".ndjson", "snapshot": ".snapshot"}
+
+# Minimum delay between two redraws of the progress line, in seconds.
+PROGRESS_INTERVAL = 0.2
+
+
+class ProgressLine:
+    """
+    Live progress line showing the files done, the files and classes per second and the time left.
+
+    Attributes:
+    - total (int or None): Number of files to analyze; None when it is not known in advance, as for
+      archives, which are streamed. The time left is then not shown.
+    - files (int): Number of files analyzed so far.
+    - classes (int): Number of classes found so far.
+    - failed (int): Number of files that could not be analyzed.
+    """
+
+    def __init__(self, total: Optional[int], stream: TextIO = sys.stderr, interval: float = PROGRESS_INTERVAL) -> None:
+        """
+        Initializes an instance of ProgressLine, starting its clock.
+
+        Args:
+        - total (int or None): Number of files to analyze, None when it is not known.
+        - stream (TextIO, optional): Terminal stream the line is drawn on.
+        - interval (float, optional): Minimum delay between two redraws, in seconds.
+        """
+        self.total = total
+        self.files = 0
+        self.classes = 0
+        self.failed = 0
+        self.stream = stream
+        self.interval = interval
+        self._start = time.perf_counter()
+        self._last_draw = 0.0
+
+    def update(self, file_path: str, module, error) -> None:
+        """
+        Counts an analyzed file and redraws the line at most once per interval. Matches `run_batch`'s `on_file`.
+
+        Args:
+        - file_path (str): Path of the file.
+        - module (ModuleInformation or None): The module metadata, on success.
+        - error (FileError or None): The error, on failure.
+        """
+        self.files += 1
+        if module is not None:
+            self.classes += len(module.classes)
+        else:
+            self.failed += 1
+        now = time.perf_counter()
+        if now - self._last_draw >= self.interval or self.files == self.total:
+            self._last_draw = now
+            self.draw(now - self._start)
+
+    def draw(self, elapsed: float) -> None:
+        """
+        Redraws the line in place with the current counts and rates.
+
+        Args:
+        - elapsed (float): Seconds since the start, the rates are computed over.
+        """
+        files_per_second = self.files / elapsed if elapsed else 0.0
+        classes_per_second = self.classes / elapsed if elapsed else 0.0
+        if self.total is None:
+            line = f"{self.files} files  {files_per_second:.1f} files/s  {classes_per_second:.1f} classes/s"
+        else:
+            remaining = (self.total - self.files) / files_per_second if files_per_second else 0.0
+            line = (f"{self.files}/{self.total} files  {files_per_second:.1f} files/s  "
+                    f"{classes_per_second:.1f} classes/s  ETA {int(remaining) // 60}:{int(remaining) % 60:02d}")
+        if self.failed:
+            line += f"  {self.failed} failed"
+        self.stream.write(f"\r{line}\033[K")
+        self.stream.flush()
+
+    def finish(self) -> None:
+        """
+        Ends the line, if anything was drawn, so that the next output starts on a line of its own.
+        """
+        if self.files:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def is_selected(relative_path: str, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None) -> bool:
+    """
+    Tells whether a relative path in POSIX form matches the include patterns and none of the exclude patterns.
+
+    Args:
+    - relative_path (str): Path relative to the scanned directory, or archive member name.
+    - include (list, optional): Patterns the path must match at least one of; every path by default.
+    - exclude (list, optional): Patterns excluding the paths matching any of them.
+
+    Returns:
+    - bool: True if the file is to be analyzed.
+    """
+    if include and not any(fnmatch.fnmatch(relative_path, pattern) for pattern in include):
+        return False
+    return not (exclude and any(fnmatch.fnmatch(relative_path, pattern) for pattern in exclude))
+
+
+def select_files(path: str, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None) -> List[str]:
+    """
+    Lists the Python files to analyze, filtered by glob patterns matched against their relative path.
+
+    Args:
+    - path (str): The path to a Python file or to a directory containing Python files.
+    - include (list, optional): Patterns a file must match at least one of; every file by default.
+    - exclude (list, optional): Patterns excluding the files matching any of them.
+
+    Returns:
+    - list: The selected files, in walk order.
+    """
+    root = path if os.path.isdir(path) else os.path.dirname(path)
+    selected = []
+    for file_path in py_class_extractor.iter_python_files(path):
+        if is_selected(os.path.relpath(file_path, root).replace(os.sep, "/"), include, exclude):
+            selected.append(file_path)
+    return selected
+
+
+def write_output(classes: list, output_path: str, output_format: str) -> None:
+    """
+    Writes the class dictionaries in the requested format.
+
+    Args:
+    - classes (list): The class dictionaries.
+    - output_path (str): The output file.
+    - output_format (str): One of `OUTPUT_FORMATS`.
+    """
+    if output_format == "json":
+        file_management.stream_data_to_json(output_path, classes)
+    elif output_format == "ndjson":
+        file_management.save_data_to_ndjson(output_path, classes)
+    elif output_format == "snapshot":
+        snapshots.write_snapshot(output_path, classes)
+    else:
+        diagrams.write_diagram(output_path, map(ClassInformation.from_dictionary, classes), output_format)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the command line arguments, whose help is taken from the module docstring.
+
+    Returns:
+    - argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m py_class_extractor", description=__doc__.strip().splitlines()[0],
+        epilog="\n".join(__doc__.strip().splitlines()[2:]), formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("path", help="Python file, directory, or .whl/.zip/.tar.gz archive")
+    parser.add_argument("-o", "--output", help="Output file; defaults to classes.<format extension>")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="json", dest="output_format")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Worker processes; 0 for one per CPU core")
+    parser.add_argument("--cache-dir", help="Directory of a persistent result cache reused across runs")
+    parser.add_argument("--include", action="append", metavar="PATTERN",
+                        help="Glob on the relative path, or archive member name, of the files to analyze; "
+                             "may be repeated")
+    parser.add_argument("--exclude", action="append", metavar="PATTERN",
+                        help="Glob on the relative path, or archive member name, of the files to skip; may be repeated")
+    parser.add_argument("--prefilter", action="store_true", help="Skip parsing files without class statements")
+    parser.add_argument("--outline", action="store_true",
+                        help="Skip parsing function bodies, except __init__; same classes, fewer syntax errors reported")
+    parser.add_argument("--encoding-fallback", action="store_true", help="Guess undeclared encodings with chardet")
+    parser.add_argument("--timeout", type=float, default=batch.DEFAULT_TIMEOUT, help="Seconds allowed per file")
+    parser.add_argument("--max-file-bytes", type=int, default=batch.DEFAULT_MAX_FILE_BYTES)
+    parser.add_argument("--checkpoint", help="Journal used to resume an interrupted scan; not for archives")
+    parser.add_argument("--errors", help="File the error report is written to as JSON")
+    progress = parser.add_mutually_exclusive_group()
+    progress.add_argument("--progress", action="store_true", default=None, help="Show a live progress line")
+    progress.add_argument("--no-progress", action="store_false", dest="progress")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Runs the command line interface.
+
+    Args:
+        argv (list, optional): The arguments, without the program name. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = build_parser()
+    arguments = parser.parse_args(argv)
+    if not os.path.exists(arguments.path):
+        parser.error(f"'{arguments.path}' does not exist")
+    # Module names start with the name of the scanned directory, which "." or "src/" do not carry
+    arguments.path = os.path.abspath(arguments.path)
+    output_path = arguments.output or "classes" + OUTPUT_EXTENSIONS.get(
+        arguments.output_format, diagrams.DIAGRAM_WRITERS.get(arguments.output_format, diagrams.DiagramWriter).extension
+    )
+    show_progress = sys.stderr.isatty() if arguments.progress is None else arguments.progress
+    start = time.perf_counter()
+
+    if archives.is_archive(arguments.path):
+        if arguments.checkpoint:
+            parser.error("--checkpoint is not supported for archives, which are analyzed in one streamed pass")
+        progress = ProgressLine(None) if show_progress else None
+        try:
+            result = batch.run_archive_batch(
+                arguments.path, arguments.workers, arguments.cache_dir, arguments.encoding_fallback,
+                arguments.max_file_bytes, arguments.timeout, arguments.prefilter,
+                lambda name: is_selected(name, arguments.include, arguments.exclude),
+                progress.update if progress else None, arguments.outline
+            )
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile) as error:  # The archive itself is unreadable
+            print(f"error: {error}", file=sys.stderr)
+            return EXIT_FAILURE
+        finally:
+            if progress is not None:
+                progress.finish()
+    else:
+        file_paths = select_files(arguments.path, arguments.include, arguments.exclude)
+        progress = ProgressLine(len(file_paths)) if show_progress else None
+        try:
+            result = batch.run_batch(
+                arguments.path, arguments.checkpoint, arguments.workers, arguments.cache_dir,
+                arguments.encoding_fallback, arguments.max_file_bytes, arguments.timeout, arguments.prefilter,
+                file_paths, progress.update if progress else None, arguments.outline,
+                {"include": arguments.include or [], "exclude": arguments.exclude or []}
+            )
+        except batch.CheckpointMismatchError as error:
+            print(f"error: {error}", file=sys.stderr)
+            return EXIT_USAGE
+        finally:
+            if progress is not None:
+                progress.finish()
+
+    try:
+        write_output(result.classes, output_path, arguments.output_format)
+        if arguments.errors:
+            file_management.save_data_to_json(arguments.errors, result.error_report())
+    except OSError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return EXIT_FAILURE
+
+    print(f"{result.files - len(result.errors)} files, {len(result.classes)} classes written to {output_path} "
+          f"in {time.perf_counter() - start:.2f}s" + (f", {len(result.errors)} files failed" if result.errors else ""),
+          file=sys.stderr)
+    for error in result.errors[:10] if not arguments.errors else ():
+        print(f"  {error.path}: {error.category}: {error.message}", file=sys.stderr)
+
+    if result.errors:
+        return EXIT_FAILURE if len(result.errors) == result.files else EXIT_PARTIAL
+    return EXIT_OK
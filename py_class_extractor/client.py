@@ -0,0 +1,197 @@
+"""
+Thin client of the analysis server, see `py_class_extractor.server`.
+
+This module only uses the standard library and imports nothing from the package, so editor integrations
+and hooks can run it by path, or copy it, without paying for the import of the analyzer:
+
+Usage:
+    python py_class_extractor/client.py analyze-file <file>
+    python py_class_extractor/client.py analyze-directory <directory>
+    python py_class_extractor/client.py query-class <name> [--path <directory>]
+    python py_class_extractor/client.py shutdown
+
+Protocol:
+    Requests and responses are JSON-RPC 2.0 objects, one per line, over a Unix socket. A connection may
+    carry any number of requests, answered in order.
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+
+DEFAULT_SOCKET_PATH = os.path.join(
+    tempfile.gettempdir(), f"py_class_extractor-{os.getuid() if hasattr(os, 'getuid') else 0}.sock"
+)
+
+
+class RemoteError(Exception):
+    """
+    Raised when the server answers a request with an error.
+
+    Attributes:
+    - code (int): The JSON-RPC error code.
+    - message (str): The error message.
+    """
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+
+
+class AnalysisClient:
+    """
+    Connection to an analysis server, reused across requests.
+
+    Paths are made absolute before they are sent, since the server may run in another directory.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = None) -> None:
+        """
+        Initializes an instance of AnalysisClient. The connection is opened by the first request.
+
+        Args:
+        - socket_path (str, optional): Path of the server socket.
+        - timeout (float, optional): Seconds to wait for a response; waits forever by default.
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._reader = None
+        self._ids = itertools.count(1)
+
+    def connect(self) -> None:
+        """
+        Opens the connection to the server, unless it is already open.
+
+        Raises:
+        - OSError: If no server listens on the socket.
+        """
+        if self._socket is not None:
+            return
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        try:
+            connection.connect(self.socket_path)
+        except OSError:
+            connection.close()
+            raise
+        self._socket = connection
+        self._reader = connection.makefile("rb")
+
+    def close(self) -> None:
+        """
+        Closes the connection, if open; the next request opens a new one.
+        """
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def __enter__(self) -> "AnalysisClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def call(self, method: str, **params):
+        """
+        Sends a request and waits for its response.
+
+        Args:
+        - method (str): Name of the method.
+        - **params: Parameters of the method.
+
+        Returns:
+        - Any: The result of the method.
+
+        Raises:
+        - RemoteError: If the server answers with an error.
+        - ConnectionError: If the server closes the connection without answering.
+        """
+        self.connect()
+        request_id = next(self._ids)
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        self._socket.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            self.close()
+            raise ConnectionError("The analysis server closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RemoteError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
+
+    def analyze_file(self, file_path: str) -> list:
+        """
+        Returns the dictionary of each class of a Python file, like `generate_classes_dicts_from_file`.
+        """
+        return self.call("analyze_file", path=os.path.abspath(file_path))
+
+    def analyze_directory(self, directory_path: str) -> list:
+        """
+        Returns the dictionary of each class of a directory, with relationships resolved across it.
+        """
+        return self.call("analyze_directory", path=os.path.abspath(directory_path))
+
+    def query_class(self, name: str, directory_path: str = None) -> list:
+        """
+        Returns the classes with a qualified or short name among the directories the server keeps warm.
+
+        Args:
+        - name (str): Qualified name, such as "package.module.Class", or short name of the class.
+        - directory_path (str, optional): Only search this directory, analyzing it first if needed.
+
+        Returns:
+        - list: The dictionary of each matching class.
+        """
+        if directory_path is None:
+            return self.call("query_class", name=name)
+        return self.call("query_class", name=name, path=os.path.abspath(directory_path))
+
+    def shutdown(self) -> None:
+        """
+        Stops the server once it has answered this request.
+        """
+        self.call("shutdown")
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Path of the server socket")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("analyze-file").add_argument("path")
+    commands.add_parser("analyze-directory").add_argument("path")
+    query_parser = commands.add_parser("query-class")
+    query_parser.add_argument("name")
+    query_parser.add_argument("--path", help="Directory to search; every warm directory by default")
+    commands.add_parser("ping")
+    commands.add_parser("shutdown")
+
+    arguments = parser.parse_args()
+    try:
+        with AnalysisClient(arguments.socket) as client:
+            if arguments.command == "analyze-file":
+                result = client.analyze_file(arguments.path)
+            elif arguments.command == "analyze-directory":
+                result = client.analyze_directory(arguments.path)
+            elif arguments.command == "query-class":
+                result = client.query_class(arguments.name, arguments.path)
+            elif arguments.command == "ping":
+                result = client.call("ping")
+            else:
+                client.shutdown()
+                return
+    except (OSError, RemoteError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        sys.exit(1)
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=4)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from py_class_extractor import utils
+from py_class_extractor.class_index import ClassIndex
+from py_class_extractor.schemas import ClassInformation, Encapsulation
+
+# Characters escaped in diagram identifiers; the escape character itself is escaped so the escape is injective
+_ESCAPED_CHARACTER = re.compile(r"\W|_")
+
+VISIBILITY = {Encapsulation.PUBLIC: "+", Encapsulation.PRIVATE: "-"}
+
+
+def _escape_character(match: re.Match) -> str:
+    """
+    Returns the escape sequence of a character matched by `_ESCAPED_CHARACTER`, see `diagram_id`.
+
+    Args:
+    - match (re.Match): The match of the character.
+
+    Returns:
+    - str: The escape sequence.
+    """
+    character = match.group()
+    if character == "_":
+        return "__"
+    if character == ".":
+        return "_d"
+    return f"_u{ord(character):x}_"
+
+
+def diagram_id(key: str) -> str:
+    """
+    Turns a class key into an identifier accepted by every diagram language.
+
+    `_` becomes `__`, `.` becomes `_d` and any other non-word character `_u<hex code>_`, so distinct keys
+    such as "a.b_c" and "a_b.c" never share an identifier.
+    """
+    return _ESCAPED_CHARACTER.sub(_escape_character, key)
+
+
+def base_keys(class_info: ClassInformation) -> List[str]:
+    """
+    Returns the keys of the bases of a class, using resolved targets when they are known.
+    """
+    return [relationship.target or relationship.related for relationship in class_info.relationships
+            if relationship.target or relationship.related]
+
+
+def member_lines(class_info: ClassInformation) -> Iterator[str]:
+    """
+    Yields the attributes, then the methods of a class, in UML notation.
+    """
+    for attribute in class_info.attributes:
+        yield f"{VISIBILITY[attribute.encapsulation]}{attribute.name}"
+    for method in class_info.methods:
+        yield f"{VISIBILITY[method.encapsulation]}{method.name}({', '.join(method.args)})"
+
+
+class DiagramWriter(ABC):
+    """
+    Base class of the diagram languages: yields the lines of a diagram one class at a time.
+
+    Attributes:
+    - extension (str): File extension of the language.
+    """
+
+    extension = ".txt"
+
+    def header(self, title: str = None) -> Iterator[str]:
+        """
+        Yields the lines opening the diagram; none by default.
+
+        Args:
+        - title (str, optional): Title of the diagram.
+        """
+        return iter(())
+
+    @abstractmethod
+    def class_lines(self, key: str, class_info: ClassInformation, collapse_members: bool) -> Iterator[str]:
+        """
+        Yields the lines declaring a class.
+
+        Args:
+        - key (str): Key of the class, see `ClassIndex.key_of`.
+        - class_info (ClassInformation): The class.
+        - collapse_members (bool): Declare the class without its attributes and methods.
+        """
+
+    @abstractmethod
+    def edge_line(self, key: str, base: str) -> str:
+        """
+        Returns the line drawing the inheritance edge from a class to one of its bases.
+
+        Args:
+        - key (str): Key of the class.
+        - base (str): Key of the base.
+        """
+
+    def footer(self) -> Iterator[str]:
+        """
+        Yields the lines closing the diagram; none by default.
+        """
+        return iter(())
+
+
+class MermaidWriter(DiagramWriter):
+    """
+    Writes Mermaid class diagrams.
+    """
+
+    extension = ".mmd"
+
+    def header(self, title: str = None) -> Iterator[str]:
+        """
+        Yields the front matter holding the title, if any, then the diagram type, see `DiagramWriter.header`.
+        """
+        if title:
+            yield "---"
+            yield f"title: {title}"
+            yield "---"
+        yield "classDiagram"
+
+    def class_lines(self, key: str, class_info: ClassInformation, collapse_members: bool) -> Iterator[str]:
+        """
+        Yields the class labelled with its key, then one line per member, see `DiagramWriter.class_lines`.
+        """
+        identifier = diagram_id(key)
+        yield f'    class {identifier}["{key}"]'
+        if not collapse_members:
+            for line in member_lines(class_info):
+                yield f"    {identifier} : {line}"
+
+    def edge_line(self, key: str, base: str) -> str:
+        """
+        Returns the inheritance arrow from the base to the class, see `DiagramWriter.edge_line`.
+        """
+        return f"    {diagram_id(base)} <|-- {diagram_id(key)}"
+
+
+class PlantUMLWriter(DiagramWriter):
+    """
+    Writes PlantUML class diagrams.
+    """
+
+    extension = ".puml"
+
+    def header(self, title: str = None) -> Iterator[str]:
+        """
+        Yields the start tag, the title, if any, and hides empty member compartments, see `DiagramWriter.header`.
+        """
+        yield "@startuml"
+        if title:
+            yield f"title {title}"
+        yield "hide empty members"
+
+    def class_lines(self, key: str, class_info: ClassInformation, collapse_members: bool) -> Iterator[str]:
+        """
+        Yields the class aliased to its identifier, with a body listing its members unless they are collapsed,
+        see `DiagramWriter.class_lines`.
+        """
+        identifier = diagram_id(key)
+        if collapse_members:
+            yield f'class "{key}" as {identifier}'
+            return
+        yield f'class "{key}" as {identifier} {{'
+        for line in member_lines(class_info):
+            yield f"  {line}"
+        yield "}"
+
+    def edge_line(self, key: str, base: str) -> str:
+        """
+        Returns the inheritance arrow from the base to the class, see `DiagramWriter.edge_line`.
+        """
+        return f"{diagram_id(base)} <|-- {diagram_id(key)}"
+
+    def footer(self) -> Iterator[str]:
+        """
+        Yields the end tag, see `DiagramWriter.footer`.
+        """
+        yield "@enduml"
+
+
+class DotWriter(DiagramWriter):
+    """
+    Writes Graphviz DOT graphs, one record node per class; node names are quoted keys.
+    """
+
+    extension = ".dot"
+
+    _RECORD_SPECIAL = re.compile(r'([{}|<>"\\])')
+
+    def header(self, title: str = None) -> Iterator[str]:
+        """
+        Opens the graph and sets its label, if any, and the node and edge styles, see `DiagramWriter.header`.
+        """
+        yield "digraph classes {"
+        if title:
+            yield f'    label="{self._escape(title)}";'
+        yield "    rankdir=BT;"
+        yield "    node [shape=record, fontsize=10];"
+        yield "    edge [arrowhead=empty];"
+
+    def class_lines(self, key: str, class_info: ClassInformation, collapse_members: bool) -> Iterator[str]:
+        """
+        Yields the record node of the class, with an attribute and a method field unless members are collapsed,
+        see `DiagramWriter.class_lines`.
+        """
+        label = self._escape(key)
+        if not collapse_members:
+            members = [self._escape(line) + "\\l" for line in member_lines(class_info)]
+            label = f"{{{label}|{''.join(members[:len(class_info.attributes)])}|{''.join(members[len(class_info.attributes):])}}}"
+        yield f'    "{key}" [label="{label}"];'
+
+    def edge_line(self, key: str, base: str) -> str:
+        """
+        Returns the edge from the class node to the base node, see `DiagramWriter.edge_line`.
+        """
+        return f'    "{key}" -> "{base}";'
+
+    def footer(self) -> Iterator[str]:
+        """
+        Closes the graph, see `DiagramWriter.footer`.
+        """
+        yield "}"
+
+    def _escape(self, text: str) -> str:
+        """
+        Escapes the characters that have a meaning in record labels.
+
+        Args:
+        - text (str): The text to escape.
+
+        Returns:
+        - str: The text, with a backslash before every special character.
+        """
+        return self._RECORD_SPECIAL.sub(r"\\\1", text)
+
+
+DIAGRAM_WRITERS = {"mermaid": MermaidWriter, "plantuml": PlantUMLWriter, "dot": DotWriter}
+
+
+def iter_diagram_lines(classes: Iterable[ClassInformation], diagram_format: str = "mermaid",
+                       collapse_members: bool = False, keys: Optional[Set[str]] = None,
+                       title: str = None) -> Iterator[str]:
+    """
+    Lazily yields the lines of a class diagram, so it can be streamed whatever the number of classes.
+
+    Args:
+    - classes (Iterable[ClassInformation]): Classes to draw, possibly a generator.
+    - diagram_format (str, optional): "mermaid", "plantuml" or "dot".
+    - collapse_members (bool, optional): Draw classes without their attributes and methods.
+    - keys (set, optional): Keys of the classes in the diagram; inheritance edges towards other classes are
+      dropped. By default every base is drawn, including bases defined outside the analyzed code.
+    - title (str, optional): Title of the diagram.
+
+    Yields:
+    - str: Each line of the diagram, without line break.
+    """
+    if diagram_format not in DIAGRAM_WRITERS:
+        raise ValueError(f"Unknown diagram format '{diagram_format}', expected one of {sorted(DIAGRAM_WRITERS)}")
+    writer = DIAGRAM_WRITERS[diagram_format]()
+
+    yield from writer.header(title)
+    for class_info in classes:
+        key = ClassIndex.key_of(class_info)
+        yield from writer.class_lines(key, class_info, collapse_members)
+        for base in base_keys(class_info):
+            if keys is None or base in keys:
+                yield writer.edge_line(key, base)
+    yield from writer.footer()
+
+
+def write_diagram(filename: str, classes: Iterable[ClassInformation], diagram_format: str = "mermaid",
+                  collapse_members: bool = False, keys: Optional[Set[str]] = None, title: str = None) -> None:
+    """
+    Streams a class diagram to a file, see `iter_diagram_lines`.
+    """
+    with open(filename, "w", encoding="utf-8") as file:
+        for line in iter_diagram_lines(classes, diagram_format, collapse_members, keys, title):
+            file.write(line)
+            file.write("\n")
+
+
+def partition_by_package(classes: Iterable[ClassInformation], depth: int = 1) -> Dict[str, List[ClassInformation]]:
+    """
+    Groups classes by package.
+
+    Args:
+    - classes (Iterable[ClassInformation]): Classes to group.
+    - depth (int, optional): Number of leading module name components naming the package.
+
+    Returns:
+    - dict: Classes of every package, keyed by package name, in order of first appearance.
+    """
+    packages: Dict[str, List[ClassInformation]] = dict()
+    for class_info in classes:
+        module_name = utils.module_name_from_parts(class_info.modules)
+        package = ".".join(module_name.split(".")[:depth]) or "<root>"
+        packages.setdefault(package, []).append(class_info)
+    return packages
+
+
+def partition_by_component(classes: Iterable[ClassInformation]) -> List[List[ClassInformation]]:
+    """
+    Groups classes into the connected components of their inheritance graph.
+
+    Only bases among the given classes connect them, so external bases such as `object` do not merge everything.
+
+    Args:
+    - classes (Iterable[ClassInformation]): Classes to group.
+
+    Returns:
+    - list: The classes of every component, largest component first.
+    """
+    classes = list(classes)
+    keys = [ClassIndex.key_of(class_info) for class_info in classes]
+    parent = {key: key for key in keys}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]  # Path halving
+            key = parent[key]
+        return key
+
+    for key, class_info in zip(keys, classes):
+        for base in base_keys(class_info):
+            if base in parent:
+                root, base_root = find(key), find(base)
+                if root != base_root:
+                    parent[root] = base_root
+
+    components: Dict[str, List[ClassInformation]] = dict()
+    for key, class_info in zip(keys, classes):
+        components.setdefault(find(key), []).append(class_info)
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def select_neighbourhood(index: ClassIndex, key: str, hops: int) -> List[ClassInformation]:
+    """
+    Selects the classes within a number of inheritance hops of a class, in either direction.
+
+    Args:
+    - index (ClassIndex): Index of the classes.
+    - key (str): Key of the central class.
+    - hops (int): Maximum number of inheritance edges between the central class and a selected class.
+
+    Returns:
+    - list: The selected classes, the central class first, then by distance.
+    """
+    if key not in index:
+        raise KeyError(f"Unknown class '{key}'")
+    distances = {key: 0}
+    queue = deque([key])
+    while queue:
+        current = queue.popleft()
+        if distances[current] == hops:
+            continue
+        for neighbour in [*index.bases.get(current, ()), *index.subclasses.get(current, ())]:
+            if neighbour in index and neighbour not in distances:
+                distances[neighbour] = distances[current] + 1
+                queue.append(neighbour)
+    return [index.classes[selected] for selected in distances]
+
+
+def export_diagrams(classes: Iterable[ClassInformation], output_path: str, diagram_format: str = "mermaid",
+                    partition: str = None, package_depth: int = 1, collapse_members: bool = False,
+                    focus: str = None, hops: int = 1) -> List[str]:
+    """
+    Exports classes to one or several diagram files.
+
+    Args:
+    - classes (Iterable[ClassInformation]): Classes to draw.
+    - output_path (str): The diagram file, or the directory receiving one file per part when partitioning.
+    - diagram_format (str, optional): "mermaid", "plantuml" or "dot".
+    - partition (str, optional): None for a single diagram, "package" or "component" for one diagram per part.
+    - package_depth (int, optional): Number of module name components naming a package.
+    - collapse_members (bool, optional): Draw classes without their attributes and methods.
+    - focus (str, optional): Key of a class; only the classes within `hops` inheritance edges of it are drawn.
+    - hops (int, optional): Size of the neighbourhood drawn around `focus`.
+
+    Returns:
+    - list: Paths of the written files.
+    """
+    if diagram_format not in DIAGRAM_WRITERS:
+        raise ValueError(f"Unknown diagram format '{diagram_format}', expected one of {sorted(DIAGRAM_WRITERS)}")
+
+    if focus is not None:
+        classes = select_neighbourhood(ClassIndex(classes), focus, hops)
+
+    if partition is None:
+        if focus is None:
+            write_diagram(output_path, classes, diagram_format, collapse_members)
+        else:
+            keys = {ClassIndex.key_of(class_info) for class_info in classes}
+            write_diagram(output_path, classes, diagram_format, collapse_members, keys, title=focus)
+        return [output_path]
+
+    if partition == "package":
+        parts = partition_by_package(classes, package_depth).items()
+    elif partition == "component":
+        parts = ((f"component_{number}", part) for number, part in enumerate(partition_by_component(classes)))
+    else:
+        raise ValueError(f"Unknown partition '{partition}', expected 'package' or 'component'")
+
+    os.makedirs(output_path, exist_ok=True)
+    extension = DIAGRAM_WRITERS[diagram_format].extension
+    written = []
+    for name, part in parts:
+        filename = os.path.join(output_path, f"{diagram_id(name)}{extension}")
+        keys = {ClassIndex.key_of(class_info) for class_info in part}
+        write_diagram(filename, part, diagram_format, collapse_members, keys, title=name)
+        written.append(filename)
+    return written
@@ -1,15 +1,39 @@
+import io
 import json
-from os import listdir
-from os.path import isfile, join, isdir
-import chardet
+import mmap
+import os
+import re
+import tokenize
 from abc import ABC, abstractmethod
 
+from py_class_extractor.gitignore import IgnoreRules, is_ignored
+
+# Number of leading bytes given to chardet when the declared encoding cannot decode a file.
+CHARDET_PREFIX_BYTES = 64 * 1024
+
+# Directories that never hold project sources and are pruned without being listed.
+DEFAULT_IGNORED_DIRECTORIES = frozenset((".git", ".hg", ".svn", "__pycache__", "node_modules"))
+
+# A directory holding this file is a virtual environment and is pruned as well.
+VIRTUAL_ENVIRONMENT_MARKER = "pyvenv.cfg"
+
+# A class statement always starts a logical line: it follows the start of the file (and a BOM) or a line
+# break, then indentation. Matches in strings or comments only cost an unneeded parse.
+CLASS_STATEMENT_PATTERN = re.compile(rb"(?:\A(?:\xef\xbb\xbf)?|[\r\n])[ \t\f]*class[ \t\f\\]")
+
+IMPORT_KEYWORD_PATTERN = re.compile(rb"\bimport\b")
+
+# Files at least this large are memory-mapped by the prefilter, so a match near the top avoids reading the rest.
+PREFILTER_MMAP_BYTES = 1024 * 1024
+
 
 class SerializableToDict(ABC):
     """
     Abstract base class for objects that can be serialized to a dictionary.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def to_dictionary(self):
         """
@@ -21,57 +45,123 @@ class SerializableToDict(ABC):
         pass
 
 
+def _scan_directory(path, relative_path, rules, use_gitignore):
+    """
+    Lists a directory for the walker and extends the ignore rules with its .gitignore file.
+
+    Args:
+    - path (str): Path of the directory.
+    - relative_path (str): Path of the directory relative to the walk root, in POSIX form.
+    - rules (tuple): Ignore rules inherited from the parent directories.
+    - use_gitignore (bool): Apply the .gitignore file of the directory.
+
+    Returns:
+    - tuple or None: An iterator over the entries sorted by name, the relative path and the rules of the
+      directory, or None if the directory is a virtual environment.
+    """
+    with os.scandir(path) as iterator:
+        entries = sorted(iterator, key=lambda entry: entry.name)
+
+    names = {entry.name for entry in entries}
+    if relative_path and VIRTUAL_ENVIRONMENT_MARKER in names:
+        return None
+    if use_gitignore and ".gitignore" in names:
+        rules = rules + (IgnoreRules.from_file(os.path.join(path, ".gitignore"), relative_path),)
+
+    return iter(entries), relative_path, rules
+
+
+def iter_files(directory, ignore_patterns=None, use_gitignore=True):
+    """
+    Lazily walks a directory and its subdirectories, yielding the files that are not ignored.
+
+    The walk is iterative and uses `os.scandir`, so the file type comes from the directory listing
+    instead of an extra stat per entry. Ignored directories are pruned before being listed: version
+    control and cache directories, virtual environments, and anything matched by the ignore rules.
+
+    Args:
+    - directory (str): Directory path to start exploring.
+    - ignore_patterns (list, optional): Extra gitignore-style patterns, relative to `directory`.
+    - use_gitignore (bool, optional): Apply the .gitignore files found in the walked directories.
+
+    Yields:
+    - str: Path of each file found, depth first with the entries of every directory sorted by name, so the
+      order does not depend on the file system.
+    """
+    root_rules = (IgnoreRules(ignore_patterns),) if ignore_patterns else ()
+    stack = [_scan_directory(directory, "", root_rules, use_gitignore)]
+
+    while stack:
+        entries, relative_path, rules = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        entry_relative_path = f"{relative_path}/{entry.name}" if relative_path else entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+
+        if not is_dir:
+            if not is_ignored(rules, entry_relative_path, False):
+                yield entry.path
+        elif entry.name not in DEFAULT_IGNORED_DIRECTORIES and not is_ignored(rules, entry_relative_path, True):
+            try:
+                frame = _scan_directory(entry.path, entry_relative_path, rules, use_gitignore)
+            except OSError:
+                continue  # Unreadable directory
+            if frame is not None:
+                stack.append(frame)
+
+
 def get_files_recursively(directory, ignore_patterns=None):
     """
     Recursively retrieves all files in a directory and its subdirectories.
 
     Args:
     - directory (str): Directory path to start exploring.
-    - ignore_patterns (list, optional): List of patterns for files to be ignored.
+    - ignore_patterns (list, optional): List of gitignore-style patterns for files to be ignored.
 
     Returns:
     - list: List of file paths found in the directory and its subdirectories.
     """
-    if ignore_patterns is None:
-        ignore_patterns = []
+    return list(iter_files(directory, ignore_patterns))
 
-    files = []
 
-    for item in listdir(directory):
-        item_path = join(directory, item)
-
-        if any(pattern in item_path for pattern in ignore_patterns):
-            continue
+def iter_files_with_extension(directory, extension, ignore_patterns=None, use_gitignore=True):
+    """
+    Lazily finds all files with a specific extension in a directory and its subdirectories.
 
-        if isdir(item_path):
-            files.extend(get_files_recursively(item_path, ignore_patterns))
-        elif isfile(item_path):
-            files.append(item_path)
+    Args:
+    - directory (str): Directory path to start exploring.
+    - extension (str): Extension of the files to search for (e.g., '.py').
+    - ignore_patterns (list, optional): Extra gitignore-style patterns, relative to `directory`.
+    - use_gitignore (bool, optional): Apply the .gitignore files found in the walked directories.
 
-    return files
+    Yields:
+    - str: Path of each file that has the specified extension.
+    """
+    for file_path in iter_files(directory, ignore_patterns, use_gitignore):
+        if file_path.endswith(extension):
+            yield file_path
 
 
-def find_files_with_extension(directory, extension):
+def find_files_with_extension(directory, extension, ignore_patterns=None, use_gitignore=True):
     """
     Recursively finds all files with a specific extension in a directory and its subdirectories.
 
     Args:
     - directory (str): Directory path to start exploring.
     - extension (str): Extension of the files to search for (e.g., '.py').
+    - ignore_patterns (list, optional): Extra gitignore-style patterns, relative to `directory`.
+    - use_gitignore (bool, optional): Apply the .gitignore files found in the walked directories.
 
     Returns:
     - list: List of file paths that have the specified extension.
     """
-    files = []
-
-    for item in listdir(directory):
-        item_path = join(directory, item)
-        if isdir(item_path):
-            files.extend(find_files_with_extension(item_path, extension))
-        elif item.endswith(extension):
-            files.append(item_path)
-
-    return files
+    return list(iter_files_with_extension(directory, extension, ignore_patterns, use_gitignore))
 
 
 def read_gitignore_patterns(gitignore_path):
@@ -82,24 +172,24 @@ def read_gitignore_patterns(gitignore_path):
     - gitignore_path (str): Path to the .gitignore file.
 
     Returns:
-    - list: List of patterns for files to be ignored.
+    - list: List of gitignore-style patterns, including negations, without blank lines and comments.
     """
     ignore_patterns = []
     with open(gitignore_path, "r") as file:
         for line in file:
-            line = line.strip()
-            if not line or line.startswith("#") or line.startswith("!"):
+            line = line.rstrip("\n\r")
+            if not line.strip() or line.startswith("#"):
                 continue
-
-            pattern = line.replace("/", "").replace("*", "").split()[0].strip()
-            ignore_patterns.append(pattern)
+            ignore_patterns.append(line)
 
     return ignore_patterns
 
 
 def detect_file_encoding(filename):
     """
-    Detects the encoding of a file.
+    Detects the encoding of a file with chardet, reading its whole content.
+
+    Prefer `decode_source`, which follows the PEP 263 rules and only falls back to chardet on request.
 
     Args:
     - filename (str): Path to the file to detect the encoding.
@@ -107,11 +197,112 @@ def detect_file_encoding(filename):
     Returns:
     - str: Encoding name detected.
     """
+    import chardet
+
     with open(filename, 'rb') as rawdata:
         result = chardet.detect(rawdata.read())
     return result['encoding']
 
 
+def read_file_bytes(filename):
+    """
+    Reads the raw content of a file.
+
+    Args:
+    - filename (str): Path to the file to read.
+
+    Returns:
+    - bytes: Content of the file.
+    """
+    with open(filename, 'rb') as file:
+        return file.read()
+
+
+def scan_python_source(data):
+    """
+    Scans raw Python source code for the keywords a module needs to define classes or bind imported names.
+
+    The scan is conservative: it may report a keyword that only appears in a string or a comment,
+    but never misses one. ASCII-incompatible content (UTF-16 or UTF-32) is always reported as matching.
+
+    Args:
+    - data (bytes or mmap.mmap): Raw content of a Python file.
+
+    Returns:
+    - tuple: (may_define_classes, may_import) booleans.
+    """
+    head = data[:4]
+    if head[:2] in (b"\xff\xfe", b"\xfe\xff") or b"\x00" in head:
+        return True, True
+    if CLASS_STATEMENT_PATTERN.search(data):
+        return True, True
+    return False, IMPORT_KEYWORD_PATTERN.search(data) is not None
+
+
+def scan_python_file(filename):
+    """
+    Scans a Python file like `scan_python_source`, memory-mapping it when it is large.
+
+    Args:
+    - filename (str): Path to the file to scan.
+
+    Returns:
+    - tuple: (data, may_define_classes, may_import), where data is the content of the file when it
+      was read in full, so it does not need to be read again, and None when it was memory-mapped.
+    """
+    if os.path.getsize(filename) < PREFILTER_MMAP_BYTES:
+        data = read_file_bytes(filename)
+        return (data,) + scan_python_source(data)
+
+    with open(filename, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return (None,) + scan_python_source(mapped)
+
+
+def detect_prefix_encoding(data, max_bytes=CHARDET_PREFIX_BYTES):
+    """
+    Guesses the encoding of raw data with chardet, looking only at a bounded prefix.
+
+    Args:
+    - data (bytes): Raw content to analyze.
+    - max_bytes (int, optional): Number of leading bytes given to chardet.
+
+    Returns:
+    - str or None: Encoding name detected, or None if chardet has no guess.
+    """
+    import chardet
+
+    return chardet.detect(data[:max_bytes])['encoding']
+
+
+def decode_source(data, encoding_fallback=False):
+    """
+    Decodes Python source code following the PEP 263 rules (BOM, then coding cookie, then UTF-8).
+
+    Args:
+    - data (bytes): Raw content of a Python file.
+    - encoding_fallback (bool, optional): When the declared encoding cannot decode the data,
+      guess the encoding with chardet on a bounded prefix instead of failing.
+
+    Returns:
+    - str: The decoded source code, without BOM.
+
+    Raises:
+    - SyntaxError: If the encoding declaration is invalid or the first lines cannot be decoded, without fallback.
+    - UnicodeDecodeError: If the data cannot be decoded, without fallback or when the guessed encoding fails too.
+    """
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+        return data.decode(encoding)
+    except (SyntaxError, UnicodeDecodeError):
+        # detect_encoding raises SyntaxError when the first lines are not valid in the default encoding
+        if not encoding_fallback:
+            raise
+        guessed_encoding = detect_prefix_encoding(data)
+        if guessed_encoding is None:
+            raise
+        return data.decode(guessed_encoding)
+
+
 def save_data_to_json(filename, data):
     """
     Saves data to a JSON file.
@@ -124,6 +315,137 @@ def save_data_to_json(filename, data):
         json.dump(data, file, ensure_ascii=False, indent=4)
 
 
+def _to_record(item):
+    """
+    Converts a serializable object to its dictionary representation, leaving other data untouched.
+
+    Args:
+    - item (Any): Object to convert.
+
+    Returns:
+    - Any: The dictionary representation of the object, or the object itself.
+    """
+    if isinstance(item, SerializableToDict):
+        return item.to_dictionary()
+    return item
+
+
+def encode_json_record(record):
+    """
+    Encodes a record as an element of the indented JSON array written by `stream_data_to_json`.
+
+    Args:
+    - record (Any): Dictionary or SerializableToDict object to encode.
+
+    Returns:
+    - str: The encoded record, indented one level.
+    """
+    # JSON strings escape their line breaks, so every newline is structural and can be indented
+    return json.dumps(_to_record(record), ensure_ascii=False, indent=4).replace("\n", "\n    ")
+
+
+def encode_ndjson_record(record):
+    """
+    Encodes a record as a line of the newline-delimited JSON written by `save_data_to_ndjson`.
+
+    Args:
+    - record (Any): Dictionary or SerializableToDict object to encode.
+
+    Returns:
+    - str: The encoded record, without its line break.
+    """
+    return json.dumps(_to_record(record), ensure_ascii=False, separators=(",", ":"))
+
+
+RECORD_ENCODERS = {"json": encode_json_record, "ndjson": encode_ndjson_record}
+
+
+def write_encoded_records(filename, encoded_records, output_format="json"):
+    """
+    Writes records already encoded by `encode_json_record` or `encode_ndjson_record` incrementally.
+
+    Args:
+    - filename (str): Path to the file to save.
+    - encoded_records (Iterable[str]): Encoded records, possibly a generator.
+    - output_format (str, optional): "json" for an indented JSON array, "ndjson" for one record per line.
+
+    Returns:
+    - int: Number of records written.
+    """
+    if output_format not in RECORD_ENCODERS:
+        raise ValueError(f"Unknown output format '{output_format}', expected one of {sorted(RECORD_ENCODERS)}")
+
+    count = 0
+    with open(filename, 'w', encoding='utf-8') as file:
+        for encoded in encoded_records:
+            if output_format == "json":
+                file.write("[\n    " if count == 0 else ",\n    ")
+                file.write(encoded)
+            else:
+                file.write(encoded)
+                file.write("\n")
+            count += 1
+        if output_format == "json":
+            file.write("\n]" if count else "[]")
+    return count
+
+
+def stream_data_to_json(filename, records):
+    """
+    Writes records to a JSON array incrementally, without holding them all in memory.
+
+    The output is identical to `save_data_to_json` called with the same records as a list.
+
+    Args:
+    - filename (str): Path to the JSON file to save.
+    - records (Iterable): Dictionaries or SerializableToDict objects to be saved, possibly a generator.
+
+    Returns:
+    - int: Number of records written.
+    """
+    return write_encoded_records(filename, map(encode_json_record, records), "json")
+
+
+def save_data_to_ndjson(filename, records):
+    """
+    Writes records to a newline-delimited JSON file (one compact JSON document per line) incrementally.
+
+    Args:
+    - filename (str): Path to the NDJSON file to save.
+    - records (Iterable): Dictionaries or SerializableToDict objects to be saved, possibly a generator.
+
+    Returns:
+    - int: Number of records written.
+    """
+    return write_encoded_records(filename, map(encode_ndjson_record, records), "ndjson")
+
+
+def iter_saved_records(filename):
+    """
+    Reads back the records written by `save_data_to_json`, `stream_data_to_json` or `save_data_to_ndjson`.
+
+    The format is detected from the first character: a JSON array is loaded at once, while
+    newline-delimited JSON is read one line at a time.
+
+    Args:
+    - filename (str): Path to the saved file.
+
+    Yields:
+    - dict: Each record, in file order.
+    """
+    with open(filename, 'r', encoding='utf-8') as file:
+        head = file.read(1)
+        while head.isspace():
+            head = file.read(1)
+        file.seek(0)
+        if head == "[":
+            yield from json.load(file)
+            return
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
 if __name__ == "__main__":
     # Example usage: finding Python files in a specific directory
     directory_path = r"c:\Users\aluno\AppData\Local\Programs\Python\Python310\Lib\site-packages\PIL"
@@ -0,0 +1,177 @@
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+
+def translate_pattern(pattern: str) -> str:
+    """
+    Translates the path part of a gitignore pattern into a regular expression.
+
+    `*` and `?` never match a `/`, `**/` matches zero or more directories and a trailing `**`
+    matches everything inside a directory. Backslashes escape the next character.
+
+    Args:
+    - pattern (str): The pattern, without negation, anchoring slash or trailing slash.
+
+    Returns:
+    - str: The equivalent regular expression, without anchors.
+    """
+    regex = []
+    index, length = 0, len(pattern)
+    while index < length:
+        char = pattern[index]
+        if char == "*":
+            if pattern.startswith("**", index) and (index == 0 or pattern[index - 1] == "/"):
+                if pattern.startswith("**/", index):
+                    regex.append("(?:.*/)?")
+                    index += 3
+                    continue
+                if index + 2 == length:
+                    regex.append(".*")
+                    index += 2
+                    continue
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = index + 1
+            if end < length and pattern[end] in "!^":
+                end += 1
+            if end < length and pattern[end] == "]":
+                end += 1
+            end = pattern.find("]", end)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                content = pattern[index + 1:end].replace("\\", "\\\\")
+                if content[:1] in ("!", "^"):
+                    content = "^" + content[1:]
+                regex.append(f"(?!/)[{content}]")
+                index = end
+        elif char == "\\" and index + 1 < length:
+            index += 1
+            regex.append(re.escape(pattern[index]))
+        else:
+            regex.append(re.escape(char))
+        index += 1
+    return "".join(regex)
+
+
+def parse_pattern_line(line: str) -> Optional[Tuple[Pattern, bool, bool]]:
+    """
+    Compiles a single gitignore line.
+
+    Args:
+    - line (str): A line of a .gitignore file.
+
+    Returns:
+    - tuple or None: The compiled pattern, whether it is a negation and whether it only matches
+      directories, or None for blank lines and comments.
+    """
+    line = line.rstrip("\n\r")
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+
+    directory_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash at the beginning or in the middle anchors the pattern to the .gitignore directory
+    anchored = "/" in line
+    line = line.lstrip("/")
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(f"{prefix}{translate_pattern(line)}\\Z", re.DOTALL), negated, directory_only
+
+
+class IgnoreRules:
+    """
+    Compiled rules of one .gitignore file, matched against paths relative to the directory holding it.
+
+    Attributes:
+    - base (str): Path of the .gitignore directory relative to the walk root, in POSIX form ("" for the root).
+    - patterns (list): Compiled (regex, negated, directory_only) tuples, in file order.
+    """
+
+    def __init__(self, lines: Iterable[str], base: str = "") -> None:
+        """
+        Initializes an instance of IgnoreRules.
+
+        Args:
+        - lines (Iterable[str]): Lines of the .gitignore file.
+        - base (str, optional): Path of the .gitignore directory relative to the walk root, in POSIX form.
+        """
+        self.base = base
+        self.patterns: List[Tuple[Pattern, bool, bool]] = [
+            compiled for compiled in map(parse_pattern_line, lines) if compiled is not None
+        ]
+
+    @classmethod
+    def from_file(cls, gitignore_path: str, base: str = "") -> "IgnoreRules":
+        """
+        Reads and compiles a .gitignore file.
+
+        Args:
+        - gitignore_path (str): Path to the .gitignore file.
+        - base (str, optional): Path of the .gitignore directory relative to the walk root, in POSIX form.
+
+        Returns:
+        - IgnoreRules: The compiled rules.
+        """
+        with open(gitignore_path, "r", encoding="utf-8", errors="surrogateescape") as file:
+            return cls(file, base)
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Matches a path against the rules; the last matching pattern decides.
+
+        Args:
+        - relative_path (str): Path relative to the walk root, in POSIX form.
+        - is_dir (bool): Whether the path is a directory.
+
+        Returns:
+        - bool or None: True if ignored, False if re-included by a negation, None if no pattern matches.
+        """
+        if self.base:
+            if not relative_path.startswith(self.base + "/"):
+                return None
+            relative_path = relative_path[len(self.base) + 1:]
+
+        result = None
+        for regex, negated, directory_only in self.patterns:
+            if directory_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                result = not negated
+        return result
+
+
+def is_ignored(rules: Iterable[IgnoreRules], relative_path: str, is_dir: bool) -> bool:
+    """
+    Decides whether a path is ignored by a stack of rules, deeper .gitignore files taking precedence.
+
+    Args:
+    - rules (Iterable[IgnoreRules]): Rules ordered from the walk root to the deepest directory.
+    - relative_path (str): Path relative to the walk root, in POSIX form.
+    - is_dir (bool): Whether the path is a directory.
+
+    Returns:
+    - bool: True if the path is ignored.
+    """
+    ignored = False
+    for rule in rules:
+        result = rule.match(relative_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
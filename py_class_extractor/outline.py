@@ -0,0 +1,254 @@
+"""
+Outline parsing for inventory scans, which only need the classes, their bases and their members.
+
+Most of a module is function and method bodies, yet `ast.parse` builds every expression in them. The
+outline scanner splits the source into logical lines with a regular expression that only recognizes
+strings, comments and line breaks, and follows the indentation to keep the lines the extraction can see:
+class bodies, `__init__` bodies, imports, and the headers of the blocks around them. Blocks are written
+lazily, so a function body without classes or imports is dropped with its header, and a `pass` stands for
+the dropped first statement of a written block. The resulting skeleton is then parsed with `ast.parse`,
+so every kept statement is parsed exactly, and `ast_collectors.ModuleInspector` extracts the same classes
+from it as from the whole module.
+
+Whenever the scanner cannot be sure, on lone carriage returns, unbalanced brackets or a block without a
+body, or when the skeleton does not parse, the whole source is parsed instead. Errors in the dropped
+lines are not reported: the outline of a module whose function bodies do not compile may still be extracted.
+"""
+import ast
+import re
+from typing import List, Optional, Tuple
+
+# Strings, comments and line breaks: the only tokens changing how a line is split into logical lines
+LINE_TOKEN = re.compile(r"""
+    '''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''
+  | \"\"\"[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*\"\"\"
+  | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+  | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+  | \#[^\n]*
+  | \\\r?\n
+  | \n
+""", re.VERBOSE | re.DOTALL)
+
+LINE_HEAD = re.compile(r"([ \t\f]*)(\w*)")
+
+FUNCTION_NAME = re.compile(r"(?:async\s+)?def\s+(\w+)")
+
+# Statements binding names the extraction uses, wherever they are
+BINDING_KEYWORDS = frozenset(("class", "import", "from"))
+
+# Compound statements, whose body may start on the header line
+COMPOUND_KEYWORDS = frozenset((
+    "class", "def", "async", "if", "elif", "else", "try", "except", "finally", "for", "while", "with",
+    "match", "case",
+))
+
+# Clauses continuing the compound statement of the previous block at the same indentation
+CLAUSE_KEYWORDS = frozenset(("elif", "else", "except", "finally"))
+
+
+class _Block:
+    """
+    An open block of the scanned source.
+
+    Attributes:
+    - column (int): Indentation of the block header.
+    - header (str): The header line, with its indentation.
+    - written (bool): Whether the header is written to the skeleton.
+    - scope (str or None): "class" or "def" for the innermost class or function containing the block body.
+    - keeps_body (bool): Whether every line of the body is kept, for class and `__init__` bodies.
+    - clauses (tuple): The previous clauses of the same compound statement, e.g. the `try` of an `except`.
+    """
+
+    __slots__ = ("column", "header", "written", "scope", "keeps_body", "clauses")
+
+    def __init__(self, column: int, header: str, written: bool, scope: Optional[str], keeps_body: bool,
+                 clauses: Tuple["_Block", ...]) -> None:
+        self.column = column
+        self.header = header
+        self.written = written
+        self.scope = scope
+        self.keeps_body = keeps_body
+        self.clauses = clauses
+
+
+class OutlineScanner:
+    """
+    Builds the skeleton of a module one logical line at a time, see `outline_source`.
+
+    Attributes:
+    - lines (list): The skeleton, as a list of strings.
+    - blocks (list): The open blocks, innermost last.
+    - pending_block (bool): Whether the last written line opened a block which has no statement yet.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.blocks: List[_Block] = []
+        self.pending_block = False
+
+    def scan_line(self, code: str, has_semicolon: bool) -> bool:
+        """
+        Decides whether to keep a logical line, and follows the blocks it closes and opens.
+
+        Args:
+        - code (str): The logical line, with its indentation but without its trailing comment and line break.
+        - has_semicolon (bool): Whether the line has a semicolon outside its strings and comments.
+
+        Returns:
+        - bool: False if the scanner cannot be sure of the outline.
+        """
+        head = LINE_HEAD.match(code)
+        indentation, word = head.group(1), head.group(2)
+        # Like the tokenizer, tabs advance to the next multiple of 8 and form feeds reset the column
+        indentation = indentation.rpartition("\f")[2]
+        column = len(indentation.expandtabs(8)) if "\t" in indentation else len(indentation)
+
+        blocks = self.blocks
+        if self.pending_block and column <= blocks[-1].column:
+            return False  # A block without a body
+        closed = None
+        while blocks and blocks[-1].column >= column:
+            closed = blocks.pop()
+
+        parent = blocks[-1] if blocks else None
+        opens_block = code.endswith(":")
+        clauses = ()
+        if parent is not None and parent.keeps_body:
+            keep = True
+        elif opens_block:
+            if word in CLAUSE_KEYWORDS and closed is not None and closed.column == column:
+                # A written statement must be written whole, and a clause cannot be written alone
+                keep = closed.written
+                clauses = closed.clauses + (closed,)
+            else:
+                keep = word == "class"
+        else:
+            keep = word in BINDING_KEYWORDS or ((has_semicolon or word in COMPOUND_KEYWORDS)
+                                                and ("import" in code or "class" in code))
+
+        if keep:
+            self._write_blocks(clauses)
+            self.lines.append(code)
+            self.lines.append("\n")
+            self.pending_block = opens_block
+        elif self.pending_block:
+            self.lines.append(f"{indentation}pass\n")  # The first statement of the block is dropped
+            self.pending_block = False
+
+        if opens_block:
+            parent_scope = parent.scope if parent is not None else None
+            parent_keeps_body = parent is not None and parent.keeps_body
+            if word == "class":
+                scope, keeps_body = "class", True
+            elif word in ("def", "async") and (function := FUNCTION_NAME.match(code, len(head.group(1)))):
+                # Only the attributes assigned in the body of `__init__` are collected, not in nested functions
+                scope, keeps_body = "def", function.group(1) == "__init__" and parent_scope == "class"
+            else:
+                scope, keeps_body = parent_scope, parent_keeps_body
+            blocks.append(_Block(column, code, keep, scope, keeps_body, clauses))
+        return True
+
+    def _write_blocks(self, clauses: Tuple[_Block, ...]) -> None:
+        """
+        Writes the headers of the open blocks which are not written yet, outermost first, and the previous
+        clauses of the line about to be written.
+
+        A previous clause is written with a `pass` body, since the statements of its body are dropped.
+        """
+        for block in self.blocks:
+            if not block.written:
+                self._write_clauses(block.clauses)
+                self.lines.append(block.header)
+                self.lines.append("\n")
+                block.written = True
+        self._write_clauses(clauses)
+
+    def _write_clauses(self, clauses: Tuple[_Block, ...]) -> None:
+        for clause in clauses:
+            if not clause.written:
+                self.lines.append(clause.header)
+                self.lines.append(" pass\n")
+                clause.written = True
+
+    def skeleton(self) -> Optional[str]:
+        """
+        Returns the skeleton of the scanned lines, or None if the last written block has no body.
+        """
+        return None if self.pending_block else "".join(self.lines)
+
+
+def outline_source(source: str) -> Optional[str]:
+    """
+    Reduces a module to the statements class extraction can see.
+
+    Args:
+    - source (str): The decoded source code.
+
+    Returns:
+    - str or None: The skeleton of the module, or None if the scanner cannot be sure of it.
+    """
+    if source.count("\r") != source.count("\r\n"):
+        return None  # Lone carriage returns end lines, but the scanner does not split lines on them
+
+    scanner = OutlineScanner()
+    line_start = position = depth = 0
+    comment_start = -1
+    has_semicolon = False
+
+    for match in LINE_TOKEN.finditer(source):
+        start = match.start()
+        if start > position:
+            segment = source[position:start]
+            if depth or "(" in segment or "[" in segment or "{" in segment:
+                depth += segment.count("(") + segment.count("[") + segment.count("{") \
+                    - segment.count(")") - segment.count("]") - segment.count("}")
+            if ";" in segment:
+                has_semicolon = True
+        position = match.end()
+        character = source[start]
+        if character == "#":
+            comment_start = start
+            continue
+        if character != "\n" or depth > 0:
+            comment_start = -1
+            continue
+
+        code = source[line_start:comment_start if comment_start >= 0 else start].rstrip()
+        if code.strip() and not scanner.scan_line(code, has_semicolon):
+            return None
+        line_start = position
+        comment_start = -1
+        has_semicolon = False
+
+    if line_start < len(source):
+        segment = source[position:]
+        if depth + segment.count("(") + segment.count("[") + segment.count("{") \
+                - segment.count(")") - segment.count("]") - segment.count("}"):
+            return None
+        code = source[line_start:comment_start if comment_start >= 0 else len(source)].rstrip()
+        if code.strip() and not scanner.scan_line(code, has_semicolon or ";" in segment):
+            return None
+    return scanner.skeleton()
+
+
+def parse_outline(source: str, file_path: str = "<unknown>") -> ast.Module:
+    """
+    Parses the outline of a module, or the whole module when the outline cannot be trusted.
+
+    Args:
+    - source (str): The decoded source code.
+    - file_path (str, optional): Path reported in error messages.
+
+    Returns:
+    - ast.Module: A tree from which class extraction gives the same result as from the whole module.
+
+    Raises:
+    - SyntaxError: If the whole module is parsed and is not valid Python.
+    """
+    skeleton = outline_source(source)
+    if skeleton is not None:
+        try:
+            return ast.parse(skeleton, filename=file_path)
+        except SyntaxError:
+            pass  # The scanner misread the source, or the source is invalid: the full parse tells which
+    return ast.parse(source, filename=file_path)
@@ -0,0 +1,165 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+# Number of chunks handed to each worker; several per worker keeps the load balanced
+# when file sizes vary, while still amortizing the inter-process round trips.
+CHUNKS_PER_WORKER = 4
+
+# Chunk size used when the number of items is not known in advance.
+DEFAULT_CHUNKSIZE = 16
+
+# Results a prefetching thread may have ready ahead of the consumer; bounds the memory held by prefetched data.
+PREFETCH_DEPTH_PER_THREAD = 2
+
+
+def resolve_worker_count(workers: Optional[int]) -> int:
+    """
+    Resolves the number of worker processes to use.
+
+    Args:
+    - workers (int, optional): Requested number of workers. None or values below 1 mean one per CPU core.
+
+    Returns:
+    - int: The number of worker processes.
+    """
+    if workers is None or workers < 1:
+        return os.cpu_count() or 1
+    return workers
+
+
+def compute_chunksize(task_count: int, workers: int) -> int:
+    """
+    Computes how many tasks are sent to a worker at once.
+
+    Args:
+    - task_count (int): Total number of tasks.
+    - workers (int): Number of worker processes.
+
+    Returns:
+    - int: The chunk size, at least 1.
+    """
+    return max(1, task_count // (workers * CHUNKS_PER_WORKER))
+
+
+def _apply_to_chunk(function: Callable, chunk: List, args: tuple) -> List:
+    """
+    Applies a function to every item of a chunk inside a worker process.
+
+    Args:
+    - function (Callable): Function called as `function(item, *args)`.
+    - chunk (list): Items to process.
+    - args (tuple): Extra arguments passed unchanged to every call.
+
+    Returns:
+    - list: The results, in the same order as the chunk.
+    """
+    return [function(item, *args) for item in chunk]
+
+
+def imap_in_processes(function: Callable, items: Iterable, workers: Optional[int], *args,
+                      chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator:
+    """
+    Lazily applies a function to every item across a pool of processes, yielding results in input order.
+
+    Items are consumed as chunks are scheduled, and at most CHUNKS_PER_WORKER chunks per worker are
+    in flight at once, so memory stays bounded even for unbounded inputs or slow consumers.
+
+    The function must be defined at module level so it can be pickled, and should return
+    plain data (dictionaries, tuples, dataclasses) rather than AST objects to keep transfers cheap.
+
+    Args:
+    - function (Callable): Function called as `function(item, *args)`.
+    - items (Iterable): Items to process.
+    - workers (int, optional): Number of worker processes, see resolve_worker_count. With one
+      worker, items are processed in the calling process.
+    - *args: Extra arguments passed unchanged to every call.
+    - chunksize (int, optional): Number of items sent to a worker at once.
+
+    Yields:
+    - The result of each item, in the same order as the items.
+    """
+    workers = resolve_worker_count(workers)
+    if workers == 1:
+        for item in items:
+            yield function(item, *args)
+        return
+
+    iterator = iter(items)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit_next_chunk() -> None:
+            chunk = list(islice(iterator, chunksize))
+            if chunk:
+                pending.append(executor.submit(_apply_to_chunk, function, chunk, args))
+
+        for _ in range(workers * CHUNKS_PER_WORKER):
+            submit_next_chunk()
+
+        while pending:
+            results = pending.popleft().result()
+            submit_next_chunk()
+            yield from results
+
+
+def imap_prefetched(function: Callable, items: Iterable, threads: int, *args, max_pending: int = None) -> Iterator:
+    """
+    Lazily applies an I/O bound function to upcoming items in a pool of threads while the caller consumes
+    the results of earlier items, yielding results in input order.
+
+    Meant for reading files ahead of a CPU bound consumer: the threads wait on storage while the consumer
+    parses. Items are drawn from the input only as results are consumed, and at most `max_pending` results
+    are in flight or ready at once, so a slow consumer never makes the prefetched data grow without bound.
+
+    Args:
+    - function (Callable): Function called as `function(item, *args)` in a worker thread.
+    - items (Iterable): Items to process, possibly a lazy walk.
+    - threads (int): Number of threads. Below 1, the function is called in the calling thread.
+    - *args: Extra arguments passed unchanged to every call.
+    - max_pending (int, optional): Maximum number of results in flight or waiting to be consumed.
+      Defaults to PREFETCH_DEPTH_PER_THREAD per thread.
+
+    Yields:
+    - The result of each item, in the same order as the items.
+    """
+    if threads < 1:
+        for item in items:
+            yield function(item, *args)
+        return
+
+    max_pending = max_pending or threads * PREFETCH_DEPTH_PER_THREAD
+    iterator = iter(items)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="prefetch") as executor:
+        try:
+            for item in islice(iterator, max_pending):
+                pending.append(executor.submit(function, item, *args))
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(iterator, 1):
+                    pending.append(executor.submit(function, item, *args))
+                yield result
+        finally:
+            for future in pending:  # The consumer stopped early or a call failed
+                future.cancel()
+
+
+def map_in_processes(function: Callable, items: Iterable, workers: Optional[int], *args) -> List:
+    """
+    Applies a function to every item across a pool of processes, preserving the input order.
+
+    Args:
+    - function (Callable): Function called as `function(item, *args)`.
+    - items (Iterable): Items to process.
+    - workers (int, optional): Number of worker processes, see resolve_worker_count.
+    - *args: Extra arguments passed unchanged to every call.
+
+    Returns:
+    - list: The results, in the same order as the items.
+    """
+    items = list(items)
+    workers = min(resolve_worker_count(workers), max(1, len(items)))
+    chunksize = compute_chunksize(len(items), workers)
+    return list(imap_in_processes(function, items, workers, *args, chunksize=chunksize))
@@ -1,9 +1,42 @@
-from typing import Any, Tuple
+import hashlib
+import sys
+from dataclasses import replace
+from enum import Enum
+from typing import Any, Optional, Tuple
 from dataclasses import dataclass
 from py_class_extractor.file_management import SerializableToDict
 
 
-@dataclass
+class Encapsulation(str, Enum):
+    """
+    Encapsulation level of a class member. Members are singletons, so every record shares them.
+    """
+
+    PUBLIC = "Public"
+    PRIVATE = "Private"
+
+
+class RelationshipType(str, Enum):
+    """
+    Type of a UML relationship. Members are singletons, so every record shares them.
+    """
+
+    INHERITANCE = "inheritance"
+
+
+class CallKind(str, Enum):
+    """
+    Kind of a call made by a method. Members are singletons, so every record shares them.
+    """
+
+    SELF = "self"                # self.method(), the callee is a method of the same class
+    SUPER = "super"              # super().method(), the callee is a method of a base class
+    ATTRIBUTE = "attribute"      # self.attribute.method(), the callee is a method of an attribute
+    FUNCTION = "function"        # function() or module.function()
+    CONSTRUCTOR = "constructor"  # Class(), for a class defined in the same module
+
+
+@dataclass(frozen=True, slots=True)
 class AttributeInformation:
     """
     Data class to store information about a attribute.
@@ -11,48 +44,165 @@ class AttributeInformation:
 
     name: str
     data_type: str
-    encapsulation: str
+    encapsulation: Encapsulation
 
+    def to_dictionary(self) -> dict:
+        """
+        Converts the AttributeInformation object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the attribute information.
+        """
+        return {"name": self.name, "data_type": self.data_type, "encapsulation": self.encapsulation.value}
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "AttributeInformation":
+        """
+        Rebuilds an AttributeInformation object from the dictionary produced by `to_dictionary`.
 
-@dataclass
+        Args:
+        - data (dict): Dictionary representation of the attribute.
+
+        Returns:
+        - AttributeInformation: The rebuilt attribute information.
+        """
+        return cls(
+            name=sys.intern(data["name"]), data_type=data["data_type"],
+            encapsulation=Encapsulation(data["encapsulation"])
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class FunctionInformation:
     """
     Data class to store information about a function.
     """
 
     name: str
-    args: Tuple[str]
+    args: Tuple[str, ...]
     return_value: Any
-    encapsulation: str
+    encapsulation: Encapsulation
 
+    def to_dictionary(self) -> dict:
+        """
+        Converts the FunctionInformation object into a dictionary representation suitable for JSON serialization.
 
-@dataclass
+        Returns:
+        - dict: A dictionary containing the function information.
+        """
+        return {
+            "name": self.name,
+            "args": self.args,
+            "return_value": self.return_value,
+            "encapsulation": self.encapsulation.value,
+        }
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "FunctionInformation":
+        """
+        Rebuilds a FunctionInformation object from the dictionary produced by `to_dictionary`.
+
+        Args:
+        - data (dict): Dictionary representation of the function.
+
+        Returns:
+        - FunctionInformation: The rebuilt function information.
+        """
+        return cls(
+            name=sys.intern(data["name"]), args=tuple(sys.intern(arg) for arg in data["args"]),
+            return_value=data["return_value"], encapsulation=Encapsulation(data["encapsulation"])
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class RelationshipInformation:
     """
     Data class to store information about a UML relationship.
+
+    Attributes:
+    - type (RelationshipType): The type of the relationship.
+    - related (str): The related class as written in the source, with import aliases expanded.
+    - target (str or None): Fully qualified name of the related class, or None if it could not be determined.
     """
-    type: str
+    type: RelationshipType
     related: str
+    target: Optional[str] = None
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the RelationshipInformation object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the relationship information.
+        """
+        return {"type": self.type.value, "related": self.related, "target": self.target}
 
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "RelationshipInformation":
+        """
+        Rebuilds a RelationshipInformation object from the dictionary produced by `to_dictionary`.
+
+        Args:
+        - data (dict): Dictionary representation of the relationship.
 
-@dataclass
+        Returns:
+        - RelationshipInformation: The rebuilt relationship information.
+        """
+        return cls(type=RelationshipType(data["type"]), related=data["related"], target=data.get("target"))
+
+
+@dataclass(frozen=True, slots=True)
 class ClassInformation(SerializableToDict):
     """
     Data class to store information about a class.
 
+    Instances are immutable; use `dataclasses.replace` to derive a modified copy.
+
     Attributes:
     - modules (Tuple[str]): Tuple of module names where the class is defined.
     - name (str): The name of the class.
     - relationships (Tuple[RelationshipInformation]): Tuple of RelationshipInformation objects representing relationships with other classes.
     - attributes (Tuple[AttributeInformation]): Tuple of AttributeInformation objects representing attributes of the class.
     - methods (Tuple[FunctionInformation]): Tuple of FunctionInformation objects representing methods of the class.
+    - qualified_name (str or None): Fully qualified name of the class, including its module and enclosing scopes.
+    - fingerprint (str or None): Structural fingerprint of the class, see `compute_fingerprint`. Set during
+      extraction; None for instances built by hand.
     """
 
-    modules: Tuple[str]
+    modules: Tuple[str, ...]
     name: str
-    relationships: Tuple[RelationshipInformation]
-    attributes: Tuple[AttributeInformation]
-    methods: Tuple[FunctionInformation]
+    relationships: Tuple[RelationshipInformation, ...]
+    attributes: Tuple[AttributeInformation, ...]
+    methods: Tuple[FunctionInformation, ...]
+    qualified_name: Optional[str] = None
+    fingerprint: Optional[str] = None
+
+    def compute_fingerprint(self) -> str:
+        """
+        Computes a stable digest of everything the class exposes: its names, bases and members, in order.
+
+        Two classes have the same fingerprint exactly when their dictionaries, fingerprint aside, are equal,
+        so comparing fingerprints is enough to tell that a class did not change between two snapshots.
+
+        Returns:
+        - str: The hex digest.
+        """
+        structure = (
+            tuple(self.modules), self.name, self.qualified_name,
+            tuple((relationship.type.value, relationship.related, relationship.target)
+                  for relationship in self.relationships),
+            tuple((attribute.name, attribute.data_type, attribute.encapsulation.value)
+                  for attribute in self.attributes),
+            tuple((method.name, tuple(method.args), method.return_value, method.encapsulation.value)
+                  for method in self.methods),
+        )
+        return hashlib.blake2b(repr(structure).encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+    def with_fingerprint(self) -> "ClassInformation":
+        """
+        Returns a copy of the class with its fingerprint computed from its current content.
+        """
+        return replace(self, fingerprint=self.compute_fingerprint())
 
     def to_dictionary(self) -> dict:
         """
@@ -62,16 +212,145 @@ class ClassInformation(SerializableToDict):
         - dict: A dictionary containing the class information.
             {
                 "modules": Tuple[str],                      # Tuple of module names where the class is defined.
+                "qualified_name": str,                     # Fully qualified name of the class.
                 "class_name": str,                         # The name of the class.
                 "relationships": Tuple[dict],              # Tuple of dictionaries representing relationships (RelationshipInformation objects).
                 "attributes": Tuple[dict],                 # Tuple of dictionaries representing attributes (AttributeInformation objects).
-                "methods": Tuple[dict]                     # Tuple of dictionaries representing methods (FunctionInformation objects).
+                "methods": Tuple[dict],                    # Tuple of dictionaries representing methods (FunctionInformation objects).
+                "fingerprint": str                         # Structural fingerprint of the class.
             }
         """
         return {
             "name": self.name,
             "modules": tuple(self.modules),
-            "relationships": tuple(relationship.__dict__ for relationship in self.relationships),
-            "attributes": tuple(attribute.__dict__ for attribute in self.attributes),
-            "methods": tuple(method.__dict__ for method in self.methods),
+            "qualified_name": self.qualified_name,
+            "relationships": tuple(relationship.to_dictionary() for relationship in self.relationships),
+            "attributes": tuple(attribute.to_dictionary() for attribute in self.attributes),
+            "methods": tuple(method.to_dictionary() for method in self.methods),
+            "fingerprint": self.fingerprint,
         }
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "ClassInformation":
+        """
+        Rebuilds a ClassInformation object from the dictionary produced by `to_dictionary`.
+
+        Args:
+        - data (dict): Dictionary representation of the class, as returned by `to_dictionary`.
+
+        Returns:
+        - ClassInformation: The rebuilt class information.
+        """
+        return cls(
+            modules=tuple(sys.intern(module) for module in data["modules"]),
+            name=sys.intern(data["name"]),
+            relationships=tuple(RelationshipInformation.from_dictionary(relationship) for relationship in data["relationships"]),
+            attributes=tuple(AttributeInformation.from_dictionary(attribute) for attribute in data["attributes"]),
+            methods=tuple(FunctionInformation.from_dictionary(method) for method in data["methods"]),
+            qualified_name=data.get("qualified_name"),
+            fingerprint=data.get("fingerprint"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CallInformation:
+    """
+    Data class to store an edge of the call graph: a call made in the body of a method.
+
+    Attributes:
+    - caller (str): Fully qualified name of the calling method.
+    - callee (str): The called object. Fully qualified for self, constructor and qualified function calls;
+      `<attribute>.<method>` for attribute calls, the method name for super calls, and the name as written
+      for functions that could not be qualified.
+    - kind (CallKind): The kind of call.
+    """
+    caller: str
+    callee: str
+    kind: CallKind
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the CallInformation object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the call information.
+        """
+        return {"caller": self.caller, "callee": self.callee, "kind": self.kind.value}
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "CallInformation":
+        """
+        Rebuilds a CallInformation object from the dictionary produced by `to_dictionary`.
+
+        Args:
+        - data (dict): Dictionary representation of the call.
+
+        Returns:
+        - CallInformation: The rebuilt call information.
+        """
+        return cls(caller=sys.intern(data["caller"]), callee=data["callee"], kind=CallKind(data["kind"]))
+
+
+@dataclass(frozen=True, slots=True)
+class ModuleInformation(SerializableToDict):
+    """
+    Data class to store information about a module and the classes it defines.
+
+    Attributes:
+    - name (str): Fully qualified name of the module.
+    - modules (Tuple[str]): Tuple of module names of the module, as used by its classes.
+    - classes (Tuple[ClassInformation]): Classes defined in the module, in definition order.
+    - imports (Tuple[Tuple[str, str]] or None): Module level import bindings, as (bound name, fully qualified target)
+      pairs. None when the module was skipped by the prefilter: it defines no class, but its imports were not collected.
+    - star_imports (Tuple[str] or None): Modules imported with `from <module> import *` at module level, None
+      when the imports were not collected.
+    - calls (Tuple[CallInformation] or None): Calls made by the methods of the classes, in source order and
+      without duplicates. None when the call graph was not collected.
+    """
+
+    name: str
+    modules: Tuple[str, ...]
+    classes: Tuple[ClassInformation, ...]
+    imports: Optional[Tuple[Tuple[str, str], ...]] = ()
+    star_imports: Optional[Tuple[str, ...]] = ()
+    calls: Optional[Tuple[CallInformation, ...]] = None
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the ModuleInformation object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the module information.
+        """
+        return {
+            "name": self.name,
+            "modules": tuple(self.modules),
+            "classes": tuple(class_info.to_dictionary() for class_info in self.classes),
+            "imports": None if self.imports is None else tuple(self.imports),
+            "star_imports": None if self.star_imports is None else tuple(self.star_imports),
+            "calls": None if self.calls is None else tuple(call.to_dictionary() for call in self.calls),
+        }
+
+    @classmethod
+    def from_dictionary(cls, data: dict) -> "ModuleInformation":
+        """
+        Rebuilds a ModuleInformation object from the dictionary produced by `to_dictionary`.
+
+        Args:
+        - data (dict): Dictionary representation of the module.
+
+        Returns:
+        - ModuleInformation: The rebuilt module information.
+        """
+        return cls(
+            name=sys.intern(data["name"]),
+            modules=tuple(sys.intern(module) for module in data["modules"]),
+            classes=tuple(ClassInformation.from_dictionary(class_dict) for class_dict in data["classes"]),
+            imports=None if data["imports"] is None else tuple(
+                (sys.intern(name), target) for name, target in data["imports"]
+            ),
+            star_imports=None if data["star_imports"] is None else tuple(data["star_imports"]),
+            calls=None if data.get("calls") is None else tuple(
+                CallInformation.from_dictionary(call) for call in data["calls"]
+            ),
+        )
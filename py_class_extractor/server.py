@@ -0,0 +1,460 @@
+"""
+Long-running analysis server keeping parsed results and indexes warm in memory.
+
+Every process started by an editor integration or a hook pays for the interpreter, the import of the
+analyzer and a full parse. The server pays them once: analyzed files are kept with their size and
+modification time, directories are kept by a `DirectoryWatcher` which only analyzes the files that changed
+since the last request, and responses are assembled from records encoded once, so a repeated request costs
+a walk of the directory and a copy of the encoded response.
+
+Requests and responses follow JSON-RPC 2.0, one object per line over a Unix socket, see
+`py_class_extractor.client`. Methods:
+    analyze_file(path)             The dictionary of each class of a Python file.
+    analyze_directory(path)        The dictionary of each class of a directory, resolved across it.
+    query_class(name, path=None)   The classes with a qualified or short name, among the warm directories.
+    ping()                         The number of warm files and directories.
+    shutdown()                     Stops the server.
+
+Usage:
+    python -m py_class_extractor.server [--socket PATH] [--encoding-fallback]
+"""
+import argparse
+import inspect
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import py_class_extractor
+from py_class_extractor import file_management
+from py_class_extractor.batch import FileError
+from py_class_extractor.class_index import ClassIndex
+from py_class_extractor.client import DEFAULT_SOCKET_PATH
+from py_class_extractor.watch import DirectoryWatcher
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+ANALYSIS_ERROR = -32000
+
+
+class RequestError(Exception):
+    """
+    Raised by a method to answer its request with a JSON-RPC error.
+    """
+
+    def __init__(self, code: int, message: str, data=None) -> None:
+        """
+        Initializes an instance of RequestError.
+
+        Args:
+        - code (int): JSON-RPC error code.
+        - message (str): Description of the error.
+        - data (optional): JSON-serializable details sent along with the error.
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class AnalysisService:
+    """
+    Answers the requests of the analysis server and holds its warm state.
+
+    Methods are serialized by a lock, so the service can be shared by the threads of the server.
+
+    Attributes:
+    - encoding_fallback (bool): Guess the encoding with chardet when the declared one fails.
+    - files (dict): (modification time in nanoseconds, size) and encoded response of every analyzed file,
+      keyed by absolute path.
+    - directories (dict): The watcher of every analyzed directory, keyed by absolute path.
+    """
+
+    def __init__(self, encoding_fallback: bool = False) -> None:
+        """
+        Initializes an instance of AnalysisService, with no warm state.
+
+        Args:
+        - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        """
+        self.encoding_fallback = encoding_fallback
+        self.files: Dict[str, Tuple[Tuple[int, int], str]] = dict()
+        self.directories: Dict[str, DirectoryWatcher] = dict()
+        self._responses: Dict[str, str] = dict()
+        self._indexes: Dict[str, ClassIndex] = dict()
+        self._lock = threading.Lock()
+        self.methods = {
+            "analyze_file": self.analyze_file,
+            "analyze_directory": self.analyze_directory,
+            "query_class": self.query_class,
+            "ping": self.ping,
+        }
+
+    def handle(self, line: bytes) -> Optional[str]:
+        """
+        Answers a request.
+
+        Args:
+        - line (bytes): The encoded request.
+
+        Returns:
+        - str or None: The encoded response, or None for a notification, which has no id.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            return _error_response(None, RequestError(PARSE_ERROR, f"Invalid JSON: {error}"))
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, RequestError(INVALID_REQUEST, "Expected a JSON-RPC request object"))
+
+        request_id = request.get("id")
+        params = request.get("params", {})
+        try:
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise RequestError(METHOD_NOT_FOUND, f"Unknown method '{request['method']}'")
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "Parameters must be given by name")
+            try:
+                inspect.signature(method).bind(**params)
+            except TypeError as error:
+                raise RequestError(INVALID_PARAMS, str(error)) from None
+            with self._lock:
+                result = method(**params)
+        except RequestError as error:
+            return None if "id" not in request else _error_response(request_id, error)
+        except Exception as error:  # Keep serving the other requests
+            error = RequestError(INTERNAL_ERROR, f"{type(error).__name__}: {error}")
+            return None if "id" not in request else _error_response(request_id, error)
+
+        if "id" not in request:
+            return None
+        # Results are already encoded, so warm responses are assembled without encoding the classes again
+        return f'{{"jsonrpc":"2.0","id":{json.dumps(request_id)},"result":{result}}}'
+
+    def analyze_file(self, path: str) -> str:
+        """
+        Analyzes a Python file, reusing the previous response while its size and modification time are unchanged.
+
+        Args:
+        - path (str): Absolute path of the file.
+
+        Returns:
+        - str: The encoded array of the dictionary of each class of the file.
+
+        Raises:
+        - RequestError: If the path is invalid, or the file cannot be analyzed.
+        """
+        path = _absolute_path(path, os.path.isfile, "file")
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            entry = self.files.get(path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            classes = py_class_extractor.generate_classes_dicts_from_file(
+                path, encoding_fallback=self.encoding_fallback
+            )
+        except (SyntaxError, UnicodeDecodeError, ValueError, OSError) as error:
+            self.files.pop(path, None)
+            raise _analysis_error(path, error) from None
+        response = _encode_array(map(file_management.encode_ndjson_record, classes))
+        self.files[path] = (signature, response)
+        return response
+
+    def analyze_directory(self, path: str) -> str:
+        """
+        Analyzes a directory, only analyzing again the files changed since the previous request.
+
+        Args:
+        - path (str): Absolute path of the directory.
+
+        Returns:
+        - str: The encoded array of the dictionary of each class of the directory, resolved across it.
+
+        Raises:
+        - RequestError: If the path is not an absolute path to a directory.
+        """
+        path = _absolute_path(path, os.path.isdir, "directory")
+        watcher = self._refresh(path)
+        response = self._responses.get(path)
+        if response is None:
+            response = self._responses[path] = _encode_array(watcher.iter_encoded_records())
+        return response
+
+    def query_class(self, name: str, path: str = None) -> str:
+        """
+        Looks classes up by qualified or short name, see `ClassIndex.get` and `ClassIndex.find`.
+
+        Args:
+        - name (str): Qualified or short name of the class.
+        - path (str, optional): Absolute path of the directory to search, brought up to date first. By default,
+          every directory analyzed so far is searched as it was last analyzed.
+
+        Returns:
+        - str: The encoded array of the dictionary of each matching class.
+
+        Raises:
+        - RequestError: If the path is not an absolute path to a directory.
+        """
+        if path is not None:
+            path = _absolute_path(path, os.path.isdir, "directory")
+            self._refresh(path)
+            directories = [path]
+        else:
+            directories = list(self.directories)
+
+        classes = []
+        for directory in directories:
+            index = self._indexes.get(directory)
+            if index is None:
+                index = self._indexes[directory] = ClassIndex(self.directories[directory].iter_classes())
+            class_info = index.get(name)
+            classes.extend([class_info] if class_info is not None else index.find(name))
+        return _encode_array(map(file_management.encode_ndjson_record, classes))
+
+    def ping(self) -> str:
+        """
+        Reports the warm state of the service, e.g. to check that the server is up.
+
+        Returns:
+        - str: The encoded object holding the number of warm files and directories.
+        """
+        return json.dumps({"files": len(self.files), "directories": len(self.directories)})
+
+    def _refresh(self, path: str) -> DirectoryWatcher:
+        """
+        Brings the watcher of a directory up to date, creating it on the first request.
+
+        Files that fail to parse are left out of the results until they are fixed, as in `watch`.
+
+        Args:
+        - path (str): Absolute path of the directory.
+
+        Returns:
+        - DirectoryWatcher: The up to date watcher of the directory.
+        """
+        watcher = self.directories.get(path)
+        if watcher is None:
+            watcher = self.directories[path] = DirectoryWatcher(
+                path, output_format="ndjson", encoding_fallback=self.encoding_fallback
+            )
+        if watcher.refresh():
+            self._responses.pop(path, None)
+            self._indexes.pop(path, None)
+        return watcher
+
+
+def _absolute_path(path, exists, kind: str) -> str:
+    """
+    Validates the path parameter of a request.
+
+    Args:
+    - path: The parameter.
+    - exists (Callable): Tells whether the path exists with the expected kind, e.g. `os.path.isfile`.
+    - kind (str): The expected kind, named in the error message.
+
+    Returns:
+    - str: The normalized path.
+
+    Raises:
+    - RequestError: If the path is not a string, is relative, or does not exist with the expected kind.
+    """
+    if not isinstance(path, str):
+        raise RequestError(INVALID_PARAMS, "'path' must be a string")
+    if not os.path.isabs(path):
+        raise RequestError(INVALID_PARAMS, f"'{path}' is not absolute; the server runs in another directory")
+    if not exists(path):
+        raise RequestError(INVALID_PARAMS, f"'{path}' is not a {kind}")
+    return os.path.normpath(path)
+
+
+def _analysis_error(path: str, error: BaseException) -> RequestError:
+    """
+    Builds the error answering a request for a file that cannot be analyzed.
+
+    Args:
+    - path (str): Path of the file.
+    - error (BaseException): The exception raised while analyzing it.
+
+    Returns:
+    - RequestError: The error, carrying the classified FileError as data.
+    """
+    file_error = FileError.from_exception(path, error)
+    return RequestError(ANALYSIS_ERROR, f"{file_error.category}: {file_error.message}", file_error.to_dictionary())
+
+
+def _encode_array(encoded_records) -> str:
+    """
+    Joins records already encoded as JSON into a JSON array.
+
+    Args:
+    - encoded_records (Iterable[str]): The encoded records.
+
+    Returns:
+    - str: The encoded array.
+    """
+    return "[" + ",".join(encoded_records) + "]"
+
+
+def _error_response(request_id, error: RequestError) -> str:
+    """
+    Encodes the JSON-RPC response answering a request with an error.
+
+    Args:
+    - request_id: The id of the request, None when it could not be read.
+    - error (RequestError): The error.
+
+    Returns:
+    - str: The encoded response.
+    """
+    body = {"code": error.code, "message": error.message}
+    if error.data is not None:
+        body["data"] = error.data
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "error": body}, ensure_ascii=False)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Answers the requests of a connection, one JSON-RPC object per line, until the client closes it.
+    """
+
+    def handle(self) -> None:
+        """
+        Answers every request read from the connection, and stops the server on a shutdown request.
+        """
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            if _is_shutdown(line):
+                self._send(json.dumps({"jsonrpc": "2.0", "id": json.loads(line).get("id"), "result": None}))
+                # shutdown() waits for serve_forever() to return, so it cannot run on a request thread
+                threading.Thread(target=self.server.shutdown).start()
+                return
+            response = self.server.service.handle(line)
+            if response is not None:
+                self._send(response)
+
+    def _send(self, response: str) -> None:
+        """
+        Writes a response to the connection, on its own line.
+
+        Args:
+        - response (str): The encoded response.
+        """
+        self.wfile.write(response.encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+def _is_shutdown(line: bytes) -> bool:
+    """
+    Tells whether a request asks the server to stop; the server, rather than the service, answers those.
+
+    Args:
+    - line (bytes): The encoded request.
+
+    Returns:
+    - bool: True for a readable request of the "shutdown" method.
+    """
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get("method") == "shutdown"
+
+
+class AnalysisServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server answering each connection on its own thread with a shared `AnalysisService`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, service: AnalysisService = None) -> None:
+        """
+        Initializes an instance of AnalysisServer and binds its socket, readable by the current user only.
+
+        Args:
+        - socket_path (str, optional): Path of the socket.
+        - service (AnalysisService, optional): The service answering requests.
+
+        Raises:
+        - OSError: If another server already listens on the socket.
+        """
+        _remove_stale_socket(socket_path)
+        self.service = service or AnalysisService()
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self) -> None:
+        """
+        Closes the server socket and removes its file.
+        """
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Removes the socket left by a server that did not exit cleanly.
+
+    Args:
+    - socket_path (str): Path of the socket.
+
+    Raises:
+    - OSError: If a server still listens on the socket.
+    """
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+    else:
+        raise OSError(f"An analysis server already listens on '{socket_path}'")
+    finally:
+        probe.close()
+
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH, encoding_fallback: bool = False) -> None:
+    """
+    Runs the analysis server until it receives a shutdown request or is interrupted.
+
+    Args:
+    - socket_path (str, optional): Path of the socket.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    """
+    with AnalysisServer(socket_path, AnalysisService(encoding_fallback)) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Path of the socket to listen on")
+    parser.add_argument("--encoding-fallback", action="store_true", help="Guess undeclared encodings with chardet")
+    arguments = parser.parse_args()
+    print(f"Listening on {arguments.socket}", flush=True)
+    start = time.perf_counter()
+    serve(arguments.socket, arguments.encoding_fallback)
+    print(f"Stopped after {time.perf_counter() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
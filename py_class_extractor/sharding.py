@@ -0,0 +1,239 @@
+"""
+Splits the scan of a large tree across several machines or CI jobs, then merges their partial outputs.
+
+Every job walks the whole tree but analyzes only the files of its shard, chosen by a stable hash of their
+path relative to the scanned directory, and writes the module metadata of those files to a partial file.
+The merge puts the modules of every shard back in walk order, which sorts the entries of every directory
+by name, and only then resolves relationships across the corpus, so its output is byte-identical to the
+output of a single run over the whole tree. Jobs may run on checkouts at different paths.
+
+Usage:
+    python -m py_class_extractor.sharding run <path> --shard 0/4 --output part0.ndjson
+    python -m py_class_extractor.sharding merge part0.ndjson part1.ndjson ... --output classes.json
+"""
+import argparse
+import hashlib
+import json
+import os
+from typing import Iterable, Iterator, List, Tuple
+
+import py_class_extractor
+from py_class_extractor import cache as result_cache
+from py_class_extractor import file_management, utils
+from py_class_extractor.schemas import ModuleInformation
+
+SHARD_FORMAT = 2
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parses a shard specification.
+
+    Args:
+    - shard (str): "i/n", the zero-based index of the shard and the number of shards.
+
+    Returns:
+    - tuple: The index and the number of shards.
+
+    Raises:
+    - ValueError: If the specification is malformed or the index is out of range.
+    """
+    index, separator, count = shard.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{shard}', expected 'i/n'") from None
+    if not separator or count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{shard}', expected 'i/n' with 0 <= i < n")
+    return index, count
+
+
+def shard_of(relative_path: str, count: int) -> int:
+    """
+    Assigns a file to a shard by a stable hash of its relative path.
+
+    The hash does not depend on the process, the platform path separator or the Python version, so every
+    job assigns every file to the same shard.
+
+    Args:
+    - relative_path (str): Path of the file relative to the scanned directory.
+    - count (int): Number of shards.
+
+    Returns:
+    - int: The index of the shard of the file.
+    """
+    key = relative_path.replace(os.sep, "/").encode("utf-8", "surrogateescape")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big") % count
+
+
+def iter_shard_files(path: str, index: int, count: int) -> Iterator[Tuple[int, str, str]]:
+    """
+    Lazily lists the files of a shard.
+
+    Args:
+    - path (str): The path to a Python file or to a directory containing Python files.
+    - index (int): Index of the shard.
+    - count (int): Number of shards.
+
+    Yields:
+    - tuple: The position of the file in the walk of the whole tree, its relative path in POSIX form and its path.
+    """
+    root = path if os.path.isdir(path) else os.path.dirname(path)
+    for position, file_path in enumerate(py_class_extractor.iter_python_files(path)):
+        relative_path = os.path.relpath(file_path, root).replace(os.sep, "/")
+        if shard_of(relative_path, count) == index:
+            yield position, relative_path, file_path
+
+
+def run_shard(path: str, shard: str, output_path: str, workers: int = 1, cache_directory: str = None,
+              encoding_fallback: bool = False, prefilter: bool = False) -> int:
+    """
+    Analyzes the files of one shard and writes their module metadata to a partial file.
+
+    The partial file is newline-delimited JSON: a header identifying the scan by the name of its root and
+    the shard, then the position, relative path and module metadata of every file of the shard, in walk order.
+
+    Args:
+    - path (str): The path to a Python file or to a directory containing Python files.
+    - shard (str): The shard to analyze, as "i/n", see `parse_shard`.
+    - output_path (str): The partial file to write.
+    - workers (int, optional): Number of processes used to analyze files, see `iter_module_metadata`.
+    - cache_directory (str, optional): Directory of a persistent result cache reused across runs.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - prefilter (bool, optional): Skip parsing files whose bytes contain no class statement.
+
+    Returns:
+    - int: Number of files analyzed.
+    """
+    index, count = parse_shard(shard)
+    base_module_name = utils.split_path(path)[-1]
+    shard_files = list(iter_shard_files(path, index, count))
+    modules = py_class_extractor.analyze_files(
+        [file_path for _, _, file_path in shard_files], base_module_name, workers, cache_directory,
+        encoding_fallback, prefilter=prefilter
+    )
+
+    header = {
+        "format": SHARD_FORMAT,
+        "analyzer_version": result_cache.ANALYZER_VERSION,
+        "root": os.path.abspath(path),
+        "name": base_module_name,
+        "shard": [index, count],
+    }
+    with open(output_path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for (position, relative_path, _), module in zip(shard_files, modules):
+            record = {"position": position, "path": relative_path, "module": module.to_dictionary()}
+            file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return len(shard_files)
+
+
+def read_partial(partial_path: str) -> Tuple[dict, List[Tuple[int, str, ModuleInformation]]]:
+    """
+    Reads a partial file written by `run_shard`.
+
+    Args:
+    - partial_path (str): The partial file.
+
+    Returns:
+    - tuple: The header, and the position, relative path and module metadata of every file.
+
+    Raises:
+    - ValueError: If the file is not a partial file of a supported format.
+    """
+    records = file_management.iter_saved_records(partial_path)
+    header = next(records, None)
+    if not isinstance(header, dict) or header.get("format") != SHARD_FORMAT or "shard" not in header:
+        raise ValueError(f"'{partial_path}' is not a shard output")
+    if header["analyzer_version"] != result_cache.ANALYZER_VERSION:
+        raise ValueError(f"'{partial_path}' was written by another analyzer version")
+    return header, [
+        (record["position"], record["path"], ModuleInformation.from_dictionary(record["module"]))
+        for record in records
+    ]
+
+
+def merge_shards(partial_paths: Iterable[str], path: str = None, encoding_fallback: bool = False) -> list:
+    """
+    Merges the partial files of every shard of a scan and resolves relationships across the whole corpus.
+
+    Args:
+    - partial_paths (Iterable[str]): The partial file of every shard, in any order.
+    - path (str, optional): The scanned path on this machine, used to parse the modules skipped by the
+      prefilter when their imports are needed. Defaults to the path recorded by the first shard.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+
+    Returns:
+    - list: The dictionary of each class, identical to `generate_classes_dicts` over the whole tree.
+
+    Raises:
+    - ValueError: If the partial files belong to scans of differently named roots or with different shard
+      counts, or shards are missing or repeated.
+    """
+    headers = []
+    entries = []
+    for partial_path in partial_paths:
+        header, partial_entries = read_partial(partial_path)
+        headers.append(header)
+        entries.extend(partial_entries)
+    if not headers:
+        raise ValueError("No shard output to merge")
+
+    # The checkouts of the jobs may live at different paths; module names only depend on the root name
+    count, name = headers[0]["shard"][1], headers[0]["name"]
+    if any(header["shard"][1] != count or header["name"] != name for header in headers):
+        raise ValueError("Shard outputs belong to different scans")
+    indexes = sorted(header["shard"][0] for header in headers)
+    if indexes != list(range(count)):
+        raise ValueError(f"Expected shards 0 to {count - 1} once each, got {indexes}")
+
+    path = path or headers[0]["root"]
+    root = path if os.path.isdir(path) else os.path.dirname(path)
+    # Depth first with sorted directory entries is the order of the path components
+    entries.sort(key=lambda entry: entry[1].split("/"))
+    file_paths = [os.path.join(root, *relative_path.split("/")) for _, relative_path, _ in entries]
+    module_metadata_list = [module for _, _, module in entries]
+    loader = py_class_extractor.skipped_module_loader(
+        file_paths, module_metadata_list, utils.split_path(path)[-1], encoding_fallback
+    )
+    return py_class_extractor.to_dictionaries(module_metadata_list, loader=loader)
+
+
+def merge_shard_files(partial_paths: Iterable[str], output_path: str, path: str = None,
+                      encoding_fallback: bool = False) -> int:
+    """
+    Merges partial files like `merge_shards` and writes the classes as `save_data_to_json` does.
+
+    Returns:
+    - int: Number of classes written.
+    """
+    return file_management.stream_data_to_json(output_path, merge_shards(partial_paths, path, encoding_fallback))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Analyze one shard of a tree")
+    run_parser.add_argument("path")
+    run_parser.add_argument("--shard", required=True, help="Shard to analyze, as i/n with 0 <= i < n")
+    run_parser.add_argument("--output", required=True)
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--cache-directory")
+    run_parser.add_argument("--prefilter", action="store_true")
+
+    merge_parser = commands.add_parser("merge", help="Merge the outputs of every shard")
+    merge_parser.add_argument("partials", nargs="+")
+    merge_parser.add_argument("--output", required=True)
+    merge_parser.add_argument("--path", help="Scanned path, if it moved since the shards ran")
+
+    arguments = parser.parse_args()
+    if arguments.command == "run":
+        run_shard(arguments.path, arguments.shard, arguments.output, arguments.workers,
+                  arguments.cache_directory, prefilter=arguments.prefilter)
+    else:
+        merge_shard_files(arguments.partials, arguments.output, arguments.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Compares the class metadata of two releases to detect API changes.
+
+A snapshot file holds one class per line, as its key, its fingerprint and its JSON dictionary separated by
+tabs. Diffing reads both snapshots once into a dictionary keyed by class, compares fingerprints, and only
+decodes the JSON of classes whose fingerprint differs, so identical classes cost a string comparison.
+Regular JSON and NDJSON outputs can be diffed too, at the price of decoding every class.
+
+Usage:
+    python -m py_class_extractor.snapshots snapshot <path> --output release.snapshot
+    python -m py_class_extractor.snapshots diff old.snapshot new.snapshot [--output diff.json]
+"""
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple, Union
+
+import py_class_extractor
+from py_class_extractor import file_management
+from py_class_extractor.class_index import ClassIndex
+from py_class_extractor.schemas import ClassInformation
+
+SNAPSHOT_HEADER = "#py_class_extractor snapshot 1"
+
+
+def write_snapshot(filename: str, classes: Iterable[Union[ClassInformation, dict]]) -> int:
+    """
+    Writes classes to a snapshot file incrementally.
+
+    Args:
+    - filename (str): Path to the snapshot file.
+    - classes (Iterable): ClassInformation objects or their dictionaries, possibly a generator.
+
+    Returns:
+    - int: Number of classes written.
+    """
+    count = 0
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(SNAPSHOT_HEADER + "\n")
+        for class_info in classes:
+            if isinstance(class_info, dict):
+                class_info = ClassInformation.from_dictionary(class_info)
+            if class_info.fingerprint is None:
+                class_info = class_info.with_fingerprint()
+            # Keys and hex digests hold no tab, and compact JSON escapes the tabs of its strings
+            file.write(f"{ClassIndex.key_of(class_info)}\t{class_info.fingerprint}\t"
+                       f"{file_management.encode_ndjson_record(class_info)}\n")
+            count += 1
+    return count
+
+
+def read_snapshot(filename: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Reads a snapshot, or a JSON or NDJSON output, without decoding the members of the classes.
+
+    Args:
+    - filename (str): Path to the file.
+
+    Returns:
+    - dict: The fingerprint and the encoded dictionary of every class, keyed by class key.
+    """
+    entries: Dict[str, Tuple[str, str]] = dict()
+    with open(filename, "r", encoding="utf-8") as file:
+        if file.readline().rstrip("\n") == SNAPSHOT_HEADER:
+            for line in file:
+                key, fingerprint, encoded = line.rstrip("\n").split("\t", 2)
+                entries[key] = (fingerprint, encoded)
+            return entries
+
+    for record in file_management.iter_saved_records(filename):
+        class_info = ClassInformation.from_dictionary(record)
+        fingerprint = class_info.fingerprint or class_info.compute_fingerprint()
+        entries[ClassIndex.key_of(class_info)] = (fingerprint, record)
+    return entries
+
+
+def _decode(encoded: Union[str, dict]) -> ClassInformation:
+    """
+    Rebuilds a class from an entry of `read_snapshot`, only for the classes whose fingerprint changed.
+
+    Args:
+    - encoded (str or dict): The encoded dictionary of a snapshot, or the dictionary of a saved output file.
+
+    Returns:
+    - ClassInformation: The class.
+    """
+    return ClassInformation.from_dictionary(json.loads(encoded) if isinstance(encoded, str) else encoded)
+
+
+def _diff_members(old: dict, new: dict) -> dict:
+    """
+    Compares two collections of members keyed by name.
+
+    Returns:
+    - dict: Names of the added and removed members, and of the members whose description changed.
+    """
+    return {
+        "added": [name for name in new if name not in old],
+        "removed": [name for name in old if name not in new],
+        "changed": [name for name in new if name in old and old[name] != new[name]],
+    }
+
+
+@dataclass
+class ClassChange:
+    """
+    Data class describing how a class changed between two snapshots.
+
+    Attributes:
+    - key (str): Key of the class.
+    - bases (dict): The old and new bases, when they changed.
+    - attributes (dict): Names of the added, removed and changed attributes.
+    - methods (dict): Names of the added, removed and changed methods; a method changes with its arguments,
+      return value or encapsulation.
+    """
+
+    key: str
+    bases: dict = field(default_factory=dict)
+    attributes: dict = field(default_factory=dict)
+    methods: dict = field(default_factory=dict)
+
+    @classmethod
+    def between(cls, key: str, old: ClassInformation, new: ClassInformation) -> "ClassChange":
+        """
+        Compares two versions of a class.
+
+        Args:
+        - key (str): Key of the class.
+        - old (ClassInformation): The old version.
+        - new (ClassInformation): The new version.
+
+        Returns:
+        - ClassChange: The differences between them.
+        """
+        old_bases = [relationship.target or relationship.related for relationship in old.relationships]
+        new_bases = [relationship.target or relationship.related for relationship in new.relationships]
+        return cls(
+            key=key,
+            bases={"old": old_bases, "new": new_bases} if old_bases != new_bases else {},
+            attributes=_diff_members(
+                {attribute.name: attribute for attribute in old.attributes},
+                {attribute.name: attribute for attribute in new.attributes},
+            ),
+            methods=_diff_members(
+                {method.name: method for method in old.methods}, {method.name: method for method in new.methods}
+            ),
+        )
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the ClassChange object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the key of the class and the differences of its bases and members.
+        """
+        return {"key": self.key, "bases": self.bases, "attributes": self.attributes, "methods": self.methods}
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    Data class holding the differences between two snapshots.
+
+    Attributes:
+    - added (List[str]): Keys of the classes only in the new snapshot, in its order.
+    - removed (List[str]): Keys of the classes only in the old snapshot, in its order.
+    - changed (List[ClassChange]): Classes whose fingerprint differs, in the order of the new snapshot.
+    - unchanged (int): Number of classes with identical fingerprints.
+    """
+
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[ClassChange] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the SnapshotDiff object into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the added, removed, changed and unchanged classes.
+        """
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "changed": [change.to_dictionary() for change in self.changed],
+            "unchanged": self.unchanged,
+        }
+
+
+def diff_snapshots(old_filename: str, new_filename: str) -> SnapshotDiff:
+    """
+    Compares two snapshots in time linear in their size.
+
+    Args:
+    - old_filename (str): The snapshot of the old release; a JSON or NDJSON output also works.
+    - new_filename (str): The snapshot of the new release.
+
+    Returns:
+    - SnapshotDiff: The added, removed and changed classes.
+    """
+    old_entries = read_snapshot(old_filename)
+    new_entries = read_snapshot(new_filename)
+    diff = SnapshotDiff()
+    for key, (fingerprint, encoded) in new_entries.items():
+        old_entry = old_entries.get(key)
+        if old_entry is None:
+            diff.added.append(key)
+        elif old_entry[0] == fingerprint:
+            diff.unchanged += 1
+        else:
+            diff.changed.append(ClassChange.between(key, _decode(old_entry[1]), _decode(encoded)))
+    diff.removed = [key for key in old_entries if key not in new_entries]
+    return diff
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = commands.add_parser("snapshot", help="Write the snapshot of a file or directory")
+    snapshot_parser.add_argument("path")
+    snapshot_parser.add_argument("--output", required=True)
+    snapshot_parser.add_argument("--workers", type=int, default=1)
+
+    diff_parser = commands.add_parser("diff", help="Compare two snapshots; exits with 1 when they differ")
+    diff_parser.add_argument("old")
+    diff_parser.add_argument("new")
+    diff_parser.add_argument("--output", help="File the diff is written to as JSON, instead of standard output")
+
+    arguments = parser.parse_args()
+    if arguments.command == "snapshot":
+        write_snapshot(arguments.output, py_class_extractor.generate_classes_dicts(arguments.path, arguments.workers))
+        return
+
+    diff = diff_snapshots(arguments.old, arguments.new)
+    if arguments.output:
+        file_management.save_data_to_json(arguments.output, diff.to_dictionary())
+    else:
+        json.dump(diff.to_dictionary(), sys.stdout, ensure_ascii=False, indent=4)
+        print()
+    sys.exit(1 if diff else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+import json
+import os
+import sqlite3
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import py_class_extractor
+from py_class_extractor import batch, parallel, utils
+from py_class_extractor.batch import FileError
+from py_class_extractor.schemas import (AttributeInformation, ClassInformation, Encapsulation, FunctionInformation,
+                                        ModuleInformation, RelationshipInformation, RelationshipType)
+from py_class_extractor.symbols import SymbolIndex
+
+# Files written per transaction; larger batches amortize the commits, smaller ones bound the memory used.
+DEFAULT_BATCH_SIZE = 500
+
+# Stored in `PRAGMA user_version`; version 0 stored method return values as JSON instead of plain text.
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    module TEXT NOT NULL,
+    modules TEXT NOT NULL,
+    star_imports TEXT,
+    size INTEGER,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS imports (
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    name TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    qualified_name TEXT,
+    modules TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data_type TEXT,
+    encapsulation TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS methods (
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    args TEXT NOT NULL,
+    return_value TEXT,
+    encapsulation TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS relationships (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    related TEXT,
+    target TEXT,
+    resolved_target TEXT
+);
+"""
+
+# Created once the first load is done, so bulk inserts do not maintain them row by row.
+INDEXES = """
+CREATE INDEX IF NOT EXISTS imports_file ON imports(file_id);
+CREATE INDEX IF NOT EXISTS classes_file ON classes(file_id);
+CREATE INDEX IF NOT EXISTS classes_qualified_name ON classes(qualified_name);
+CREATE INDEX IF NOT EXISTS classes_name ON classes(name);
+CREATE INDEX IF NOT EXISTS attributes_class ON attributes(class_id);
+CREATE INDEX IF NOT EXISTS methods_class ON methods(class_id);
+CREATE INDEX IF NOT EXISTS relationships_class ON relationships(class_id);
+CREATE INDEX IF NOT EXISTS relationships_resolved_target ON relationships(resolved_target);
+"""
+
+
+class SQLiteStore:
+    """
+    Normalized SQLite storage of module and class metadata, updated file by file.
+
+    Every file owns its imports and classes, and every class its attributes, methods and relationships.
+    Writing a file that is already stored replaces its rows, so a re-scan only touches the files that changed.
+    Rows are inserted with `executemany` in one transaction per batch, and the secondary indexes are created
+    after the first load. `relationships.target` holds the target qualified within its module, and
+    `relationships.resolved_target` the target resolved across the stored corpus by `resolve_relationships`.
+
+    Attributes:
+    - database_path (str): Path of the database file.
+    - connection (sqlite3.Connection): The open connection.
+    """
+
+    def __init__(self, database_path: str) -> None:
+        """
+        Initializes an instance of SQLiteStore, creating the schema or upgrading it if needed.
+
+        Args:
+        - database_path (str): Path of the database file, or ":memory:".
+        """
+        self.database_path = database_path
+        self.connection = sqlite3.connect(database_path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE methods SET return_value = json_extract(return_value, '$') WHERE return_value IS NOT NULL"
+                )
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """
+        Closes the connection; every write is already committed.
+        """
+        self.connection.close()
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def create_indexes(self) -> None:
+        """
+        Creates the secondary indexes that do not exist yet.
+        """
+        self.connection.executescript(INDEXES)
+
+    def paths(self) -> List[str]:
+        """
+        Returns the paths of the stored files.
+        """
+        return [path for (path,) in self.connection.execute("SELECT path FROM files ORDER BY id")]
+
+    def stale_paths(self, signatures: Dict[str, Tuple[int, int]]) -> List[str]:
+        """
+        Returns the files whose stored size or modification time differ from the given ones.
+
+        Args:
+        - signatures (dict): (size, modification time in nanoseconds) of every file, keyed by path.
+
+        Returns:
+        - list: Paths of the new or changed files, in the order of `signatures`.
+        """
+        stored = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.connection.execute("SELECT path, size, mtime_ns FROM files")
+        }
+        return [path for path, signature in signatures.items() if stored.get(path) != tuple(signature)]
+
+    def write_modules(self, records: Iterable[Tuple[str, ModuleInformation, int, int]],
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Inserts or replaces the rows of files, one transaction per batch.
+
+        Args:
+        - records (Iterable[tuple]): (path, module metadata, size, modification time in nanoseconds) of every file.
+        - batch_size (int, optional): Number of files written per transaction.
+
+        Returns:
+        - int: Number of files written.
+        """
+        records = iter(records)
+        next_class_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM classes").fetchone()[0]
+        written = 0
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            with self.connection:
+                next_class_id = self._write_batch(batch, next_class_id)
+            written += len(batch)
+        self.create_indexes()
+        return written
+
+    def _write_batch(self, batch: list, next_class_id: int) -> int:
+        """
+        Writes one batch of files inside the current transaction.
+
+        Returns:
+        - int: The next free class id.
+        """
+        paths = json.dumps([path for path, *_ in batch])
+        existing = [file_id for (file_id,) in self.connection.execute(
+            "SELECT id FROM files WHERE path IN (SELECT value FROM json_each(?))", (paths,)
+        )]
+        if existing:
+            self._delete_rows(existing)
+
+        self.connection.executemany(
+            "INSERT INTO files (path, module, modules, star_imports, size, mtime_ns) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET module = excluded.module, modules = excluded.modules, "
+            "star_imports = excluded.star_imports, size = excluded.size, mtime_ns = excluded.mtime_ns",
+            [
+                (path, module.name, json.dumps(module.modules), _dump_optional(module.star_imports), size, mtime_ns)
+                for path, module, size, mtime_ns in batch
+            ],
+        )
+        file_ids = dict(self.connection.execute(
+            "SELECT path, id FROM files WHERE path IN (SELECT value FROM json_each(?))", (paths,)
+        ))
+
+        imports, classes, attributes, methods, relationships = [], [], [], [], []
+        for path, module, *_ in batch:
+            file_id = file_ids[path]
+            imports.extend((file_id, name, target) for name, target in module.imports or ())
+            for position, class_info in enumerate(module.classes):
+                class_id = next_class_id
+                next_class_id += 1
+                classes.append((
+                    class_id, file_id, position, class_info.name, class_info.qualified_name,
+                    json.dumps(class_info.modules)
+                ))
+                attributes.extend(
+                    (class_id, index, attribute.name, attribute.data_type, attribute.encapsulation.value)
+                    for index, attribute in enumerate(class_info.attributes)
+                )
+                methods.extend(
+                    (class_id, index, method.name, json.dumps(method.args), method.return_value,
+                     method.encapsulation.value)
+                    for index, method in enumerate(class_info.methods)
+                )
+                relationships.extend(
+                    (class_id, index, relationship.type.value, relationship.related, relationship.target,
+                     relationship.target)
+                    for index, relationship in enumerate(class_info.relationships)
+                )
+
+        self.connection.executemany("INSERT INTO imports VALUES (?, ?, ?)", imports)
+        self.connection.executemany("INSERT INTO classes VALUES (?, ?, ?, ?, ?, ?)", classes)
+        self.connection.executemany("INSERT INTO attributes VALUES (?, ?, ?, ?, ?)", attributes)
+        self.connection.executemany("INSERT INTO methods VALUES (?, ?, ?, ?, ?, ?)", methods)
+        self.connection.executemany(
+            "INSERT INTO relationships (class_id, position, type, related, target, resolved_target) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            relationships,
+        )
+        return next_class_id
+
+    def _delete_rows(self, file_ids: List[int]) -> None:
+        """
+        Deletes the imports and classes of files, keeping the file rows themselves.
+        """
+        ids = json.dumps(file_ids)
+        class_ids = "SELECT id FROM classes WHERE file_id IN (SELECT value FROM json_each(?))"
+        for table in ("attributes", "methods", "relationships"):
+            self.connection.execute(f"DELETE FROM {table} WHERE class_id IN ({class_ids})", (ids,))
+        self.connection.execute("DELETE FROM classes WHERE file_id IN (SELECT value FROM json_each(?))", (ids,))
+        self.connection.execute("DELETE FROM imports WHERE file_id IN (SELECT value FROM json_each(?))", (ids,))
+
+    def delete_files(self, paths: Iterable[str]) -> int:
+        """
+        Deletes files and all their rows.
+
+        Args:
+        - paths (Iterable[str]): Paths of the files to delete.
+
+        Returns:
+        - int: Number of files deleted.
+        """
+        with self.connection:
+            file_ids = [file_id for (file_id,) in self.connection.execute(
+                "SELECT id FROM files WHERE path IN (SELECT value FROM json_each(?))", (json.dumps(list(paths)),)
+            )]
+            if file_ids:
+                self._delete_rows(file_ids)
+                self.connection.execute(
+                    "DELETE FROM files WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(file_ids),)
+                )
+        return len(file_ids)
+
+    def iter_modules(self, with_members: bool = True) -> Iterator[ModuleInformation]:
+        """
+        Rebuilds the stored modules, in storage order.
+
+        Args:
+        - with_members (bool, optional): Load attributes and methods; without them, classes only carry
+          their names and relationships, which is enough to resolve relationships.
+
+        Yields:
+        - ModuleInformation: Each stored module, with the module-qualified relationship targets.
+        """
+        imports: Dict[int, list] = dict()
+        for file_id, name, target in self.connection.execute("SELECT file_id, name, target FROM imports ORDER BY rowid"):
+            imports.setdefault(file_id, []).append((name, target))
+        relationships = self._group_by_class(
+            "SELECT class_id, type, related, target FROM relationships ORDER BY class_id, position",
+            lambda row: RelationshipInformation(RelationshipType(row[0]), row[1], row[2]),
+        )
+        if with_members:
+            attributes = self._group_by_class(
+                "SELECT class_id, name, data_type, encapsulation FROM attributes ORDER BY class_id, position",
+                lambda row: AttributeInformation(row[0], row[1], Encapsulation(row[2])),
+            )
+            methods = self._group_by_class(
+                "SELECT class_id, name, args, return_value, encapsulation FROM methods ORDER BY class_id, position",
+                lambda row: FunctionInformation(
+                    row[0], tuple(json.loads(row[1])), row[2], Encapsulation(row[3])
+                ),
+            )
+        else:
+            attributes = methods = dict()
+
+        classes: Dict[int, list] = dict()
+        for class_id, file_id, name, qualified_name, modules in self.connection.execute(
+            "SELECT id, file_id, name, qualified_name, modules FROM classes ORDER BY file_id, position"
+        ):
+            classes.setdefault(file_id, []).append(ClassInformation(
+                modules=tuple(json.loads(modules)), name=name,
+                relationships=tuple(relationships.get(class_id, ())),
+                attributes=tuple(attributes.get(class_id, ())), methods=tuple(methods.get(class_id, ())),
+                qualified_name=qualified_name,
+            ).with_fingerprint())
+
+        for file_id, module, modules, star_imports in self.connection.execute(
+            "SELECT id, module, modules, star_imports FROM files ORDER BY id"
+        ):
+            yield ModuleInformation(
+                name=module, modules=tuple(json.loads(modules)), classes=tuple(classes.get(file_id, ())),
+                imports=tuple(imports.get(file_id, ())),
+                star_imports=None if star_imports is None else tuple(json.loads(star_imports)),
+            )
+
+    def _group_by_class(self, query: str, build) -> Dict[int, list]:
+        """
+        Runs a query over the rows of a class member table and groups the objects built from them by class.
+
+        Args:
+        - query (str): Query selecting the class id first, then the columns given to `build`.
+        - build (Callable): Builds an object from the other columns of a row.
+
+        Returns:
+        - dict: The objects of every class, in row order, keyed by class id.
+        """
+        groups: Dict[int, list] = dict()
+        for class_id, *row in self.connection.execute(query):
+            groups.setdefault(class_id, []).append(build(row))
+        return groups
+
+    def resolve_relationships(self) -> int:
+        """
+        Resolves every relationship target across the stored corpus and updates the rows that changed.
+
+        Returns:
+        - int: Number of relationship rows updated.
+        """
+        modules = list(self.iter_modules(with_members=False))
+        index = SymbolIndex(modules)
+        resolved = []
+        for module in modules:
+            for class_info in module.classes:
+                for relationship in index.resolve_class(class_info, module).relationships:
+                    resolved.append(relationship.target)
+
+        updates = [
+            (target, relationship_id)
+            for (relationship_id, stored), target in zip(self.connection.execute(
+                "SELECT relationships.id, relationships.resolved_target FROM relationships "
+                "JOIN classes ON classes.id = relationships.class_id "
+                "ORDER BY classes.file_id, classes.position, relationships.position"
+            ).fetchall(), resolved)
+            if stored != target
+        ]
+        with self.connection:
+            self.connection.executemany("UPDATE relationships SET resolved_target = ? WHERE id = ?", updates)
+        return len(updates)
+
+
+def _dump_optional(values) -> Optional[str]:
+    """
+    Encodes an optional sequence as JSON, keeping None as NULL so it stays distinct from an empty sequence.
+
+    Args:
+    - values (Sequence or None): The values.
+
+    Returns:
+    - str or None: The JSON array, or None.
+    """
+    return None if values is None else json.dumps(values)
+
+
+def save_directory_to_sqlite(path: str, database_path: str, workers: int = 1, encoding_fallback: bool = False,
+                             batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[int, int, List[FileError]]:
+    """
+    Brings a database up to date with a Python file or directory, analyzing only new and changed files.
+
+    Every file is analyzed in isolation, see `batch.process_module_safely`. A file that cannot be analyzed is
+    left out of the database, and the rows of its previous version are deleted, until it is fixed.
+
+    Args:
+    - path (str): The path to a Python file or to a directory containing Python files.
+    - database_path (str): Path of the database file, created if needed.
+    - workers (int, optional): Number of processes used to analyze files, see `iter_module_metadata`.
+    - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+    - batch_size (int, optional): Number of files written per transaction.
+
+    Returns:
+    - tuple: The number of files written, the number of files deleted, and the errors of the files that
+      could not be analyzed.
+    """
+    signatures = dict()
+    for file_path in py_class_extractor.iter_python_files(path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue  # Deleted while walking
+        signatures[file_path] = (stat.st_size, stat.st_mtime_ns)
+    base_module_name = utils.split_path(path)[-1]
+
+    with SQLiteStore(database_path) as store:
+        stale_paths = store.stale_paths(signatures)
+        outcomes = parallel.imap_in_processes(
+            batch.process_module_safely, stale_paths, workers, base_module_name, None, encoding_fallback
+        )
+        errors: List[FileError] = []
+
+        def iter_records() -> Iterator[Tuple[str, ModuleInformation, int, int]]:
+            for file_path, (module, error) in zip(stale_paths, outcomes):
+                if error is not None:
+                    errors.append(error)
+                else:
+                    yield (file_path, module) + signatures[file_path]
+
+        written = store.write_modules(iter_records(), batch_size)
+        deleted = store.delete_files([stored for stored in store.paths() if stored not in signatures])
+        forgotten = store.delete_files(error.path for error in errors)
+        if written or deleted or forgotten:
+            store.resolve_relationships()
+    return written, deleted, errors
@@ -0,0 +1,272 @@
+import heapq
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Pipeline stages, in execution order. "cache" covers the lookups and writes of the result cache,
+# and "prefilter" the byte scan for class statements.
+STAGES = ("cache", "prefilter", "read", "decode", "parse", "extract", "resolve", "serialize", "write")
+
+DEFAULT_SLOWEST_COUNT = 10
+
+
+@dataclass
+class StageStats:
+    """
+    Data class accumulating the calls and wall time of a pipeline stage.
+
+    Attributes:
+    - calls (int): Number of times the stage ran.
+    - seconds (float): Total wall time spent in the stage.
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the stage statistics into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the number of calls and the total seconds.
+        """
+        return {"calls": self.calls, "seconds": self.seconds}
+
+
+@dataclass(frozen=True, slots=True)
+class FileStats:
+    """
+    Data class describing how one file went through the pipeline.
+
+    Instances are plain data, so they can be returned by worker processes and merged in the parent.
+
+    Attributes:
+    - path (str): Path of the file.
+    - seconds (float): Total wall time spent on the file.
+    - bytes_read (int): Number of bytes read from the file, 0 on a cache hit.
+    - nodes_visited (int): Number of AST nodes visited by the collectors.
+    - classes (int): Number of classes found.
+    - cache_hit (bool): Whether the result came from the result cache.
+    - stages (Tuple[Tuple[str, float]]): Wall time of every stage the file went through, as (stage, seconds) pairs.
+    - prefiltered (bool): Whether the prefilter found no class statement, so the file was not parsed.
+    """
+
+    path: str
+    seconds: float
+    bytes_read: int
+    nodes_visited: int
+    classes: int
+    cache_hit: bool
+    stages: Tuple[Tuple[str, float], ...]
+    prefiltered: bool = False
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the file statistics into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the counters of the file and the seconds of every stage.
+        """
+        return {
+            "path": self.path,
+            "seconds": self.seconds,
+            "bytes_read": self.bytes_read,
+            "nodes_visited": self.nodes_visited,
+            "classes": self.classes,
+            "cache_hit": self.cache_hit,
+            "prefiltered": self.prefiltered,
+            "stages": dict(self.stages),
+        }
+
+
+class StageTimer:
+    """
+    Times the consecutive stages a single file goes through, and builds its FileStats.
+
+    Attributes:
+    - stages (list): (stage, seconds) pairs of the stages timed so far, in order.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an instance of StageTimer, starting the clock of the first stage.
+        """
+        self.stages: List[Tuple[str, float]] = []
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """
+        Records the time elapsed since the previous stage (or the start) as one run of a stage.
+
+        Args:
+        - stage (str): Name of the stage that just finished.
+        """
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def resume(self) -> None:
+        """
+        Restarts the clock without recording a stage, so that time spent waiting, e.g. in a queue, is not counted.
+        """
+        self._last = time.perf_counter()
+
+    def file_stats(self, path: str, bytes_read: int, nodes_visited: int, classes: int, cache_hit: bool,
+                   prefiltered: bool = False) -> FileStats:
+        """
+        Builds the statistics of the file from the stages timed so far.
+
+        Args:
+        - path (str): Path of the file.
+        - bytes_read (int): Number of bytes read from the file.
+        - nodes_visited (int): Number of AST nodes visited by the collectors.
+        - classes (int): Number of classes found.
+        - cache_hit (bool): Whether the result came from the result cache.
+        - prefiltered (bool, optional): Whether the prefilter skipped the file.
+
+        Returns:
+        - FileStats: The statistics of the file; its total time is the sum of the stages.
+        """
+        seconds = sum(stage_seconds for _, stage_seconds in self.stages)
+        return FileStats(
+            path, seconds, bytes_read, nodes_visited, classes, cache_hit, tuple(self.stages), prefiltered
+        )
+
+
+class ScanStats:
+    """
+    Opt-in collector of timings and counters for a scan.
+
+    Pass an instance as the `stats` argument of the entry points to fill it; without one, the entry
+    points run their uninstrumented code path. The hook, if any, is called after every recorded stage
+    with `(stage, file_path, seconds)`; per-file totals are reported under the stage "file", and stages
+    that do not belong to a single file have a `file_path` of None.
+
+    Attributes:
+    - stages (dict): StageStats of every stage, keyed by stage name.
+    - files (int): Number of files processed.
+    - bytes_read (int): Number of bytes read from disk.
+    - nodes_visited (int): Number of AST nodes visited by the collectors.
+    - classes (int): Number of classes found.
+    - cache_hits (int): Number of files whose result came from the result cache.
+    - prefiltered (int): Number of files the prefilter skipped without parsing them.
+    - deferred_parses (int): Number of skipped files parsed later because their imports were needed.
+    - slowest_count (int): Number of slowest files kept.
+    - hook (Callable or None): Callback receiving every recorded stage.
+    """
+
+    def __init__(self, slowest_count: int = DEFAULT_SLOWEST_COUNT,
+                 hook: Callable[[str, Optional[str], float], None] = None) -> None:
+        """
+        Initializes an instance of ScanStats.
+
+        Args:
+        - slowest_count (int, optional): Number of slowest files kept.
+        - hook (Callable, optional): Called as `hook(stage, file_path, seconds)` after every recorded stage.
+        """
+        self.stages: Dict[str, StageStats] = {stage: StageStats() for stage in STAGES}
+        self.files = 0
+        self.bytes_read = 0
+        self.nodes_visited = 0
+        self.classes = 0
+        self.cache_hits = 0
+        self.prefiltered = 0
+        self.deferred_parses = 0
+        self.slowest_count = slowest_count
+        self.hook = hook
+        self._slowest: List[Tuple[float, int, FileStats]] = []
+
+    def record_stage(self, stage: str, seconds: float, file_path: str = None) -> None:
+        """
+        Records one run of a stage.
+
+        Args:
+        - stage (str): Name of the stage.
+        - seconds (float): Wall time of the run.
+        - file_path (str, optional): File the run belongs to.
+        """
+        stage_stats = self.stages.get(stage)
+        if stage_stats is None:
+            stage_stats = self.stages[stage] = StageStats()
+        stage_stats.calls += 1
+        stage_stats.seconds += seconds
+        if self.hook is not None:
+            self.hook(stage, file_path, seconds)
+
+    def record_file(self, file_stats: FileStats) -> None:
+        """
+        Records the stages and counters of a processed file.
+
+        Args:
+        - file_stats (FileStats): The statistics of the file.
+        """
+        for stage, seconds in file_stats.stages:
+            self.record_stage(stage, seconds, file_stats.path)
+        self.files += 1
+        self.bytes_read += file_stats.bytes_read
+        self.nodes_visited += file_stats.nodes_visited
+        self.classes += file_stats.classes
+        self.cache_hits += file_stats.cache_hit
+        self.prefiltered += file_stats.prefiltered
+
+        # Min-heap of the slowest files; the counter breaks ties without comparing FileStats
+        entry = (file_stats.seconds, self.files, file_stats)
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+        if self.hook is not None:
+            self.hook("file", file_stats.path, file_stats.seconds)
+
+    @property
+    def parses_avoided(self) -> int:
+        """
+        Number of files never parsed thanks to the prefilter.
+        """
+        return self.prefiltered - self.deferred_parses
+
+    @contextmanager
+    def measure(self, stage: str, file_path: str = None) -> Iterator[None]:
+        """
+        Records the wall time of the enclosed block as one run of a stage.
+
+        Args:
+        - stage (str): Name of the stage.
+        - file_path (str, optional): File the run belongs to.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start, file_path)
+
+    def slowest_files(self) -> List[FileStats]:
+        """
+        Returns the slowest files processed so far.
+
+        Returns:
+        - list: FileStats of the slowest files, slowest first.
+        """
+        return [file_stats for _, _, file_stats in sorted(self._slowest, reverse=True)]
+
+    def to_dictionary(self) -> dict:
+        """
+        Converts the statistics into a dictionary representation suitable for JSON serialization.
+
+        Returns:
+        - dict: A dictionary containing the counters, the stage timings and the slowest files.
+        """
+        return {
+            "files": self.files,
+            "bytes_read": self.bytes_read,
+            "nodes_visited": self.nodes_visited,
+            "classes": self.classes,
+            "cache_hits": self.cache_hits,
+            "prefiltered": self.prefiltered,
+            "deferred_parses": self.deferred_parses,
+            "parses_avoided": self.parses_avoided,
+            "stages": {stage: stage_stats.to_dictionary() for stage, stage_stats in self.stages.items()},
+            "slowest_files": [file_stats.to_dictionary() for file_stats in self.slowest_files()],
+        }
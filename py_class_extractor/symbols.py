@@ -0,0 +1,167 @@
+import re
+from dataclasses import replace
+from typing import Callable, Dict, Iterable, Optional
+
+from py_class_extractor.schemas import ClassInformation, ModuleInformation
+
+# Maximum number of re-export hops followed while resolving a name, guarding against import cycles.
+MAX_RESOLUTION_DEPTH = 32
+
+_DOTTED_NAME = re.compile(r"[^\W\d]\w*(?:\.[^\W\d]\w*)*\Z")
+
+
+class SymbolIndex:
+    """
+    Corpus-wide index mapping fully qualified names to the classes defined in the analyzed modules.
+
+    Names are resolved by following module level imports, including relative imports, aliases,
+    re-exports through package `__init__` modules and star imports. Every lookup is a dictionary
+    access and results are memoized, so resolving all relationships stays linear in the corpus size.
+
+    Modules whose imports were not collected, because the prefilter found no class in them, are only
+    analyzed through `loader` when a name is actually resolved through them.
+
+    Module names start with the name of the scanned directory. When that directory is not itself a package,
+    i.e. no module is named after it, its modules are importable without it, as when a repository root is
+    scanned: `from pkg.mod import X` then resolves to the module named "root.pkg.mod".
+
+    Attributes:
+    - classes (dict): Classes indexed by fully qualified name.
+    - modules (dict): Modules indexed by fully qualified name.
+    - loader (Callable or None): Returns the complete metadata of a module whose imports were not collected.
+    """
+
+    def __init__(self, modules: Iterable[ModuleInformation] = (),
+                 loader: Callable[[ModuleInformation], ModuleInformation] = None) -> None:
+        """
+        Initializes an instance of SymbolIndex.
+
+        Args:
+        - modules (Iterable[ModuleInformation], optional): Modules to index.
+        - loader (Callable, optional): Called with a module whose imports were not collected, the first
+          time a name is resolved through it, and returns its complete metadata.
+        """
+        self.loader = loader
+        self.classes: Dict[str, ClassInformation] = dict()
+        self.modules: Dict[str, ModuleInformation] = dict()
+        self._imports: Dict[str, dict] = dict()
+        self._root_relative_names: Dict[str, str] = dict()
+        self._resolved: Dict[str, Optional[str]] = dict()
+        for module in modules:
+            self.add_module(module)
+
+    def add_module(self, module: ModuleInformation) -> None:
+        """
+        Adds a module and its classes to the index.
+
+        Args:
+        - module (ModuleInformation): The module to index.
+        """
+        self.modules[module.name] = module
+        self._imports[module.name] = dict(module.imports or ())
+        root, _, root_relative_name = module.name.partition(".")
+        if root_relative_name:
+            self._root_relative_names[root_relative_name] = module.name
+        for class_info in module.classes:
+            if class_info.qualified_name is not None:
+                self.classes[class_info.qualified_name] = class_info
+        self._resolved.clear()
+
+    def remove_module(self, module_name: str) -> None:
+        """
+        Removes a module and its classes from the index.
+
+        Args:
+        - module_name (str): Fully qualified name of the module to remove.
+        """
+        module = self.modules.pop(module_name, None)
+        if module is None:
+            return
+        del self._imports[module_name]
+        root_relative_name = module_name.partition(".")[2]
+        if self._root_relative_names.get(root_relative_name) == module_name:
+            del self._root_relative_names[root_relative_name]
+        for class_info in module.classes:
+            if self.classes.get(class_info.qualified_name) is class_info:
+                del self.classes[class_info.qualified_name]
+        self._resolved.clear()
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Resolves a fully qualified name to the qualified name of the class it designates.
+
+        Args:
+        - name (str): A fully qualified name, possibly going through imports (e.g. "package.ReExported").
+
+        Returns:
+        - str or None: The qualified name of the class defined in the corpus, or None if it is unknown.
+        """
+        if name not in self._resolved:
+            self._resolved[name] = self._resolve(name, 0)
+        return self._resolved[name]
+
+    def resolve_class(self, class_info: ClassInformation, module: ModuleInformation = None) -> ClassInformation:
+        """
+        Returns a copy of a class whose relationship targets point at the classes they resolve to.
+
+        Targets that resolve outside the corpus are kept as qualified by their module, and bases that
+        could not be qualified in their module are looked up through its star imports.
+
+        Args:
+        - class_info (ClassInformation): The class to resolve.
+        - module (ModuleInformation, optional): The module defining the class, used for star imports.
+
+        Returns:
+        - ClassInformation: The class with resolved relationship targets.
+        """
+        relationships = []
+        for relationship in class_info.relationships:
+            target = relationship.target
+            if target is not None:
+                target = self.resolve(target) or target
+            elif module is not None and module.star_imports and _DOTTED_NAME.match(relationship.related or ""):
+                target = self.resolve(f"{module.name}.{relationship.related}")
+            relationships.append(relationship if target == relationship.target else replace(relationship, target=target))
+        if all(new is old for new, old in zip(relationships, class_info.relationships)):
+            return class_info
+        resolved = replace(class_info, relationships=tuple(relationships))
+        return resolved if class_info.fingerprint is None else resolved.with_fingerprint()
+
+    def _resolve(self, name: str, depth: int) -> Optional[str]:
+        """
+        Resolves a name, following imports up to MAX_RESOLUTION_DEPTH hops.
+
+        Args:
+        - name (str): A fully qualified name.
+        - depth (int): Number of hops already followed.
+
+        Returns:
+        - str or None: The qualified name of the class, or None if it is unknown.
+        """
+        if name in self.classes:
+            return name
+        if depth >= MAX_RESOLUTION_DEPTH:
+            return None
+
+        # Find the longest known module prefix, then follow the binding of the next component
+        parts = name.split(".")
+        for split in range(len(parts) - 1, 0, -1):
+            module_name = ".".join(parts[:split])
+            if module_name not in self.modules:
+                full_name = self._root_relative_names.get(module_name)
+                if full_name is not None and full_name.partition(".")[0] not in self.modules:
+                    return self._resolve(full_name + name[len(module_name):], depth + 1)
+                continue
+            if self.modules[module_name].imports is None and self.loader is not None:
+                self.add_module(self.loader(self.modules[module_name]))
+            head, rest = parts[split], parts[split + 1:]
+            suffix = "".join(f".{part}" for part in rest)
+            target = self._imports[module_name].get(head)
+            if target is not None and target != name:
+                return self._resolve(f"{target}{suffix}", depth + 1)
+            for star_module in self.modules[module_name].star_imports or ():
+                resolved = self._resolve(f"{star_module}.{head}{suffix}", depth + 1)
+                if resolved is not None:
+                    return resolved
+            return None
+        return None
@@ -0,0 +1,135 @@
+import os
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from py_class_extractor import ast_management, utils
+from py_class_extractor.schemas import ClassInformation, ModuleInformation
+
+
+class TypeInference:
+    """
+    Lazily infers the type of attributes and the return value of methods, one module at a time.
+
+    The default extraction leaves `AttributeInformation.data_type` and `FunctionInformation.return_value`
+    as None and pays nothing for types. A module is parsed again with `ast_collectors.TypedModuleInspector`
+    only when one of its types is asked for, and the result is memoized until the file changes.
+
+    Attributes:
+    - base_module_name (str): The base module name used for relative paths.
+    - encoding_fallback (bool): Guess the encoding with chardet when the declared one fails.
+    """
+
+    def __init__(self, base_module_name: str, encoding_fallback: bool = False) -> None:
+        """
+        Initializes an instance of TypeInference.
+
+        Args:
+        - base_module_name (str): The base module name used for relative paths, as given to `process_module`.
+        - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        """
+        self.base_module_name = base_module_name
+        self.encoding_fallback = encoding_fallback
+        self._memo: Dict[str, Tuple[Tuple[int, int], ModuleInformation]] = dict()
+
+    @classmethod
+    def for_path(cls, path: str, encoding_fallback: bool = False) -> "TypeInference":
+        """
+        Builds the type inference of a scanned file or directory, with the base module name of the scan.
+        """
+        return cls(utils.split_path(path)[-1], encoding_fallback)
+
+    def module(self, file_path: str) -> ModuleInformation:
+        """
+        Returns the metadata of a module with its member types, parsing it on first use.
+
+        Args:
+        - file_path (str): The path to the Python file.
+
+        Returns:
+        - ModuleInformation: The module metadata, with types filled in where they could be inferred.
+        """
+        stat = os.stat(file_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        memoized = self._memo.get(file_path)
+        if memoized is not None and memoized[0] == signature:
+            return memoized[1]
+
+        modules = utils.extract_sublist_between(utils.split_path(file_path), self.base_module_name)
+        tree = ast_management.parse_ast_from_file(file_path, self.encoding_fallback)
+        module_metadata = ast_management.extract_module_metadata(tree, modules, infer_types=True)
+        self._memo[file_path] = (signature, module_metadata)
+        return module_metadata
+
+    def annotate(self, module_metadata: ModuleInformation, file_path: str) -> ModuleInformation:
+        """
+        Fills in the member types of module metadata produced by the default extraction.
+
+        Args:
+        - module_metadata (ModuleInformation): The module metadata, e.g. from `iter_module_metadata`.
+        - file_path (str): The file it was extracted from.
+
+        Returns:
+        - ModuleInformation: The same metadata with member types; calls and imports are kept as given.
+        """
+        if not module_metadata.classes:
+            return module_metadata
+        return replace(module_metadata, classes=self.module(file_path).classes)
+
+    def annotate_all(self, module_metadata_list: Iterable[ModuleInformation],
+                     file_paths: Iterable[str]) -> Iterator[ModuleInformation]:
+        """
+        Lazily fills in the member types of modules, see `annotate`.
+
+        Args:
+        - module_metadata_list (Iterable[ModuleInformation]): The module metadata.
+        - file_paths (Iterable[str]): The file of each module, in the same order.
+
+        Yields:
+        - ModuleInformation: The metadata of each module, with member types.
+        """
+        for module_metadata, file_path in zip(module_metadata_list, file_paths):
+            yield self.annotate(module_metadata, file_path)
+
+    def class_types(self, file_path: str, qualified_name: str) -> Optional[ClassInformation]:
+        """
+        Returns the metadata of a class with its member types.
+
+        Args:
+        - file_path (str): The file defining the class.
+        - qualified_name (str): The qualified name of the class.
+
+        Returns:
+        - ClassInformation or None: The class, or None if the file does not define it.
+        """
+        for class_info in self.module(file_path).classes:
+            if class_info.qualified_name == qualified_name:
+                return class_info
+        return None
+
+    def attribute_type(self, file_path: str, qualified_name: str, attribute: str) -> Optional[str]:
+        """
+        Returns the inferred type of an attribute of a class, or None if it is unknown.
+        """
+        class_info = self.class_types(file_path, qualified_name)
+        if class_info is not None:
+            for attribute_info in class_info.attributes:
+                if attribute_info.name == attribute:
+                    return attribute_info.data_type
+        return None
+
+    def return_type(self, file_path: str, qualified_name: str, method: str) -> Optional[str]:
+        """
+        Returns the return annotation of a method of a class, or None if it is unknown.
+        """
+        class_info = self.class_types(file_path, qualified_name)
+        if class_info is not None:
+            for method_info in class_info.methods:
+                if method_info.name == method:
+                    return method_info.return_value
+        return None
+
+    def clear(self) -> None:
+        """
+        Forgets every memoized module.
+        """
+        self._memo.clear()
@@ -56,4 +56,22 @@ def split_path(module_path: str) -> Tuple[str, ...]:
     # Extract parts of the path and remove the '.py' extension from the last part
     path_parts = [part for part in path.with_suffix('').parts if part]  # Avoid empty strings
 
-    return tuple(path_parts)
\ No newline at end of file
+    return tuple(path_parts)
+
+def module_name_from_parts(modules: Tuple[str, ...]) -> str:
+    """
+    Builds the fully qualified name of a module from its path components.
+
+    Args:
+    - modules (Tuple[str, ...]): The module path components, as returned by `extract_sublist_between`.
+
+    Returns:
+    - str: The dotted module name; a package `__init__` is named after its package.
+
+    Example:
+    >>> module_name_from_parts(("tkinter", "__init__"))
+    'tkinter'
+    """
+    if modules and modules[-1] == "__init__":
+        modules = modules[:-1]
+    return ".".join(modules)
@@ -0,0 +1,334 @@
+"""
+Keeps the class metadata of a directory up to date while it is being edited.
+
+The directory is analyzed once, then polled; after every change, only the changed files are analyzed again
+and the output file is rewritten.
+
+Usage:
+    python -m py_class_extractor.watch <directory> --output classes.json [--format ndjson] [--interval 1.0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+from py_class_extractor import batch, file_management, utils
+from py_class_extractor.schemas import ClassInformation, ModuleInformation
+from py_class_extractor.symbols import SymbolIndex
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_DEBOUNCE = 0.3
+
+
+@dataclass(frozen=True)
+class FileChanges:
+    """
+    Data class describing the Python files that changed between two snapshots of a directory.
+
+    Attributes:
+    - added (Tuple[str]): Paths of the new files.
+    - modified (Tuple[str]): Paths of the files whose size or modification time changed.
+    - deleted (Tuple[str]): Paths of the removed files.
+    """
+
+    added: Tuple[str, ...] = ()
+    modified: Tuple[str, ...] = ()
+    deleted: Tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        """
+        Tells whether any file changed.
+
+        Returns:
+        - bool: True if a file was added, modified or deleted.
+        """
+        return bool(self.added or self.modified or self.deleted)
+
+
+def symbol_surface(module: ModuleInformation) -> tuple:
+    """
+    Returns what other modules can observe of a module when resolving their relationships.
+
+    Args:
+    - module (ModuleInformation): The module.
+
+    Returns:
+    - tuple: The module name, its class names and its module level imports.
+    """
+    return (
+        module.name,
+        tuple(class_info.qualified_name for class_info in module.classes),
+        module.imports,
+        module.star_imports,
+    )
+
+
+class DirectoryWatcher:
+    """
+    Keeps the class metadata of a directory up to date by polling it for changes.
+
+    Each poll walks the directory and stats its Python files. Only added, modified and deleted files are
+    analyzed again, and their results are patched into the in-memory result set. Relationships of other
+    modules are resolved again only when a change alters the classes or imports other modules can see.
+    Records are kept encoded per file, so rewriting the output file only encodes the changed files.
+
+    Attributes:
+    - directory_path (str): The watched directory.
+    - output_path (str or None): File rewritten after every update, if any.
+    - output_format (str): "json" or "ndjson".
+    - interval (float): Seconds between polls.
+    - debounce (float): Seconds the directory must stay unchanged before an update is applied.
+    - modules (dict): ModuleInformation of every analyzed file, keyed by path.
+    - snapshot (dict): (modification time, size) of every Python file, keyed by path, in walk order.
+    """
+
+    def __init__(self, directory_path: str, output_path: str = None, output_format: str = "json",
+                 interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE,
+                 encoding_fallback: bool = False) -> None:
+        """
+        Initializes an instance of DirectoryWatcher.
+
+        Args:
+        - directory_path (str): The directory to watch.
+        - output_path (str, optional): File rewritten after every update.
+        - output_format (str, optional): "json" for an indented JSON array, "ndjson" for one class per line.
+        - interval (float, optional): Seconds between polls.
+        - debounce (float, optional): Seconds the directory must stay unchanged before an update is applied.
+        - encoding_fallback (bool, optional): Guess the encoding with chardet when the declared one fails.
+        """
+        if output_format not in file_management.RECORD_ENCODERS:
+            raise ValueError(f"Unknown output format '{output_format}'")
+
+        self.directory_path = directory_path
+        self.output_path = output_path
+        self.output_format = output_format
+        self.interval = interval
+        self.debounce = debounce
+        self.encoding_fallback = encoding_fallback
+        self.base_module_name = utils.split_path(directory_path)[-1]
+        self.modules: Dict[str, ModuleInformation] = dict()
+        self.snapshot: Dict[str, Tuple[int, int]] = dict()
+        self.index = SymbolIndex()
+        self._resolved: Dict[str, Tuple[ClassInformation, ...]] = dict()
+        self._encoded: Dict[str, Tuple[str, ...]] = dict()
+        self._encode = file_management.RECORD_ENCODERS[output_format]
+
+    def take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Walks the directory and stats every Python file.
+
+        Returns:
+        - dict: (modification time in nanoseconds, size) of every Python file, keyed by path, in walk order.
+        """
+        snapshot = dict()
+        for file_path in file_management.iter_files_with_extension(self.directory_path, ".py"):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue  # Deleted while walking
+            snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def detect_changes(self, snapshot: Dict[str, Tuple[int, int]]) -> FileChanges:
+        """
+        Compares a snapshot with the one of the last update.
+
+        Args:
+        - snapshot (dict): A snapshot returned by `take_snapshot`.
+
+        Returns:
+        - FileChanges: The added, modified and deleted files.
+        """
+        return FileChanges(
+            added=tuple(path for path in snapshot if path not in self.snapshot),
+            modified=tuple(
+                path for path, signature in snapshot.items()
+                if path in self.snapshot and self.snapshot[path] != signature
+            ),
+            deleted=tuple(path for path in self.snapshot if path not in snapshot),
+        )
+
+    def refresh(self) -> FileChanges:
+        """
+        Takes a snapshot and applies the changes found since the last update.
+
+        Returns:
+        - FileChanges: The applied changes.
+        """
+        snapshot = self.take_snapshot()
+        changes = self.detect_changes(snapshot)
+        if changes:
+            self.apply_changes(snapshot, changes)
+        return changes
+
+    def apply_changes(self, snapshot: Dict[str, Tuple[int, int]], changes: FileChanges) -> None:
+        """
+        Analyzes the changed files again and patches the result set and the output file.
+
+        Files that cannot be analyzed, for instance while being edited, are left out until they are fixed. Every
+        file is analyzed in isolation, within the size and time limits of `batch.process_module_safely`.
+
+        Args:
+        - snapshot (dict): The snapshot the changes were detected in.
+        - changes (FileChanges): The changes to apply.
+        """
+        surface_changed = False
+
+        for path in changes.deleted:
+            surface_changed |= self._forget(path)
+
+        for path in changes.added + changes.modified:
+            previous = self.modules.get(path)
+            module, error = batch.process_module_safely(
+                path, self.base_module_name, encoding_fallback=self.encoding_fallback
+            )
+            if error is not None:
+                surface_changed |= self._forget(path)
+                continue
+
+            if previous is not None:
+                self.index.remove_module(previous.name)
+            self.modules[path] = module
+            self.index.add_module(module)
+            surface_changed |= previous is None or symbol_surface(previous) != symbol_surface(module)
+
+        self.snapshot = snapshot
+
+        # Other modules only need resolving again when the names they can see have changed
+        for path in (self.modules if surface_changed else changes.added + changes.modified):
+            module = self.modules.get(path)
+            if module is None:
+                continue
+            resolved = tuple(self.index.resolve_class(class_info, module) for class_info in module.classes)
+            if self._resolved.get(path) != resolved:
+                self._resolved[path] = resolved
+                self._encoded[path] = tuple(map(self._encode, resolved))
+
+        if self.output_path is not None:
+            self.write_output()
+
+    def _forget(self, path: str) -> bool:
+        """
+        Drops the results of a file from the result set and the index.
+
+        Args:
+        - path (str): Path of the file.
+
+        Returns:
+        - bool: True if the file had results, which other modules may have resolved against.
+        """
+        module = self.modules.pop(path, None)
+        self._resolved.pop(path, None)
+        self._encoded.pop(path, None)
+        if module is None:
+            return False
+        self.index.remove_module(module.name)
+        return True
+
+    def iter_classes(self):
+        """
+        Iterates over the current class metadata, with resolved relationships, in walk order.
+
+        Yields:
+        - ClassInformation: The metadata of each class.
+        """
+        for path in self.snapshot:
+            yield from self._resolved.get(path, ())
+
+    def iter_encoded_records(self):
+        """
+        Iterates over the current class metadata encoded in the output format, in walk order.
+
+        Yields:
+        - str: The encoded record of each class, see `file_management.RECORD_ENCODERS`.
+        """
+        for path in self.snapshot:
+            yield from self._encoded.get(path, ())
+
+    def write_output(self) -> None:
+        """
+        Atomically rewrites the output file from the encoded records.
+        """
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(file_descriptor)
+        try:
+            file_management.write_encoded_records(temporary_path, self.iter_encoded_records(), self.output_format)
+            os.replace(temporary_path, self.output_path)
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            raise
+
+    def run(self, on_update: Callable[[FileChanges], None] = None, max_updates: int = None) -> None:
+        """
+        Analyzes the directory, then polls it and applies debounced updates until interrupted.
+
+        Args:
+        - on_update (Callable, optional): Called with the FileChanges of every applied update.
+        - max_updates (int, optional): Stop after this many updates after the initial analysis.
+        """
+        changes = self.refresh()
+        if on_update is not None:
+            on_update(changes)
+
+        updates = 0
+        while max_updates is None or updates < max_updates:
+            time.sleep(self.interval)
+            snapshot = self.take_snapshot()
+            if not self.detect_changes(snapshot):
+                continue
+
+            # Wait until the directory stays unchanged for a whole debounce period
+            while True:
+                time.sleep(self.debounce)
+                latest = self.take_snapshot()
+                if latest == snapshot:
+                    break
+                snapshot = latest
+
+            changes = self.detect_changes(snapshot)
+            if not changes:
+                continue
+            self.apply_changes(snapshot, changes)
+            updates += 1
+            if on_update is not None:
+                on_update(changes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="Directory to watch")
+    parser.add_argument("--output", default="classes.json", help="File rewritten after every update")
+    parser.add_argument("--format", choices=sorted(file_management.RECORD_ENCODERS), default="json",
+                        dest="output_format")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between polls")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="Seconds the directory must stay unchanged before an update")
+    parser.add_argument("--encoding-fallback", action="store_true", help="Guess undeclared encodings with chardet")
+    arguments = parser.parse_args()
+    if not os.path.isdir(arguments.path):
+        parser.error(f"'{arguments.path}' is not a directory")
+
+    watcher = DirectoryWatcher(
+        os.path.abspath(arguments.path), arguments.output, arguments.output_format, arguments.interval,
+        arguments.debounce, arguments.encoding_fallback
+    )
+
+    def on_update(changes: FileChanges) -> None:
+        print(f"{len(changes.added)} added, {len(changes.modified)} modified, {len(changes.deleted)} deleted: "
+              f"{len(watcher.modules)} files written to {arguments.output}", file=sys.stderr, flush=True)
+
+    try:
+        watcher.run(on_update)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
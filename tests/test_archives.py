@@ -0,0 +1,98 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from py_class_extractor import archives, ast_management
+
+
+@pytest.mark.parametrize("name, modules", [
+    ("pkg/module.py", ("pkg", "module")),
+    ("pkg/__init__.py", ("pkg", "__init__")),
+    ("pkg-1.0.dist-info/record.py", None),
+    ("pkg-1.0.data/purelib/extra/module.py", ("extra", "module")),
+    ("pkg-1.0.data/platlib/native.py", ("native",)),
+    ("pkg-1.0.data/scripts/tool.py", None),
+    ("pkg/README.txt", None),
+])
+def test_member_modules_of_wheels(name, modules):
+    assert archives.member_modules(name, wheel=True) == modules
+
+
+@pytest.mark.parametrize("name, modules", [
+    ("project-1.0/pkg/module.py", ("pkg", "module")),
+    ("project-1.0/src/pkg/module.py", ("pkg", "module")),
+    ("project-1.0/setup.py", ("setup",)),
+    ("./project-1.0/pkg/module.py", ("pkg", "module")),
+    ("project-1.0/pkg.egg-info/module.py", None),
+    ("pkg/module.py", ("pkg", "module")),
+    ("module.py", ("module",)),
+])
+def test_member_modules_of_source_distributions(name, modules):
+    assert archives.member_modules(name) == modules
+
+
+def write_tar(path, members):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, source in members.items():
+            data = source.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+# Only the re-exporting modules are skipped by the prefilter, and both are needed to resolve the bases
+REEXPORTS = {
+    "project-1.0/pkg/__init__.py": "",
+    "project-1.0/pkg/base.py": "class Base:\n    pass\n",
+    "project-1.0/pkg/first.py": "from .base import Base\n",
+    "project-1.0/pkg/second.py": "from .first import Base\n",
+    "project-1.0/pkg/derived.py": "from .second import Base\n\n\nclass Derived(Base):\n    pass\n",
+}
+
+
+@pytest.mark.parametrize("suffix", [".tar.gz", ".zip"])
+def test_skipped_members_are_read_in_one_extra_pass(tmp_path, monkeypatch, suffix):
+    archive_path = str(tmp_path / f"project-1.0{suffix}")
+    if suffix == ".zip":
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for name, source in REEXPORTS.items():
+                archive.writestr(name, source)
+        module, function = zipfile, "ZipFile"
+    else:
+        write_tar(archive_path, REEXPORTS)
+        module, function = tarfile, "open"
+
+    opened = []
+    original = getattr(module, function)
+
+    def counting_open(*arguments, **options):
+        opened.append(arguments[0])
+        return original(*arguments, **options)
+
+    monkeypatch.setattr(module, function, counting_open)
+    classes = archives.generate_classes_dicts_from_archive(archive_path, prefilter=True)
+
+    derived = next(class_info for class_info in classes if class_info["name"] == "Derived")
+    assert derived["relationships"][0]["target"] == "pkg.base.Base"
+    assert len(opened) == 2
+
+
+def test_skipped_members_sharing_a_module_name_are_loaded_from_their_own_member(tmp_path):
+    members = {"project-1.0/pkg/a.py": "import os\n", "project-1.0/src/pkg/a.py": "import sys\n"}
+    archive_path = str(tmp_path / "project-1.0.tar.gz")
+    write_tar(archive_path, members)
+    names = list(members)
+    module_metadata_list = [
+        ast_management.skipped_module_metadata(archives.member_modules(name), True, False) for name in names
+    ]
+    assert module_metadata_list[0] == module_metadata_list[1]
+
+    loaded = []
+    loader = archives.archive_member_loader(
+        archive_path, names, module_metadata_list, process=lambda member: loaded.append(member.name)
+    )
+    loader(module_metadata_list[1])
+    loader(module_metadata_list[0])
+    assert loaded == ["project-1.0/src/pkg/a.py", "project-1.0/pkg/a.py"]
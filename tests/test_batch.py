@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+import py_class_extractor
+from py_class_extractor import batch
+
+SOURCES = {
+    "__init__.py": "",
+    "a.py": "from .b import Base\n\n\nclass A(Base):\n    pass\n",
+    "b.py": "from .c import Base\n",
+    "c.py": "class Base:\n    pass\n",
+}
+
+
+def write_package(tmp_path, sources=SOURCES):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    for name, source in sources.items():
+        (package / name).write_text(source)
+    return str(package)
+
+
+def run(package, checkpoint_path, **options):
+    analyzed = []
+    result = batch.run_batch(
+        package, checkpoint_path, on_file=lambda file_path, module, error: analyzed.append(file_path), **options
+    )
+    return result, analyzed
+
+
+def test_checkpoint_resumes_without_analyzing_again(tmp_path):
+    package = write_package(tmp_path)
+    checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+    first, analyzed = run(package, checkpoint_path)
+    assert len(analyzed) == 4
+
+    second, analyzed = run(package, checkpoint_path)
+    assert analyzed == []
+    assert second.resumed == second.files == 4
+    assert second.classes == first.classes
+
+
+def test_checkpoint_skips_a_truncated_last_line(tmp_path):
+    package = write_package(tmp_path)
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    first, _ = run(package, str(checkpoint_path))
+    journal = checkpoint_path.read_text()
+    checkpoint_path.write_text(journal[:journal.rstrip("\n").rfind("\n") + 20])
+
+    second, analyzed = run(package, str(checkpoint_path))
+    assert len(analyzed) == 1
+    assert second.resumed == 3
+    assert second.classes == first.classes
+
+    third, analyzed = run(package, str(checkpoint_path))
+    assert analyzed == []
+    assert third.resumed == 4
+
+
+def test_checkpoint_of_other_options_is_rejected(tmp_path):
+    package = write_package(tmp_path)
+    checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+    run(package, checkpoint_path)
+
+    with pytest.raises(batch.CheckpointMismatchError):
+        run(package, checkpoint_path, outline=True)
+    with pytest.raises(batch.CheckpointMismatchError):
+        run(package, checkpoint_path, checkpoint_options={"include": ["a.py"], "exclude": []})
+
+
+def test_checkpoint_with_unreadable_header_is_rejected(tmp_path):
+    package = write_package(tmp_path)
+    checkpoint_path = tmp_path / "checkpoint.jsonl"
+    checkpoint_path.write_text('{"format": 2, "analyz\n')
+
+    with pytest.raises(batch.CheckpointMismatchError):
+        run(package, str(checkpoint_path))
+
+
+def test_too_large_file_is_reported(tmp_path):
+    package = write_package(tmp_path)
+    result, _ = run(package, None, max_file_bytes=20)
+
+    assert result.error_report()["categories"] == {"too_large": 2}
+    assert [error.path.rsplit("/", 1)[-1] for error in result.errors] == ["a.py", "c.py"]
+
+
+def test_slow_file_is_reported_as_a_timeout(tmp_path, monkeypatch):
+    package = write_package(tmp_path)
+    process_module = py_class_extractor.process_module
+
+    def slow_process_module(file_path, *arguments, **options):
+        if file_path.endswith("c.py"):
+            time.sleep(5)
+        return process_module(file_path, *arguments, **options)
+
+    monkeypatch.setattr(py_class_extractor, "process_module", slow_process_module)
+    result, _ = run(package, None, timeout=0.1)
+
+    assert [(error.path.rsplit("/", 1)[-1], error.category) for error in result.errors] == [("c.py", "timeout")]
+
+
+def test_prefiltered_file_is_parsed_when_its_imports_are_needed(tmp_path):
+    package = write_package(tmp_path)
+    result, _ = run(package, None, prefilter=True)
+
+    assert result.errors == []
+    derived = next(class_info for class_info in result.classes if class_info["name"] == "A")
+    assert derived["relationships"][0]["target"] == "pkg.c.Base"
+
+
+def test_prefiltered_file_failing_when_its_imports_are_needed_is_reported(tmp_path):
+    package = write_package(tmp_path, dict(SOURCES, **{"b.py": "from .c import Base\nvalue = = 1\n"}))
+    result, _ = run(package, None, prefilter=True)
+
+    assert [(error.path.rsplit("/", 1)[-1], error.category) for error in result.errors] == [("b.py", "syntax")]
+    assert {class_info["name"] for class_info in result.classes} == {"A", "Base"}
@@ -0,0 +1,131 @@
+import ast
+import os
+
+from py_class_extractor import ast_management, cache
+
+SOURCE = "class Base:\n    pass\n\n\nclass Derived(Base):\n    pass\n"
+
+
+def extract(source):
+    return ast_management.extract_module_metadata(ast.parse(source), ("package", "module"))
+
+
+def write_source(tmp_path, source=SOURCE, name="module.py"):
+    file_path = tmp_path / name
+    file_path.write_text(source)
+    return str(file_path)
+
+
+def store(result_cache, file_path, **options):
+    module, fingerprint = result_cache.lookup(file_path, "package", **options)
+    assert module is None
+    with open(file_path, "rb") as file:
+        data = file.read()
+    result_cache.store(file_path, "package", fingerprint, extract(data.decode()), data, **options)
+
+
+def test_unchanged_size_and_mtime_is_a_hit_without_reading(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    file_path = write_source(tmp_path)
+    store(result_cache, file_path)
+
+    module, fingerprint = result_cache.lookup(file_path, "package")
+    assert module == extract(SOURCE)
+    assert fingerprint.data is None
+
+
+def test_touched_file_is_a_hit_on_its_content_hash(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    file_path = write_source(tmp_path)
+    store(result_cache, file_path)
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    module, fingerprint = result_cache.lookup(file_path, "package")
+    assert module == extract(SOURCE)
+    assert fingerprint.data == SOURCE.encode()
+
+    # The entry was refreshed with the new modification time
+    module, fingerprint = result_cache.lookup(file_path, "package")
+    assert module == extract(SOURCE)
+    assert fingerprint.data is None
+
+
+def test_changed_content_is_a_miss(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    file_path = write_source(tmp_path)
+    store(result_cache, file_path)
+    stat = os.stat(file_path)
+    # Same size, so only the content hash tells the versions apart
+    write_source(tmp_path, SOURCE.replace("Base", "Root"))
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    module, fingerprint = result_cache.lookup(file_path, "package")
+    assert module is None
+    assert fingerprint.data is not None
+
+
+def test_outline_entries_only_hit_outline_lookups(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    outline_path = write_source(tmp_path, name="outline.py")
+    full_path = write_source(tmp_path, name="full.py")
+    store(result_cache, outline_path, outline=True)
+    store(result_cache, full_path)
+
+    assert result_cache.lookup(outline_path, "package")[0] is None
+    assert result_cache.lookup(outline_path, "package", outline=True)[0] is not None
+    assert result_cache.lookup(full_path, "package", outline=True)[0] is not None
+
+
+def test_encoding_fallback_entries_only_hit_encoding_fallback_lookups(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    fallback_path = write_source(tmp_path, name="fallback.py")
+    strict_path = write_source(tmp_path, name="strict.py")
+    store(result_cache, fallback_path, encoding_fallback=True)
+    store(result_cache, strict_path)
+
+    assert result_cache.lookup(fallback_path, "package")[0] is None
+    assert result_cache.lookup(fallback_path, "package", encoding_fallback=True)[0] is not None
+    assert result_cache.lookup(strict_path, "package", encoding_fallback=True)[0] is not None
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    file_path = write_source(tmp_path)
+    store(result_cache, file_path)
+    entry_path = result_cache._entry_path(file_path, "package")
+    with open(entry_path, "r+b") as file:
+        file.truncate(os.path.getsize(entry_path) // 2)
+
+    assert result_cache.lookup(file_path, "package")[0] is None
+    store(result_cache, file_path)
+    assert result_cache.lookup(file_path, "package")[0] == extract(SOURCE)
+
+
+def test_prune_evicts_the_least_recently_used_entries(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"))
+    file_paths = [write_source(tmp_path, name=f"module{index}.py") for index in range(4)]
+    for file_path in file_paths:
+        store(result_cache, file_path)
+    entry_paths = [result_cache._entry_path(file_path, "package") for file_path in file_paths]
+    for age, entry_path in enumerate(reversed(entry_paths)):
+        os.utime(entry_path, ns=(10 ** 18 - age * 10 ** 9,) * 2)
+    # A hit marks the oldest entry as the most recently used
+    assert result_cache.lookup(file_paths[0], "package")[0] is not None
+
+    entry_size = os.path.getsize(entry_paths[1])
+    result_cache.max_bytes = 3 * entry_size
+    assert result_cache.prune() == 2
+    assert [os.path.exists(entry_path) for entry_path in entry_paths] == [True, False, False, True]
+
+
+def test_prune_leaves_temporary_files_alone(tmp_path):
+    result_cache = cache.ResultCache(str(tmp_path / "cache"), max_bytes=0)
+    file_path = write_source(tmp_path)
+    store(result_cache, file_path)
+    temporary_path = os.path.join(os.path.dirname(result_cache._entry_path(file_path, "package")), "entry.tmp")
+    with open(temporary_path, "w") as file:
+        file.write("{}")
+
+    assert result_cache.prune() == 1
+    assert os.path.exists(temporary_path)
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from py_class_extractor import cli
+
+VALID = "class Base:\n    pass\n"
+BROKEN = "class Broken(:\n    pass\n"
+
+
+def write_package(tmp_path, sources):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    for name, source in sources.items():
+        (package / name).write_text(source)
+    return str(package)
+
+
+def run(tmp_path, package, *arguments):
+    output_path = tmp_path / "classes.json"
+    return cli.main([package, "-o", str(output_path), "--no-progress", *arguments]), output_path
+
+
+def test_exit_ok_when_every_file_is_analyzed(tmp_path):
+    package = write_package(tmp_path, {"a.py": VALID})
+    exit_code, output_path = run(tmp_path, package)
+
+    assert exit_code == cli.EXIT_OK
+    assert [class_info["name"] for class_info in json.loads(output_path.read_text())] == ["Base"]
+
+
+def test_exit_partial_when_some_files_fail(tmp_path):
+    package = write_package(tmp_path, {"a.py": VALID, "b.py": BROKEN})
+    errors_path = tmp_path / "errors.json"
+    exit_code, output_path = run(tmp_path, package, "--errors", str(errors_path))
+
+    assert exit_code == cli.EXIT_PARTIAL
+    assert output_path.exists()
+    assert json.loads(errors_path.read_text())["categories"] == {"syntax": 1}
+
+
+def test_exit_usage_on_missing_path(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        run(tmp_path, str(tmp_path / "missing"))
+    assert exit_info.value.code == cli.EXIT_USAGE
+
+
+def test_exit_usage_on_checkpoint_of_another_scan(tmp_path):
+    package = write_package(tmp_path, {"a.py": VALID})
+    checkpoint_path = str(tmp_path / "checkpoint.jsonl")
+    assert run(tmp_path, package, "--checkpoint", checkpoint_path)[0] == cli.EXIT_OK
+
+    assert run(tmp_path, package, "--checkpoint", checkpoint_path, "--outline")[0] == cli.EXIT_USAGE
+
+
+def test_exit_failure_when_no_file_is_analyzed(tmp_path):
+    package = write_package(tmp_path, {"a.py": BROKEN})
+    assert run(tmp_path, package)[0] == cli.EXIT_FAILURE
+
+
+def test_exit_failure_when_the_output_cannot_be_written(tmp_path):
+    package = write_package(tmp_path, {"a.py": VALID})
+    exit_code = cli.main([package, "-o", str(tmp_path / "missing" / "classes.json"), "--no-progress"])
+    assert exit_code == cli.EXIT_FAILURE
+
+
+@pytest.mark.parametrize("relative_path, include, exclude, expected", [
+    ("pkg/module.py", None, None, True),
+    ("pkg/module.py", ["pkg/*"], None, True),
+    ("pkg/module.py", ["tests/*", "*.py"], None, True),
+    ("pkg/module.py", ["tests/*"], None, False),
+    ("pkg/module.py", None, ["*/module.py"], False),
+    ("pkg/module.py", ["pkg/*"], ["pkg/other.py"], True),
+    ("pkg/module.py", ["pkg/*"], ["pkg/mod*"], False),
+    ("pkg/sub/module.py", ["pkg/*"], None, True),
+])
+def test_is_selected(relative_path, include, exclude, expected):
+    assert cli.is_selected(relative_path, include, exclude) is expected
+
+
+def test_select_files_matches_relative_paths(tmp_path):
+    package = write_package(tmp_path, {"a.py": VALID, "test_a.py": VALID})
+    selected = cli.select_files(package, exclude=["test_*"])
+    assert [path.rsplit("/", 1)[-1] for path in selected] == ["a.py"]
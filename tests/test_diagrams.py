@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+
+from py_class_extractor import diagrams
+from py_class_extractor.class_index import ClassIndex
+from py_class_extractor.schemas import ClassInformation, RelationshipInformation, RelationshipType
+
+
+def make_class(qualified_name, *bases):
+    modules = tuple(qualified_name.split(".")[:-1])
+    relationships = tuple(
+        RelationshipInformation(RelationshipType.INHERITANCE, base.rsplit(".", 1)[-1], base) for base in bases
+    )
+    return ClassInformation(modules, qualified_name.rsplit(".", 1)[-1], relationships, (), (), qualified_name)
+
+
+def names(classes):
+    return [class_info.qualified_name for class_info in classes]
+
+
+KEYS = ["a.b_c", "a_b.c", "a.b.c", "a_d", "a.d", "a__b", "a_.b", "a-b", "a_u2d_b", "a.b-c", "a.b_u2d_c", "ä"]
+
+
+def test_diagram_id_is_injective():
+    identifiers = [diagrams.diagram_id(key) for key in KEYS]
+    assert len(set(identifiers)) == len(KEYS)
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_diagram_id_is_a_word(key):
+    assert diagrams.diagram_id(key).isidentifier()
+
+
+def test_diagram_id_is_injective_on_short_keys():
+    alphabet = "a_.-"
+    keys = ["".join(characters) for length in range(1, 5) for characters in itertools.product(alphabet, repeat=length)]
+    assert len({diagrams.diagram_id(key) for key in keys}) == len(keys)
+
+
+def test_partition_by_component_joins_bases_among_the_classes():
+    classes = [
+        make_class("pkg.a.Base", "builtins.object"),
+        make_class("pkg.b.Other", "builtins.object"),
+        make_class("pkg.a.Derived", "pkg.a.Base"),
+        make_class("pkg.c.Leaf", "pkg.a.Derived"),
+        make_class("pkg.b.Sibling", "pkg.b.Other", "external.Mixin"),
+        make_class("pkg.d.Alone"),
+    ]
+    components = diagrams.partition_by_component(classes)
+
+    assert [names(component) for component in components] == [
+        ["pkg.a.Base", "pkg.a.Derived", "pkg.c.Leaf"],
+        ["pkg.b.Other", "pkg.b.Sibling"],
+        ["pkg.d.Alone"],
+    ]
+
+
+def test_partition_by_component_merges_through_multiple_inheritance():
+    classes = [
+        make_class("pkg.Left"),
+        make_class("pkg.Right"),
+        make_class("pkg.Both", "pkg.Left", "pkg.Right"),
+    ]
+    assert [names(component) for component in diagrams.partition_by_component(classes)] == [
+        ["pkg.Left", "pkg.Right", "pkg.Both"]
+    ]
+
+
+def chain_index():
+    return ClassIndex([
+        make_class("pkg.Root"),
+        make_class("pkg.Middle", "pkg.Root"),
+        make_class("pkg.Leaf", "pkg.Middle"),
+        make_class("pkg.Other", "pkg.Root"),
+        make_class("pkg.Unrelated", "external.Base"),
+    ])
+
+
+def test_select_neighbourhood_follows_both_directions():
+    index = chain_index()
+
+    assert names(diagrams.select_neighbourhood(index, "pkg.Middle", 0)) == ["pkg.Middle"]
+    assert names(diagrams.select_neighbourhood(index, "pkg.Middle", 1)) == ["pkg.Middle", "pkg.Root", "pkg.Leaf"]
+    assert names(diagrams.select_neighbourhood(index, "pkg.Middle", 2)) == [
+        "pkg.Middle", "pkg.Root", "pkg.Leaf", "pkg.Other"
+    ]
+
+
+def test_select_neighbourhood_skips_classes_outside_the_index():
+    index = chain_index()
+    assert names(diagrams.select_neighbourhood(index, "pkg.Unrelated", 3)) == ["pkg.Unrelated"]
+
+
+def test_select_neighbourhood_of_unknown_class_raises():
+    with pytest.raises(KeyError):
+        diagrams.select_neighbourhood(chain_index(), "pkg.Missing", 1)
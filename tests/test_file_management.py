@@ -0,0 +1,65 @@
+import os
+
+from py_class_extractor import file_management
+
+
+def make_tree(root, files):
+    for relative_path, content in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def walk(root, **options):
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in file_management.iter_files(str(root), **options)]
+
+
+def test_walk_order_sorts_the_entries_of_every_directory(tmp_path):
+    make_tree(tmp_path, {name: "" for name in ("b.py", "a/z.py", "a/b/c.py", "C.py", "a.py", "a_b.py")})
+    assert walk(tmp_path) == ["C.py", "a/b/c.py", "a/z.py", "a.py", "a_b.py", "b.py"]
+
+
+def test_negation_reincludes_a_file(tmp_path):
+    make_tree(tmp_path, {
+        ".gitignore": "*.py\n!keep.py\n",
+        "drop.py": "", "keep.py": "", "sub/keep.py": "", "sub/drop.py": "",
+    })
+    assert walk(tmp_path) == [".gitignore", "keep.py", "sub/keep.py"]
+
+
+def test_directory_only_rules_do_not_match_files(tmp_path):
+    make_tree(tmp_path, {
+        ".gitignore": "build/\n",
+        "build/module.py": "", "src/build/module.py": "", "lib/build": "",
+    })
+    assert walk(tmp_path) == [".gitignore", "lib/build"]
+
+
+def test_nested_gitignore_applies_below_its_directory(tmp_path):
+    make_tree(tmp_path, {
+        ".gitignore": "generated.py\n",
+        "generated.py": "", "pkg/generated.py": "",
+        "pkg/.gitignore": "/local.py\n!generated.py\n",
+        "pkg/local.py": "", "pkg/sub/local.py": "", "local.py": "",
+    })
+    assert walk(tmp_path) == [".gitignore", "local.py", "pkg/.gitignore", "pkg/generated.py", "pkg/sub/local.py"]
+
+
+def test_gitignore_can_be_disabled(tmp_path):
+    make_tree(tmp_path, {".gitignore": "*.py\n", "module.py": ""})
+    assert walk(tmp_path, use_gitignore=False) == [".gitignore", "module.py"]
+    assert walk(tmp_path, ignore_patterns=["*.py"], use_gitignore=False) == [".gitignore"]
+
+
+def test_virtual_environments_and_default_directories_are_pruned(tmp_path):
+    make_tree(tmp_path, {
+        "module.py": "",
+        "venv/pyvenv.cfg": "", "venv/lib/site.py": "",
+        ".git/hooks/hook.py": "", "pkg/__pycache__/module.py": "", "node_modules/tool.py": "",
+    })
+    assert walk(tmp_path) == ["module.py"]
+
+
+def test_the_walked_directory_itself_may_be_a_virtual_environment(tmp_path):
+    make_tree(tmp_path, {"pyvenv.cfg": "", "lib/site.py": ""})
+    assert walk(tmp_path) == ["lib/site.py", "pyvenv.cfg"]
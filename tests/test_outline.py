@@ -0,0 +1,222 @@
+import ast
+
+import pytest
+
+from py_class_extractor import ast_management, outline
+
+MODULES = ("package", "module")
+
+DECORATORS = """\
+import functools
+from dataclasses import dataclass, field
+
+
+@functools.lru_cache(maxsize=None)
+def helper(value):
+    return value * 2
+
+
+@dataclass(frozen=True)
+class Point:
+    x: int = 0
+    y: int = field(default=0)
+
+    @property
+    def norm(self):
+        return (self.x ** 2 + self.y ** 2) ** 0.5
+
+    @staticmethod
+    def origin():
+        return Point()
+"""
+
+CLAUSES = """\
+try:
+    import json
+except ImportError:
+    json = None
+else:
+    from json import JSONDecoder
+finally:
+    pass
+
+try:
+    value = compute()
+except ValueError:
+    from fallback import value
+
+if TYPE_CHECKING:
+    from typing import List
+elif sys.version_info < (3, 8):
+    x = 1
+else:
+    class Fallback(Base):
+        pass
+
+for item in items:
+    total = item
+else:
+    from collections import OrderedDict
+
+while False:
+    pass
+else:
+    class AfterLoop:
+        pass
+
+with context() as handle:
+    import re
+"""
+
+SEMICOLONS = """\
+import os; import sys
+x = 1; import re
+a = ";"; from typing import Dict
+
+class Compact: attribute = 1; other = 2
+
+def inline(): import json; return json
+
+class WithInit:
+    def __init__(self): self.first = 1; self.second = 2
+    def method(self): self.ignored = 1; return self
+"""
+
+BRACKETS = """\
+from typing import (
+    Dict,
+    List,
+)
+
+
+class Multiline(
+    Base,
+    metaclass=Meta,
+):
+    items = [
+        1,
+        2,
+    ]
+
+    def method(self, argument=(1,
+                               2)):
+        return {
+    'key': ")]}",
+}
+
+    def __init__(self, mapping={'(': 1}):
+        self.mapping = mapping  # ([{
+        self.text = \"\"\"
+        ) unbalanced in a string
+\"\"\"
+"""
+
+NESTED_CLASSES = """\
+def factory():
+    class Inner:
+        def __init__(self):
+            self.value = 1
+
+        def method(self):
+            class Deeper:
+                pass
+            return Deeper
+    return Inner
+
+
+class Outer:
+    def build(self):
+        class Local(Outer):
+            attribute = 1
+        return Local
+
+    class Nested:
+        def __init__(self):
+            self.nested_value = 1
+"""
+
+NESTED_INIT = """\
+class Outer:
+    def method(self):
+        def __init__(self):
+            self.hidden = 1
+        return __init__
+
+    def __init__(self):
+        def helper():
+            self.inner_attribute = 2
+        self.attribute = 1
+        if self.attribute:
+            self.conditional = 3
+        helper()
+
+
+def __init__(self):
+    self.module_level = 1
+
+
+class Other:
+    async def __init__(self):
+        self.awaited = 1
+"""
+
+LONE_CARRIAGE_RETURNS = "import os\rclass Base:\r    pass\rclass Derived(Base):\r    def __init__(self):\r        self.value = 1\r"
+
+SOURCES = {
+    "decorators": DECORATORS,
+    "clauses": CLAUSES,
+    "semicolons": SEMICOLONS,
+    "brackets": BRACKETS,
+    "nested_classes": NESTED_CLASSES,
+    "nested_init": NESTED_INIT,
+    "lone_carriage_returns": LONE_CARRIAGE_RETURNS,
+}
+
+
+@pytest.mark.parametrize("source", SOURCES.values(), ids=SOURCES.keys())
+def test_outline_extracts_the_same_module(source):
+    expected = ast_management.extract_module_metadata(ast.parse(source), MODULES)
+    actual = ast_management.extract_module_metadata(outline.parse_outline(source), MODULES)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("name", ["decorators", "clauses", "semicolons", "brackets", "nested_classes", "nested_init"])
+def test_outline_skeleton_is_used(name):
+    skeleton = outline.outline_source(SOURCES[name])
+    assert skeleton is not None
+    ast.parse(skeleton)
+
+
+def test_outline_drops_function_bodies():
+    skeleton = outline.outline_source(DECORATORS)
+    assert "lru_cache" not in skeleton
+    assert "return" not in skeleton
+    assert "class Point:" in skeleton
+
+
+def test_lone_carriage_returns_fall_back():
+    assert outline.outline_source(LONE_CARRIAGE_RETURNS) is None
+
+
+def test_unbalanced_brackets_fall_back():
+    source = "class A(Base:\n    pass\n"
+    assert outline.outline_source(source) is None
+    with pytest.raises(SyntaxError):
+        outline.parse_outline(source)
+
+
+def test_unbalanced_brackets_in_dropped_body_fall_back():
+    source = "class A:\n    def method(self):\n        return [1,\n\nclass B:\n    pass\n"
+    with pytest.raises(SyntaxError):
+        ast.parse(source)
+    assert outline.outline_source(source) is None
+    with pytest.raises(SyntaxError):
+        outline.parse_outline(source)
+
+
+def test_syntax_error_in_dropped_body_is_not_reported():
+    source = "class A:\n    def method(self):\n        x = = 1\n"
+    with pytest.raises(SyntaxError):
+        ast.parse(source)
+    module = ast_management.extract_module_metadata(outline.parse_outline(source), MODULES)
+    assert [class_info.name for class_info in module.classes] == ["A"]
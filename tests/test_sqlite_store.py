@@ -0,0 +1,65 @@
+import sqlite3
+
+from py_class_extractor import sqlite_store
+from py_class_extractor.schemas import (AttributeInformation, ClassInformation, Encapsulation, FunctionInformation,
+                                        ModuleInformation)
+
+
+def make_module():
+    class_info = ClassInformation(
+        modules=("pkg", "module"), name="Typed", relationships=(),
+        attributes=(
+            AttributeInformation("known", "int", Encapsulation.PUBLIC),
+            AttributeInformation("unknown", None, Encapsulation.PRIVATE),
+        ),
+        methods=(
+            FunctionInformation("annotated", ("self",), "str", Encapsulation.PUBLIC),
+            FunctionInformation("plain", ("self",), None, Encapsulation.PUBLIC),
+        ),
+        qualified_name="pkg.module.Typed",
+    ).with_fingerprint()
+    return ModuleInformation(name="pkg.module", modules=("pkg", "module"), classes=(class_info,), imports=())
+
+
+def test_types_and_return_values_are_stored_as_plain_text(tmp_path):
+    module = make_module()
+    with sqlite_store.SQLiteStore(str(tmp_path / "classes.db")) as store:
+        store.write_modules([("module.py", module, 1, 1)])
+        stored_types = store.connection.execute("SELECT data_type FROM attributes ORDER BY position").fetchall()
+        stored_returns = store.connection.execute("SELECT return_value FROM methods ORDER BY position").fetchall()
+        assert list(store.iter_modules()) == [module]
+
+    assert stored_types == [("int",), (None,)]
+    assert stored_returns == [("str",), (None,)]
+
+
+def test_json_return_values_of_older_databases_are_upgraded(tmp_path):
+    database_path = str(tmp_path / "classes.db")
+    with sqlite_store.SQLiteStore(database_path) as store:
+        store.write_modules([("module.py", make_module(), 1, 1)])
+    connection = sqlite3.connect(database_path)
+    with connection:
+        connection.execute("UPDATE methods SET return_value = '\"str\"' WHERE position = 0")
+        connection.execute("UPDATE methods SET return_value = 'null' WHERE position = 1")
+        connection.execute("PRAGMA user_version = 0")
+    connection.close()
+
+    with sqlite_store.SQLiteStore(database_path) as store:
+        assert list(store.iter_modules()) == [make_module()]
+
+
+def test_files_that_cannot_be_analyzed_are_left_out(tmp_path):
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "good.py").write_text("class Good:\n    pass\n")
+    (package / "broken.py").write_text("class Good:\n    pass\n")
+    database_path = str(tmp_path / "classes.db")
+    assert sqlite_store.save_directory_to_sqlite(str(package), database_path)[:2] == (2, 0)
+
+    (package / "broken.py").write_text("class Broken(:\n    pass\n")
+    written, deleted, errors = sqlite_store.save_directory_to_sqlite(str(package), database_path)
+
+    assert (written, deleted) == (0, 0)
+    assert [(error.path, error.category) for error in errors] == [(str(package / "broken.py"), "syntax")]
+    with sqlite_store.SQLiteStore(database_path) as store:
+        assert store.paths() == [str(package / "good.py")]